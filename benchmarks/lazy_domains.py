@@ -0,0 +1,87 @@
+"""
+Compares eager and lazy parsing of a 10,000-domain purchase page.
+
+The eager baseline builds every `Domain` and parses both audit dates with
+`strptime` up front, the way `Response` did before domains were built
+lazily. Each lazy case decodes the page, builds a `Response` and then
+accesses only what it needs.
+
+    python benchmarks/lazy_domains.py
+"""
+import datetime
+import json
+import re
+import timeit
+
+from reversewhois import Domain, Response
+from reversewhois.models import response
+
+_re_datetime_format = re.compile(
+    r'^(\d\d\d\d-\d\d-\d\dT\d\d:\d\d:\d\d)\+(\d\d):(\d\d)$')
+
+
+def make_page(count: int) -> str:
+    return json.dumps({
+        'nextPageSearchAfter': 1621957012,
+        'domainsCount': count,
+        'domainsList': [{
+            'domainName': 'domain{}.com'.format(i),
+            'audit': {
+                'createdDate': '2021-01-10T18:52:41+00:00',
+                'updatedDate': '2021-01-11T08:12:03+00:00'
+            }
+        } for i in range(count)]
+    })
+
+
+def _eager_datetime(value: str or None) -> datetime.datetime or None:
+    match = _re_datetime_format.fullmatch(value or '')
+    if match is None:
+        return None
+    return datetime.datetime.strptime(
+        '{}+{}{}'.format(*match.groups()), '%Y-%m-%dT%H:%M:%S%z')
+
+
+def _eager(parsed: dict) -> list:
+    domains = []
+    for item in parsed['domainsList']:
+        domain = Domain(item)
+        audit = item.get('audit') or {}
+        domain.audit_created_date = _eager_datetime(audit.get('createdDate'))
+        domain.audit_updated_date = _eager_datetime(audit.get('updatedDate'))
+        domains.append(domain)
+    return domains
+
+
+def _lazy(access):
+    def run(parsed: dict):
+        # Every page starts with a cold datetime cache
+        response._datetimes.clear()
+        return access(Response(parsed))
+    return run
+
+
+def main(count: int = 10000, number: int = 20):
+    raw = make_page(count)
+    eager = timeit.timeit(lambda: _eager(json.loads(raw)), number=number)
+    eager = eager / number * 1000
+    print('{:<20} {:8.2f} ms/page'.format('eager baseline', eager))
+
+    cases = [
+        ('domains_count only', lambda r: r.domains_count),
+        ('domain names', lambda r: r.domains_list.names()),
+        ('iterate names', lambda r: [d.domain_name for d in r.domains_list]),
+        ('all audit dates', lambda r: [
+            (d.audit_created_date, d.audit_updated_date)
+            for d in r.domains_list]),
+    ]
+    for title, access in cases:
+        run = _lazy(access)
+        seconds = timeit.timeit(lambda: run(json.loads(raw)), number=number)
+        lazy = seconds / number * 1000
+        print('{:<20} {:8.2f} ms/page {:6.1f}x faster than eager'.format(
+            title, lazy, eager / lazy))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,196 @@
+"""
+Micro-benchmarks of the parse and model hot paths with regression
+tracking.
+
+Every case runs on generated pages of 100, 10,000 and 100,000 domains,
+with and without audit dates. Throughput is the best of several timed
+runs; memory is the tracemalloc peak of one run.
+
+    python benchmarks/suite.py                 # print results
+    python benchmarks/suite.py --save          # store them as the baseline
+    python benchmarks/suite.py --compare       # fail on regressions
+    python benchmarks/suite.py --quick -k audit
+
+Baselines depend on the machine and interpreter, so record them on the
+machine that runs the comparison; baseline.json is not committed. Locally,
+run `--save` on the main branch, then `--compare` on your branch. The
+"Benchmark" CI job does the same on one runner: it saves a `--quick`
+baseline from the base revision and compares the pushed revision with a
+30% threshold for runner noise.
+"""
+import argparse
+import datetime
+import json
+import os
+import sys
+import timeit
+import tracemalloc
+
+from reversewhois import Client, Query, Response
+from reversewhois.models import decoder, response
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                        'baseline.json')
+SIZES = (100, 10000, 100000)
+
+
+def make_page(count: int, audit: bool) -> bytes:
+    """
+    Purchase page with `count` domains. Audit dates vary per domain, with
+    repeats like in real result sets.
+    """
+    domains = []
+    for i in range(count):
+        if not audit:
+            domains.append('domain{}.com'.format(i))
+            continue
+        domains.append({
+            'domainName': 'domain{}.com'.format(i),
+            'audit': {
+                'createdDate': '2021-01-{:02d}T{:02d}:{:02d}:{:02d}+00:00'
+                .format(i % 28 + 1, i % 24, i % 60, i // 60 % 60),
+                'updatedDate': '2021-02-{:02d}T{:02d}:{:02d}:{:02d}+00:00'
+                .format(i % 28 + 1, i % 24, i // 60 % 60, i % 60),
+            }
+        })
+    return json.dumps({
+        'nextPageSearchAfter': 1621957012,
+        'domainsCount': count,
+        'domainsList': domains
+    }).encode('utf-8')
+
+
+def _audit_dates(parsed: dict) -> list:
+    # Start every call with a cold datetime cache, otherwise all calls but
+    # the first of a timed run only measure cache lookups
+    response._datetimes.clear()
+    return [(d.audit_created_date, d.audit_updated_date)
+            for d in Response(parsed).domains_list]
+
+
+def _query() -> Query:
+    return Query(
+        basic_terms={'include': ['bank', 'loan'], 'exclude': ['blog']},
+        mode=Client.PURCHASE_MODE,
+        search_type=Client.HISTORIC,
+        include_audit_dates=True,
+        created_date_from=datetime.date(2020, 1, 1),
+        created_date_to=datetime.date(2021, 1, 1))
+
+
+# name, needs audit dates, setup(raw page) -> argument, measured function
+PAGE_CASES = [
+    ('decode', False, lambda raw: raw, decoder.loads),
+    ('response', False, decoder.loads, Response),
+    ('domains', False, decoder.loads,
+     lambda parsed: list(Response(parsed).domains_list)),
+    ('audit_dates', True, decoder.loads, _audit_dates),
+    ('parse_response', False, lambda raw: raw,
+     lambda raw: Client._parse_response(raw).domains_list.names()),
+]
+
+# name, setup() -> argument, measured function
+QUERY_CASES = [
+    ('query', lambda: None, lambda _: _query()),
+    ('next_page_payload', _query,
+     lambda query: query.with_search_after(1621957012).payload('key')),
+]
+
+
+def _measure(function, argument, repeat: int) -> dict:
+    timer = timeit.Timer(lambda: function(argument))
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number)) / number
+
+    tracemalloc.start()
+    function(argument)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'ops': 1 / best, 'peak': peak}
+
+
+def run(sizes, keyword: str or None = None, repeat: int = 3) -> dict:
+    """
+    Run all cases whose id contains `keyword`.
+
+    :return: Results by case id, e.g. 'domains[10000,audit]'
+    """
+    results = {}
+    for name, setup, function in QUERY_CASES:
+        if keyword is None or keyword in name:
+            results[name] = _measure(function, setup(), repeat)
+
+    for size in sizes:
+        for audit in (False, True):
+            raw = make_page(size, audit)
+            for name, needs_audit, setup, function in PAGE_CASES:
+                if needs_audit and not audit:
+                    continue
+                case = '{}[{},{}]'.format(
+                    name, size, 'audit' if audit else 'plain')
+                if keyword is None or keyword in case:
+                    results[case] = _measure(function, setup(raw), repeat)
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """
+    Cases slower or using more memory than the baseline by more than
+    `threshold` (0.2 means 20%)
+    """
+    regressions = []
+    for case, result in results.items():
+        base = baseline.get(case)
+        if base is None:
+            continue
+        if result['ops'] < base['ops'] * (1 - threshold):
+            regressions.append('{}: {:.0f} ops/s, baseline {:.0f}'.format(
+                case, result['ops'], base['ops']))
+        if result['peak'] > base['peak'] * (1 + threshold):
+            regressions.append('{}: peak {} B, baseline {} B'.format(
+                case, result['peak'], base['peak']))
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--save', action='store_true',
+                        help='store the results as the baseline')
+    parser.add_argument('--compare', action='store_true',
+                        help='exit with status 1 on regressions')
+    parser.add_argument('--baseline', default=BASELINE)
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='allowed slowdown, default 0.2 (20%%)')
+    parser.add_argument('--quick', action='store_true',
+                        help='skip the 100,000-domain pages')
+    parser.add_argument('-k', dest='keyword',
+                        help='run cases whose id contains this string')
+    args = parser.parse_args(argv)
+
+    sizes = SIZES[:-1] if args.quick else SIZES
+    results = run(sizes, args.keyword)
+    for case, result in results.items():
+        print('{:<32} {:>14,.1f} ops/s {:>12,} B peak'.format(
+            case, result['ops'], result['peak']))
+
+    if args.save:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as file:
+                baseline = json.load(file)
+        baseline.update(results)
+        with open(args.baseline, 'w') as file:
+            json.dump(baseline, file, indent=2, sort_keys=True)
+        print('Baseline saved to', args.baseline)
+
+    if args.compare:
+        with open(args.baseline) as file:
+            regressions = compare(results, json.load(file), args.threshold)
+        for regression in regressions:
+            print('REGRESSION', regression)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
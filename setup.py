@@ -67,6 +67,18 @@ setup(
         'requests',
     ],
     extras_require={
+        'async': [
+            'aiohttp',
+        ],
+        'fast': [
+            'orjson',
+        ],
+        'http2': [
+            'httpx[http2]',
+        ],
+        'parquet': [
+            'pyarrow',
+        ],
         'dev': [
             'tox',
             'flake8',
@@ -1,12 +1,48 @@
 __all__ = ['Client', 'ErrorMessage', 'ReverseWhoisApiError', 'ApiAuthError',
            'HttpApiError', 'EmptyApiKeyError', 'ParameterError',
            'ResponseError', 'BadRequestError', 'UnparsableApiResponseError',
-           'ApiRequester', 'Domain', 'Response', 'Fields']
+           'ApiRequester', 'Domain', 'Response', 'Fields', 'AsyncClient',
+           'AsyncApiRequester', 'BatchResult', 'DomainStream',
+           'ResponseCache', 'SqliteResponseCache', 'MemoryResponseCache',
+           'RetryPolicy', 'RateLimiter', 'TokenBucket', 'FileTokenBucket',
+           'Query', 'Harvester', 'Shard', 'Exporter', 'NdjsonExporter',
+           'CsvExporter', 'ParquetExporter', 'export', 'Checkpoint',
+           'CheckpointStore', 'FileCheckpointStore', 'SqliteCheckpointStore',
+           'Monitor', 'SnapshotStore', 'SqliteSnapshotStore', 'SnapshotDiff',
+           'BloomFilter', 'ScalableBloomFilter', 'Deduplicator',
+           'QueryPlanner', 'Plan', 'Expression', 'Term', 'And', 'Or', 'Not',
+           'Metrics', 'ParsePool', 'ApiKeyPool', 'Transport',
+           'TransportResponse', 'RequestsTransport', 'Urllib3Transport',
+           'HttpxTransport', 'MemoryTransport']
 
 from .client import Client
+from .metrics import Metrics
+from .parallel import ParsePool
+from .cache import ResponseCache, SqliteResponseCache, MemoryResponseCache
+from .async_client import AsyncClient
+from .checkpoint import CheckpointStore, FileCheckpointStore, \
+    SqliteCheckpointStore
+from .dedup import BloomFilter, ScalableBloomFilter, Deduplicator
+from .harvest import Harvester
+from .planner import QueryPlanner, Plan, Expression, Term, And, Or, \
+    Not
+from .monitor import Monitor, SnapshotStore, SqliteSnapshotStore
+from .export import Exporter, NdjsonExporter, CsvExporter, \
+    ParquetExporter, export
 from .net.http import ApiRequester
+from .net.async_http import AsyncApiRequester
+from .net.retry import RetryPolicy
+from .net.keypool import ApiKeyPool
+from .net.transport import Transport, TransportResponse, \
+    RequestsTransport, Urllib3Transport, HttpxTransport, MemoryTransport
+from .net.ratelimit import RateLimiter, TokenBucket, FileTokenBucket
 from .models.response import ErrorMessage, Domain, Response
-from .models.request import Fields
+from .models.batch import BatchResult
+from .models.checkpoint import Checkpoint
+from .models.diff import SnapshotDiff
+from .models.shard import Shard
+from .models.stream import DomainStream
+from .models.request import Fields, Query
 from .exceptions.error import ReverseWhoisApiError, ParameterError, \
     EmptyApiKeyError, ResponseError, UnparsableApiResponseError, \
     ApiAuthError, BadRequestError, HttpApiError
@@ -0,0 +1,229 @@
+from .checkpoint import CheckpointCursor
+from .client import Client
+from .net.async_http import AsyncApiRequester
+from .net.keypool import ApiKeyPool
+from .parallel import ParsePool
+from .models.response import Response
+from .exceptions.error import ParameterError
+
+
+class AsyncClient:
+    _api_requester: AsyncApiRequester or None
+    _api_key: str or ApiKeyPool
+
+    def __init__(self, api_key: str or ApiKeyPool, **kwargs):
+        """
+        asyncio counterpart of `Client`. Requires `aiohttp`.
+
+        :param api_key: str: Your API key, or an `ApiKeyPool` to spread
+                requests over several keys.
+        :key base_url: str: (optional) API endpoint URL.
+        :key timeout: float: (optional) API call timeout in seconds
+        :key pool_maxsize: int: (optional) Maximum number of concurrent
+                connections per host. Default is 100
+        :key idle_timeout: float: (optional) Keep-alive timeout for idle
+                connections in seconds. Default is 60
+        :key parse_pool: ParsePool: (optional) Decode large pages on worker
+                processes instead of the event loop. Default is None
+        :raises ParameterError: an option of `Client` that isn't supported
+                yet, e.g. `retry` or `cache`, or an unknown one
+        """
+
+        self._api_key = ''
+        self._api_requester = None
+
+        self.api_key = api_key
+        self.parse_pool = kwargs.pop('parse_pool', None)
+        unsupported = sorted(set(kwargs) - set(AsyncApiRequester.OPTIONS))
+        if unsupported:
+            raise ParameterError(
+                "Unsupported parameters: " + ', '.join(unsupported))
+
+        if 'base_url' not in kwargs:
+            kwargs['base_url'] = Client._DEFAULT_URL
+        if self.key_pool is not None:
+            kwargs['key_pool'] = self.key_pool
+
+        self.api_requester = AsyncApiRequester(**kwargs)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def close(self):
+        """
+        Close the underlying `AsyncApiRequester` session
+        """
+        await self._api_requester.close()
+
+    @property
+    def api_key(self) -> str or ApiKeyPool:
+        return self._api_key
+
+    @api_key.setter
+    def api_key(self, value: str or ApiKeyPool):
+        self._api_key = Client._validate_credentials(value)
+        if isinstance(self._api_requester, AsyncApiRequester):
+            self._api_requester.key_pool = self.key_pool
+
+    @property
+    def key_pool(self) -> ApiKeyPool or None:
+        """The `ApiKeyPool` given as `api_key`, if any"""
+        if isinstance(self._api_key, ApiKeyPool):
+            return self._api_key
+        return None
+
+    @property
+    def parse_pool(self) -> ParsePool or None:
+        return self._parse_pool
+
+    @parse_pool.setter
+    def parse_pool(self, value: ParsePool or None):
+        if value is not None and not isinstance(value, ParsePool):
+            raise ParameterError("parse_pool should be a ParsePool instance")
+        self._parse_pool = value
+
+    @property
+    def api_requester(self) -> AsyncApiRequester or None:
+        return self._api_requester
+
+    @api_requester.setter
+    def api_requester(self, value: AsyncApiRequester):
+        self._api_requester = value
+
+    @property
+    def base_url(self) -> str:
+        return self._api_requester.base_url
+
+    @base_url.setter
+    def base_url(self, value: str or None):
+        if value is None:
+            self._api_requester.base_url = Client._DEFAULT_URL
+        else:
+            self._api_requester.base_url = value
+
+    @property
+    def timeout(self) -> float:
+        return self._api_requester.timeout
+
+    @timeout.setter
+    def timeout(self, value: float):
+        self._api_requester.timeout = value
+
+    async def iterate_pages(self, **kwargs):
+        """
+        Asynchronously iterate over all pages of domains.
+        Use with `async for`.
+
+        Accepts the same keyword arguments as `Client.iterate_pages`,
+        including `checkpoint`, except `prefetch`.
+
+        :yields Response: Instance of `Response` with a page.
+        :raises aiohttp.ClientError:
+        :raises ReverseWhoisApiError: Base class for all API errors
+        :raises ParameterError: `prefetch` was given
+        """
+
+        if 'prefetch' in kwargs:
+            raise ParameterError(
+                "prefetch is not supported by AsyncClient.iterate_pages")
+        store = kwargs.pop('checkpoint', None)
+        query = Client._to_query(kwargs).with_mode(Client.PURCHASE_MODE)
+        cursor = None
+        if store is not None:
+            cursor = CheckpointCursor(store, query)
+            query = cursor.query
+
+        resp = await self.purchase(query=query)
+        while True:
+            yield resp
+            if cursor is not None:
+                cursor.processed(resp)
+            if not resp.has_next():
+                return
+            resp = await self.next_page(resp, query=query)
+
+    async def next_page(self, current_page: Response, **kwargs) \
+            -> Response:
+        """
+        Get the next page if available, otherwise returns the given one
+
+        Accepts the same keyword arguments as `Client.next_page`.
+
+        :param Response current_page: The current page.
+        :return: Instance of `Response` with a next page.
+        :raises aiohttp.ClientError:
+        :raises ReverseWhoisApiError: Base class for all API errors
+        """
+
+        if current_page.has_next():
+            query = Client._to_query(kwargs).with_search_after(
+                current_page.next_page_search_after)
+            return await self.purchase(query=query)
+        return current_page
+
+    async def preview(self, **kwargs) -> Response:
+        """
+        Get parsed API response as a `Response` instance.
+        Mode = `preview`
+
+        Accepts the same keyword arguments as `Client.preview`.
+
+        :return: `Response` instance
+        :raises aiohttp.ClientError:
+        :raises ReverseWhoisApiError: Base class for all API errors
+        """
+        kwargs['mode'] = Client.PREVIEW_MODE
+        return await self.data(**kwargs)
+
+    async def purchase(self, **kwargs) -> Response:
+        """
+        Get parsed API response as a `Response` instance.
+        Mode = `purchase`
+
+        Accepts the same keyword arguments as `Client.purchase`.
+
+        :return: `Response` instance
+        :raises aiohttp.ClientError:
+        :raises ReverseWhoisApiError: Base class for all API errors
+        """
+        kwargs['mode'] = Client.PURCHASE_MODE
+        return await self.data(**kwargs)
+
+    async def data(self, **kwargs) -> Response:
+        """
+        Get parsed API response as a `Response` instance.
+
+        Accepts the same keyword arguments as `Client.data`.
+
+        :return: `Response` instance
+        :raises aiohttp.ClientError:
+        :raises ReverseWhoisApiError: Base class for all API errors
+        """
+
+        kwargs['response_format'] = Client._PARSABLE_FORMAT
+
+        raw = await self._api_requester.post_raw(self._payload(kwargs))
+        pool = self._parse_pool
+        if pool is not None and len(raw) >= pool.min_size:
+            return await pool.parse_async(raw)
+        return Client._parse_response(raw)
+
+    async def raw_data(self, **kwargs) -> str:
+        """
+        Get raw API response.
+
+        Accepts the same keyword arguments as `Client.raw_data`.
+
+        :return: str
+        :raises aiohttp.ClientError:
+        :raises ReverseWhoisApiError: Base class for all API errors
+        """
+
+        return await self._api_requester.post(self._payload(kwargs))
+
+    def _payload(self, kwargs: dict) -> dict:
+        return Client._to_query(kwargs).payload(
+            Client._checked_api_key(self.api_key))
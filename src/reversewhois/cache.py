@@ -0,0 +1,276 @@
+from collections import OrderedDict
+import sqlite3
+import threading
+import time
+
+
+class ResponseCache:
+    """
+    Base class for caches of raw API responses.
+
+    `Client` derives the key from its `base_url` and `Query.fingerprint`,
+    so the same query with the same parameters (including `searchAfter`)
+    sent to the same endpoint maps to the same entry, and clients of
+    different endpoints can share a cache.
+    """
+
+    def __init__(self):
+        self._hits = 0
+        self._misses = 0
+        self._stats_lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    def get(self, key: str) -> bytes or None:
+        """
+        Cached response body or None if it is missing or expired
+        """
+        value = self._get(key)
+        with self._stats_lock:
+            if value is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        return value
+
+    def set(self, key: str, mode: str, value: bytes):
+        """
+        Store a response body. `mode` selects the TTL
+        """
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def stats(self) -> dict:
+        return {'hits': self._hits, 'misses': self._misses}
+
+    def _get(self, key: str) -> bytes or None:
+        raise NotImplementedError
+
+
+class SqliteResponseCache(ResponseCache):
+    _schema = '''
+        CREATE TABLE IF NOT EXISTS responses (
+            key TEXT PRIMARY KEY,
+            mode TEXT NOT NULL,
+            value BLOB NOT NULL,
+            size INTEGER NOT NULL,
+            expires REAL NOT NULL,
+            accessed REAL NOT NULL
+        )'''
+
+    def __init__(self, path: str, preview_ttl: float = 3600,
+                 purchase_ttl: float = 86400,
+                 max_size: int = 256 * 1024 * 1024):
+        """
+        Response cache stored in an SQLite database. Safe to share between
+        threads and processes.
+
+        :param path: Database file path. ':memory:' keeps it in memory
+        :param preview_ttl: Optional. Lifetime of preview responses in
+                seconds. Default is 1 hour
+        :param purchase_ttl: Optional. Lifetime of purchase responses in
+                seconds. Default is 1 day
+        :param max_size: Optional. Maximum total size of stored responses
+                in bytes. Least recently used entries are evicted first.
+                Default is 256 MiB
+        """
+        super().__init__()
+
+        if preview_ttl < 0 or purchase_ttl < 0:
+            raise ValueError("TTL should be non-negative")
+        if max_size <= 0:
+            raise ValueError("Cache size should be positive")
+
+        self._ttl = {'preview': preview_ttl, 'purchase': purchase_ttl}
+        self._max_size = max_size
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=30,
+                                   check_same_thread=False)
+        with self._db:
+            self._db.execute(SqliteResponseCache._schema)
+            self._db.execute('CREATE INDEX IF NOT EXISTS responses_accessed '
+                             'ON responses (accessed)')
+
+    def set(self, key: str, mode: str, value: bytes):
+        ttl = self._ttl.get(mode, self._ttl['preview'])
+        if ttl == 0 or len(value) > self._max_size:
+            return
+        now = time.time()
+        with self._lock, self._db:
+            self._db.execute(
+                'INSERT OR REPLACE INTO responses '
+                '(key, mode, value, size, expires, accessed) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (key, mode, sqlite3.Binary(value), len(value),
+                 now + ttl, now))
+            self._evict(now)
+
+    def clear(self):
+        with self._lock, self._db:
+            self._db.execute('DELETE FROM responses')
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, size = self._db.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses'
+            ).fetchone()
+        result = super().stats()
+        result['entries'] = entries
+        result['size'] = size
+        return result
+
+    def _get(self, key: str) -> bytes or None:
+        now = time.time()
+        with self._lock, self._db:
+            row = self._db.execute(
+                'SELECT value, expires FROM responses WHERE key = ?',
+                (key,)).fetchone()
+            if row is None:
+                return None
+            if row[1] <= now:
+                self._db.execute('DELETE FROM responses WHERE key = ?',
+                                 (key,))
+                return None
+            self._db.execute(
+                'UPDATE responses SET accessed = ? WHERE key = ?',
+                (now, key))
+            return bytes(row[0])
+
+    def _evict(self, now: float):
+        self._db.execute('DELETE FROM responses WHERE expires <= ?', (now,))
+        total = self._db.execute(
+            'SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if total <= self._max_size:
+            return
+        rows = self._db.execute(
+            'SELECT key, size FROM responses ORDER BY accessed').fetchall()
+        evicted = []
+        for key, size in rows:
+            if total <= self._max_size:
+                break
+            evicted.append((key,))
+            total -= size
+        self._db.executemany('DELETE FROM responses WHERE key = ?', evicted)
+
+
+class MemoryResponseCache(ResponseCache):
+    def __init__(self, max_entries: int = 1024, preview_ttl: float = 60,
+                 purchase_ttl: float = 3600):
+        """
+        In-process LRU cache with per-mode TTLs. Safe to share between
+        threads.
+
+        :param max_entries: Optional. Maximum number of responses kept.
+                Default is 1024
+        :param preview_ttl: Optional. Lifetime of preview responses in
+                seconds. Default is 1 minute
+        :param purchase_ttl: Optional. Lifetime of purchase responses in
+                seconds. Default is 1 hour
+        """
+        super().__init__()
+
+        if preview_ttl < 0 or purchase_ttl < 0:
+            raise ValueError("TTL should be non-negative")
+        if type(max_entries) is not int or max_entries <= 0:
+            raise ValueError("Cache size should be a positive integer")
+
+        self._ttl = {'preview': preview_ttl, 'purchase': purchase_ttl}
+        self._max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def set(self, key: str, mode: str, value: bytes):
+        ttl = self._ttl.get(mode, self._ttl['preview'])
+        if ttl == 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        result = super().stats()
+        result['entries'] = len(self._entries)
+        return result
+
+    def _get(self, key: str) -> bytes or None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls with the same key into one: the first
+    caller runs the function, the others wait for its result.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key: str, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
@@ -0,0 +1,192 @@
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from .models.checkpoint import Checkpoint
+from .models.request import Query
+from .models.response import Response
+from .exceptions.error import ParameterError
+
+
+class CheckpointStore:
+    """
+    Base class for durable storage of pagination cursors.
+
+    Checkpoints are keyed by `Query.fingerprint`, so restarting the same
+    query continues from the saved cursor.
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def load(self, fingerprint: str) -> Checkpoint or None:
+        """
+        Saved checkpoint or None if the query has no checkpoint
+        """
+        raise NotImplementedError
+
+    def save(self, checkpoint: Checkpoint):
+        """
+        Durably store a checkpoint, replacing the previous one
+        """
+        raise NotImplementedError
+
+    def delete(self, fingerprint: str):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class FileCheckpointStore(CheckpointStore):
+    def __init__(self, directory: str):
+        """
+        Stores one JSON file per query. Files are replaced atomically, so
+        a crash never leaves a partially written checkpoint.
+
+        :param directory: Directory for checkpoint files. Created if
+                missing
+        """
+        os.makedirs(directory, exist_ok=True)
+        self._directory = directory
+
+    def load(self, fingerprint: str) -> Checkpoint or None:
+        try:
+            with open(self._path(fingerprint), encoding='utf-8') as file:
+                state = json.load(file)
+        except FileNotFoundError:
+            return None
+        return Checkpoint(fingerprint, state['search_after'],
+                          state['pages'], state['updated'])
+
+    def save(self, checkpoint: Checkpoint):
+        data = json.dumps({
+            'search_after': checkpoint.search_after,
+            'pages': checkpoint.pages,
+            'updated': checkpoint.updated,
+        })
+        fd, temp = tempfile.mkstemp(dir=self._directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as file:
+                file.write(data)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temp, self._path(checkpoint.fingerprint))
+        except BaseException:
+            os.unlink(temp)
+            raise
+
+    def delete(self, fingerprint: str):
+        try:
+            os.unlink(self._path(fingerprint))
+        except FileNotFoundError:
+            pass
+
+    def _path(self, fingerprint: str) -> str:
+        return os.path.join(self._directory, fingerprint + '.json')
+
+
+class SqliteCheckpointStore(CheckpointStore):
+    _schema = '''
+        CREATE TABLE IF NOT EXISTS checkpoints (
+            fingerprint TEXT PRIMARY KEY,
+            search_after INTEGER NOT NULL,
+            pages INTEGER NOT NULL,
+            updated REAL NOT NULL
+        )'''
+
+    def __init__(self, path: str):
+        """
+        Stores checkpoints in an SQLite database. Safe to share between
+        threads and processes.
+
+        :param path: Database file path
+        """
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=30,
+                                   check_same_thread=False)
+        with self._db:
+            self._db.execute(SqliteCheckpointStore._schema)
+
+    def load(self, fingerprint: str) -> Checkpoint or None:
+        with self._lock:
+            row = self._db.execute(
+                'SELECT search_after, pages, updated FROM checkpoints '
+                'WHERE fingerprint = ?', (fingerprint,)).fetchone()
+        if row is None:
+            return None
+        return Checkpoint(fingerprint, row[0], row[1], row[2])
+
+    def save(self, checkpoint: Checkpoint):
+        with self._lock, self._db:
+            self._db.execute(
+                'INSERT OR REPLACE INTO checkpoints '
+                '(fingerprint, search_after, pages, updated) '
+                'VALUES (?, ?, ?, ?)',
+                (checkpoint.fingerprint, checkpoint.search_after,
+                 checkpoint.pages, checkpoint.updated))
+
+    def delete(self, fingerprint: str):
+        with self._lock, self._db:
+            self._db.execute(
+                'DELETE FROM checkpoints WHERE fingerprint = ?',
+                (fingerprint,))
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class CheckpointCursor:
+    """
+    Pagination progress of one query in a `CheckpointStore`, used by
+    `iterate_pages` of both clients.
+
+    `query` continues from the saved cursor, if any. Call `processed`
+    after the caller has processed each page: it saves the cursor of the
+    next page, or drops the checkpoint after the last one. A page is
+    processed when the caller asks for the next one, so after a crash the
+    page that was being processed is fetched again.
+    """
+
+    def __init__(self, store: CheckpointStore, query: Query):
+        """
+        :raises ParameterError: `store` is not a `CheckpointStore`
+        """
+        if not isinstance(store, CheckpointStore):
+            raise ParameterError(
+                "checkpoint should be a CheckpointStore instance")
+        self._store = store
+        self._fingerprint = query.fingerprint
+        self._pages = 0
+        self.query = query
+
+        state = store.load(self._fingerprint)
+        if state is not None:
+            self.query = query.with_search_after(state.search_after)
+            self._pages = state.pages
+
+    def processed(self, resp: Response):
+        self._pages += 1
+        if resp.has_next():
+            self._store.save(Checkpoint(
+                self._fingerprint, resp.next_page_search_after,
+                self._pages, time.time()))
+        else:
+            self._store.delete(self._fingerprint)
+
+
+def checkpointed(pages, cursor: CheckpointCursor):
+    """
+    Pass pages through, recording each one in `cursor` once the caller
+    asks for the next
+    """
+    for resp in pages:
+        yield resp
+        cursor.processed(resp)
@@ -1,57 +1,138 @@
-import datetime
-from json import loads, JSONDecodeError
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from collections import deque
+from xml.etree import ElementTree
+from queue import Queue, Full
+import hashlib
 import re
+import threading
+import time
 
+from .cache import ResponseCache, SingleFlight
+from .checkpoint import CheckpointCursor, checkpointed
+from .metrics import Metrics
 from .net.http import ApiRequester
+from .net.keypool import ApiKeyPool
+from .parallel import ParsePool
+from .models import decoder
+from .models.batch import BatchResult
 from .models.response import Response
-from .models.request import Fields
+from .models.stream import DomainStream
+from .models.request import Query
 from .exceptions.error import ParameterError, EmptyApiKeyError, \
     UnparsableApiResponseError
 
 
 class Client:
-    __default_url = "https://reverse-whois.whoisxmlapi.com/api/v2"
+    _DEFAULT_URL = "https://reverse-whois.whoisxmlapi.com/api/v2"
     _api_requester: ApiRequester or None
-    _api_key: str
+    _api_key: str or ApiKeyPool
 
     _re_api_key = re.compile(r'^at_[a-z0-9]{29}$', re.IGNORECASE)
     _SUPPORTED_FORMATS = ['json', 'xml']
 
-    _PARSABLE_FORMAT = 'json'
+    _PARSABLE_FORMAT = Query.JSON_FORMAT
 
-    JSON_FORMAT = 'json'
-    XML_FORMAT = 'xml'
-    PREVIEW_MODE = 'preview'
-    PURCHASE_MODE = 'purchase'
-    CURRENT = 'current'
-    HISTORIC = 'historic'
+    JSON_FORMAT = Query.JSON_FORMAT
+    XML_FORMAT = Query.XML_FORMAT
+    PREVIEW_MODE = Query.PREVIEW_MODE
+    PURCHASE_MODE = Query.PURCHASE_MODE
+    CURRENT = Query.CURRENT
+    HISTORIC = Query.HISTORIC
 
-    __DATETIME_OR_NONE_MSG = 'Value should be None or an instance of ' \
-                             'datetime.date'
-
-    def __init__(self, api_key: str, **kwargs):
+    def __init__(self, api_key: str or ApiKeyPool, **kwargs):
         """
-        :param api_key: str: Your API key.
+        :param api_key: str: Your API key, or an `ApiKeyPool` to spread
+                requests over several keys.
         :key base_url: str: (optional) API endpoint URL.
         :key timeout: float: (optional) API call timeout in seconds
+        :key pool_connections: int: (optional) Number of per-host
+                connection pools to keep. Default is 10
+        :key pool_maxsize: int: (optional) Maximum number of keep-alive
+                connections per host. Default is 10
+        :key pool_block: bool: (optional) Wait for a free connection
+                instead of opening an extra one. Default is False
+        :key idle_timeout: float: (optional) Drop connections that were not
+                used for this many seconds. Default is 60
+        :key retry: RetryPolicy: (optional) Retry transient failures such
+                as 429 and 503 responses or timeouts. Default is None
+        :key rate_limiter: RateLimiter: (optional) Client-side rate limit,
+                e.g. `TokenBucket` or `FileTokenBucket`. Default is None
+        :key cache: ResponseCache: (optional) Cache for raw API responses,
+                e.g. `SqliteResponseCache` or `MemoryResponseCache`.
+                Default is None
+        :key coalesce: bool: (optional) Let concurrent identical queries
+                share one HTTP request. Default is False
+        :key metrics: Metrics: (optional) Registry for request counters
+                and stage timings. Default is None (disabled)
+        :key parse_pool: ParsePool: (optional) Decode large pages on worker
+                processes. Default is None
         """
 
         self._api_key = ''
+        self._api_requester = None
 
         self.api_key = api_key
+        self.cache = kwargs.pop('cache', None)
+        self._single_flight = SingleFlight() \
+            if kwargs.pop('coalesce', False) else None
+        self._metrics = kwargs.get('metrics')
+        self.parse_pool = kwargs.pop('parse_pool', None)
 
         if 'base_url' not in kwargs:
-            kwargs['base_url'] = Client.__default_url
+            kwargs['base_url'] = Client._DEFAULT_URL
+        if self.key_pool is not None:
+            kwargs['key_pool'] = self.key_pool
 
         self.api_requester = ApiRequester(**kwargs)
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """
+        Release pooled connections held by the underlying `ApiRequester`
+        """
+        self._api_requester.close()
+
     @property
-    def api_key(self) -> str:
+    def api_key(self) -> str or ApiKeyPool:
         return self._api_key
 
     @api_key.setter
-    def api_key(self, value: str):
-        self._api_key = Client._validate_api_key(value)
+    def api_key(self, value: str or ApiKeyPool):
+        self._api_key = Client._validate_credentials(value)
+        if isinstance(self._api_requester, ApiRequester):
+            self._api_requester.key_pool = self.key_pool
+
+    @property
+    def key_pool(self) -> ApiKeyPool or None:
+        """The `ApiKeyPool` given as `api_key`, if any"""
+        if isinstance(self._api_key, ApiKeyPool):
+            return self._api_key
+        return None
+
+    @property
+    def cache(self) -> ResponseCache or None:
+        return self._cache
+
+    @cache.setter
+    def cache(self, value: ResponseCache or None):
+        if value is not None and not isinstance(value, ResponseCache):
+            raise ParameterError("Cache should be a ResponseCache instance")
+        self._cache = value
+
+    @property
+    def parse_pool(self) -> ParsePool or None:
+        return self._parse_pool
+
+    @parse_pool.setter
+    def parse_pool(self, value: ParsePool or None):
+        if value is not None and not isinstance(value, ParsePool):
+            raise ParameterError("parse_pool should be a ParsePool instance")
+        self._parse_pool = value
 
     @property
     def api_requester(self) -> ApiRequester or None:
@@ -68,7 +149,7 @@ class Client:
     @base_url.setter
     def base_url(self, value: str or None):
         if value is None:
-            self._api_requester.base_url = Client.__default_url
+            self._api_requester.base_url = Client._DEFAULT_URL
         else:
             self._api_requester.base_url = value
 
@@ -84,6 +165,8 @@ class Client:
         """
         Iterate over all pages of domains related to given MX
 
+        :key query: Optional. `Query` instance used instead of the search
+                parameters below
         :key basic_terms: Required if advanced_terms aren't specified.
                 Dictionary. Take a look at API documentation for the format
         :key advanced_terms: Required if basic_terms aren't specified
@@ -99,6 +182,12 @@ class Client:
         :key expires_date_from: Optional. datetime.date.
         :key expires_date_to: Optional. datetime.date.
         :key search_after: Optional. Integer.
+        :key prefetch: Optional. Integer. Fetch up to this many pages ahead
+                on a background thread while the caller processes the
+                current one. Default is 0 (no prefetching)
+        :key checkpoint: Optional. `CheckpointStore`. The cursor is saved
+                after every processed page and an interrupted run of the
+                same query continues from it
         :yields Response: Instance of `Response` with a page.
         :raises ConnectionError:
         :raises ReverseWhoisApiError: Base class for all errors below
@@ -109,18 +198,145 @@ class Client:
         :raises ParameterError: invalid parameter's value
         """
 
-        resp = self.purchase(**kwargs)
+        prefetch = kwargs.pop('prefetch', 0)
+        if type(prefetch) is not int or prefetch < 0:
+            raise ParameterError("prefetch must be a non-negative integer")
+        store = kwargs.pop('checkpoint', None)
+        query = Client._to_query(kwargs).with_mode(Client.PURCHASE_MODE)
+        if store is None:
+            yield from self._iterate(prefetch, query)
+            return
+
+        cursor = CheckpointCursor(store, query)
+        yield from checkpointed(self._iterate(prefetch, cursor.query),
+                                cursor)
+
+    def _iterate(self, prefetch: int, query: Query):
+        if prefetch > 0:
+            yield from self._iterate_prefetched(prefetch, query)
+            return
+
+        resp = self.purchase(query=query)
         yield resp
         while resp.has_next():
-            resp = self.next_page(resp, **kwargs)
+            resp = self.next_page(resp, query=query)
             yield resp
 
+    def _iterate_prefetched(self, prefetch: int, query: Query):
+        # Pages are fetched sequentially on a worker thread, because every
+        # request needs the cursor of the previous page. The bounded queue
+        # keeps at most `prefetch` pages in memory.
+        pages = Queue(maxsize=prefetch)
+        stop = threading.Event()
+        done = object()
+
+        def put(item) -> bool:
+            while not stop.is_set():
+                try:
+                    pages.put(item, timeout=0.1)
+                    return True
+                except Full:
+                    pass
+            return False
+
+        def fetch():
+            try:
+                resp = self.purchase(query=query)
+                if not put(resp):
+                    return
+                while resp.has_next():
+                    resp = self.next_page(resp, query=query)
+                    if not put(resp):
+                        return
+                put(done)
+            except Exception as error:
+                put(error)
+
+        worker = threading.Thread(
+            target=fetch, name='reverse-whois-prefetch', daemon=True)
+        worker.start()
+        try:
+            while True:
+                item = pages.get()
+                if item is done:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+
+    def batch(self, queries, max_workers: int or None = None,
+              ordered: bool = True):
+        """
+        Run independent queries concurrently on a bounded thread pool.
+        All workers share the connection pool of the `ApiRequester`.
+
+        :param queries: Iterable of `Query` instances or dictionaries with
+                keyword arguments for `Client.data`, e.g.
+                `{'basic_terms': {...}}`. The default mode is
+                `Client.PREVIEW_MODE`
+        :param max_workers: Optional. Number of concurrent requests.
+                Default is the connection pool size
+        :param ordered: Optional. Yield results in input order if True,
+                in completion order otherwise. Default is True
+        :yields BatchResult: One instance per query. Failed queries have
+                `error` set instead of `response`
+        """
+
+        if max_workers is None:
+            max_workers = self._api_requester.pool_maxsize
+        if type(max_workers) is not int or max_workers < 1:
+            raise ParameterError("max_workers must be a positive integer")
+
+        def run(index: int, query: dict or Query) -> BatchResult:
+            try:
+                if isinstance(query, Query):
+                    response = self.data(query=query)
+                else:
+                    response = self.data(**query)
+                return BatchResult(index, query, response=response)
+            except Exception as error:
+                return BatchResult(index, query, error=error)
+
+        # Keep a bounded number of queries submitted so that huge
+        # iterables are consumed lazily
+        window = max_workers * 2
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        pending = deque()
+        try:
+            for index, query in enumerate(queries):
+                if not isinstance(query, Query):
+                    query = dict(query)
+                pending.append(executor.submit(run, index, query))
+                while len(pending) >= window:
+                    yield from Client._drain(pending, ordered)
+            while pending:
+                yield from Client._drain(pending, ordered)
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
+
+    @staticmethod
+    def _drain(pending: deque, ordered: bool):
+        if ordered:
+            yield pending.popleft().result()
+            return
+
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            pending.remove(future)
+            yield future.result()
+
     def next_page(self, current_page: Response, **kwargs) \
             -> Response:
         """
         Get the next page if available, otherwise returns the given one
 
         :param Response current_page: The current page.
+        :key query: Optional. `Query` instance used instead of the search
+                parameters below
         :key basic_terms: Required if advanced_terms aren't specified.
                 Dictionary. Take a look at API documentation for the format
         :key advanced_terms: Required if basic_terms aren't specified
@@ -147,9 +363,9 @@ class Client:
         """
 
         if current_page.has_next():
-            search_after = current_page.next_page_search_after
-            kwargs['search_after'] = search_after
-            return self.purchase(**kwargs)
+            query = Client._to_query(kwargs).with_search_after(
+                current_page.next_page_search_after)
+            return self.purchase(query=query)
         return current_page
 
     def preview(self, **kwargs) -> Response:
@@ -157,6 +373,8 @@ class Client:
         Get parsed API response as a `Response` instance.
         Mode = `preview`
 
+        :key query: Optional. `Query` instance used instead of the search
+                parameters below
         :key basic_terms: Required if advanced_terms aren't specified.
                 Dictionary. Take a look at API documentation for the format
         :key advanced_terms: Required if basic_terms aren't specified
@@ -189,6 +407,8 @@ class Client:
         Get parsed API response as a `Response` instance.
         Mode = `purchase`
 
+        :key query: Optional. `Query` instance used instead of the search
+                parameters below
         :key basic_terms: Required if advanced_terms aren't specified.
                 Dictionary. Take a look at API documentation for the format
         :key advanced_terms: Required if basic_terms aren't specified
@@ -216,10 +436,37 @@ class Client:
         kwargs['mode'] = Client.PURCHASE_MODE
         return self.data(**kwargs)
 
+    def stream(self, **kwargs) -> DomainStream:
+        """
+        Get a purchase response as a `DomainStream`. Domains are parsed
+        incrementally and yielded one at a time while the body is
+        downloaded, so memory usage does not depend on the page size.
+        Mode = `purchase`
+
+        Accepts the same keyword arguments as `Client.purchase`.
+
+        :return: `DomainStream` instance
+        :raises ConnectionError:
+        :raises ReverseWhoisApiError: Base class for all errors below
+        :raises ApiAuthError: Server returned 401, 402 or 403 HTTP code
+        :raises BadRequestError: Server returned 400 or 422 HTTP code
+        :raises HttpApiError: HTTP code >= 300 and not equal to above codes
+        :raises UnparsableApiResponseError: response is not valid JSON
+        :raises ParameterError: invalid parameter's value
+        """
+        kwargs['mode'] = Client.PURCHASE_MODE
+        kwargs['response_format'] = Client._PARSABLE_FORMAT
+
+        payload = Client._to_query(kwargs).payload(
+            Client._checked_api_key(self.api_key))
+        return DomainStream(self._api_requester.post_stream(payload))
+
     def data(self, **kwargs) -> Response:
         """
         Get parsed API response as a `Response` instance.
 
+        :key query: Optional. `Query` instance used instead of the search
+                parameters below
         :key basic_terms: Required if advanced_terms aren't specified.
                 Dictionary. Take a look at API documentation for the format
         :key advanced_terms: Required if basic_terms aren't specified
@@ -249,20 +496,50 @@ class Client:
 
         kwargs['response_format'] = Client._PARSABLE_FORMAT
 
-        response = self.raw_data(**kwargs)
+        query = Client._to_query(kwargs)
+        if self._metrics is None:
+            return self._parse(self._post(query))
         try:
-            parsed = loads(str(response))
-            if 'domainsCount' in parsed:
-                return Response(parsed)
-            raise UnparsableApiResponseError(
-                "Could not find the correct root element.", None)
-        except JSONDecodeError as error:
+            return self._parse(self._post(query), self._metrics)
+        except Exception as error:
+            self._metrics.increment(Metrics.ERRORS, mode=query.mode,
+                                    type=type(error).__name__)
+            raise
+
+    def _parse(self, response: bytes,
+               metrics: Metrics or None = None) -> Response:
+        pool = self._parse_pool
+        if pool is not None and len(response) >= pool.min_size:
+            return pool.parse(response, metrics)
+        return Client._parse_response(response, metrics)
+
+    @staticmethod
+    def _parse_response(response: bytes or str,
+                        metrics: Metrics or None = None) -> Response:
+        started = time.perf_counter() if metrics is not None else 0.0
+        try:
+            parsed = decoder.loads(response)
+        except ValueError as error:
             raise UnparsableApiResponseError("Could not parse API response", error)
+        if type(parsed) is dict and 'domainsCount' in parsed:
+            if metrics is None:
+                return Response(parsed)
+            decoded = time.perf_counter()
+            result = Response(parsed)
+            metrics.observe(Metrics.STAGE_SECONDS, decoded - started,
+                            stage='decode')
+            metrics.observe(Metrics.STAGE_SECONDS,
+                            time.perf_counter() - decoded, stage='parse')
+            return result
+        raise UnparsableApiResponseError(
+            "Could not find the correct root element.", None)
 
     def raw_data(self, **kwargs) -> str:
         """
         Get raw API response.
 
+        :key query: Optional. `Query` instance used instead of the search
+                parameters below
         :key basic_terms: Required if advanced_terms aren't specified.
                 Dictionary. Take a look at API documentation for the format
         :key advanced_terms: Required if basic_terms aren't specified
@@ -292,118 +569,99 @@ class Client:
         :raises ParameterError: invalid parameter's value
         """
 
-        if self.api_key == '':
-            raise EmptyApiKeyError('')
+        return self._post(Client._to_query(kwargs)).decode('UTF-8')
+
+    def _post(self, query: Query) -> bytes:
+        payload = query.payload(Client._checked_api_key(self.api_key))
+        if self._cache is None and self._single_flight is None:
+            return self._api_requester.post_raw(payload)
+
+        key = self._cache_key(query)
+        if self._cache is not None:
+            cached = self._cache.get(key)
+            if self._metrics is not None:
+                self._metrics.increment(
+                    Metrics.CACHE_REQUESTS,
+                    result='miss' if cached is None else 'hit')
+            if cached is not None:
+                return cached
+        if self._single_flight is not None:
+            return self._single_flight.do(
+                key, lambda: self._fetch(key, query, payload))
+        return self._fetch(key, query, payload)
+
+    def _cache_key(self, query: Query) -> str:
+        # Clients of different endpoints may share one cache
+        return hashlib.sha256('{} {}'.format(
+            self.base_url, query.fingerprint).encode('utf-8')).hexdigest()
+
+    def _fetch(self, key: str, query: Query, payload: dict) -> bytes:
+        result = self._api_requester.post_raw(payload)
+        if self._cache is not None \
+                and Client._cacheable(result, query.response_format):
+            self._cache.set(key, query.mode, result)
+        return result
 
-        if 'basic_terms' in kwargs:
-            basic_terms = Client._validate_basic_terms(kwargs['basic_terms'])
-        else:
-            basic_terms = None
+    @staticmethod
+    def _cacheable(response: bytes, response_format: str) -> bool:
+        """
+        Checks if a response body is a complete result. Error bodies and
+        truncated responses are not cached, so the next call asks the API
+        again
+        """
+        if response_format == Query.XML_FORMAT:
+            try:
+                root = ElementTree.fromstring(response)
+            except ElementTree.ParseError:
+                return False
+            return root.find('domainsCount') is not None \
+                and root.find('messages') is None \
+                and root.find('code') is None
+        try:
+            parsed = decoder.loads(response)
+        except ValueError:
+            return False
+        return type(parsed) is dict and 'domainsCount' in parsed \
+            and 'messages' not in parsed and 'code' not in parsed
 
-        if 'advanced_terms' in kwargs:
-            advanced_terms = Client._validate_advanced_terms(
-                kwargs['advanced_terms'])
-        else:
-            advanced_terms = None
+    @staticmethod
+    def _checked_api_key(api_key: str or ApiKeyPool) -> str or None:
+        if api_key == '':
+            raise EmptyApiKeyError('')
+        if isinstance(api_key, ApiKeyPool):
+            # The requester sets a key from the pool on every attempt
+            return None
+        return api_key
 
-        if not advanced_terms and not basic_terms:
-            raise ParameterError(
-                "Required one from basic_terms and advanced_terms")
+    @staticmethod
+    def _to_query(kwargs: dict) -> Query:
+        """
+        Build a `Query` from keyword arguments, or reuse the one given as
+        `query` and apply the mode, format and cursor overrides
+        """
+        query = kwargs.get('query')
+        if query is None:
+            return Query(**kwargs)
+        if not isinstance(query, Query):
+            raise ParameterError("query should be a Query instance")
 
+        if 'mode' in kwargs:
+            query = query.with_mode(kwargs['mode'])
         if 'output_format' in kwargs:
             kwargs['response_format'] = kwargs['output_format']
         if 'response_format' in kwargs:
-            response_format = Client._validate_response_format(
-                kwargs['response_format'])
-        else:
-            response_format = Client._PARSABLE_FORMAT
-
-        if 'search_type' in kwargs:
-            search_type = Client._validate_search_type(kwargs['search_type'])
-        else:
-            search_type = Client.CURRENT
-
+            query = query.with_response_format(kwargs['response_format'])
         if 'search_after' in kwargs:
-            search_after = Client._validate_search_after(
-                kwargs['search_after'])
-        else:
-            search_after = None
-
-        if 'punycode' in kwargs:
-            punycode = Client._validate_punycode(kwargs['punycode'])
-        else:
-            punycode = True
-
-        if 'include_audit_dates' in kwargs:
-            include_audit_dates = Client._validate_include_audit_dates(
-                kwargs['include_audit_dates'])
-        else:
-            include_audit_dates = False
-
-        if 'mode' in kwargs:
-            mode = Client._validate_mode(kwargs['mode'])
-        else:
-            mode = Client.PREVIEW_MODE
-
-        if 'created_date_from' in kwargs:
-            created_date_from = Client._validate_date(
-                kwargs['created_date_from']
-            )
-        else:
-            created_date_from = None
-
-        if 'created_date_to' in kwargs:
-            created_date_to = Client._validate_date(
-                kwargs['created_date_to']
-            )
-        else:
-            created_date_to = None
+            query = query.with_search_after(kwargs['search_after'])
+        return query
 
-        if 'updated_date_from' in kwargs:
-            updated_date_from = Client._validate_date(
-                kwargs['updated_date_from']
-            )
-        else:
-            updated_date_from = None
-
-        if 'updated_date_to' in kwargs:
-            updated_date_to = Client._validate_date(
-                kwargs['updated_date_to']
-            )
-        else:
-            updated_date_to = None
-
-        if 'expired_date_from' in kwargs:
-            expired_date_from = Client._validate_date(
-                kwargs['expired_date_from']
-            )
-        else:
-            expired_date_from = None
-
-        if 'expired_date_to' in kwargs:
-            expired_date_to = Client._validate_date(
-                kwargs['expired_date_to']
-            )
-        else:
-            expired_date_to = None
-
-        return self._api_requester.post(self._build_payload(
-            self.api_key,
-            basic_terms,
-            advanced_terms,
-            mode,
-            punycode,
-            search_type,
-            search_after,
-            include_audit_dates,
-            response_format,
-            created_date_from,
-            created_date_to,
-            updated_date_from,
-            updated_date_to,
-            expired_date_from,
-            expired_date_to,
-        ))
+    @staticmethod
+    def _validate_credentials(value) -> str or ApiKeyPool:
+        if isinstance(value, ApiKeyPool):
+            for key in value.keys:
+                Client._validate_api_key(key)
+            return value
+        return Client._validate_api_key(value)
 
     @staticmethod
     def _validate_api_key(api_key) -> str:
@@ -413,147 +671,3 @@ class Client:
             return str(api_key)
         else:
             raise ParameterError("Invalid API key format.")
-
-    @staticmethod
-    def _validate_basic_terms(value) -> dict:
-        include, exclude = [], []
-        if value is None:
-            raise ParameterError("Terms list cannot be None.")
-        elif type(value) is dict:
-            if 'include' in value:
-                include = list(map(lambda s: str(s), value['include']))
-                include = list(
-                    filter(lambda s: s is not None and len(s) > 0, include))
-                if 4 <= len(include) <= 1:
-                    raise ParameterError("Include terms list must include "
-                                         "from 1 to 4 terms.")
-            if 'exclude' in value:
-                exclude = list(map(lambda s: str(s), value['exclude']))
-                exclude = list(
-                    filter(lambda s: s is not None and len(s) > 0, exclude))
-                if 4 <= len(exclude) <= 0:
-                    raise ParameterError("Exclude terms list must include "
-                                         "from 0 to 4 terms.")
-            if include:
-                return {'include': include, 'exclude': exclude}
-
-        raise ParameterError("Expected a dict with 2 lists of strings.")
-
-    @staticmethod
-    def _validate_advanced_terms(value) -> list:
-        if value is None:
-            raise ParameterError("Terms list cannot be None.")
-        elif type(value) is list:
-            if 4 <= len(value) < 1:
-                raise ParameterError(
-                    "Terms list must include form 1 to 4 items.")
-            for item in value:
-                if 'field' not in item or 'term' not in item:
-                    raise ParameterError(
-                        "Invalid advanced search terms format.")
-                if item['field'] not in Fields.values():
-                    raise ParameterError("Unknown field name.")
-                if item['term'] is None or type(item['term']) is not str \
-                        or len(item['term']) < 2:
-                    raise ParameterError("Term should be non-empty string.")
-            return value
-
-        raise ParameterError("Expected a list of pairs field <-> term.")
-
-    @staticmethod
-    def _validate_search_after(value):
-        if value is not None and int(value) > 0:
-            return int(value)
-
-        raise ParameterError(
-            "Search after parameter value must be an integer greater "
-            "than zero or None")
-
-    @staticmethod
-    def _validate_response_format(value: str):
-        if value.lower() in [Client.JSON_FORMAT, Client.XML_FORMAT]:
-            return value.lower()
-
-        raise ParameterError(
-            f"Response format must be {Client.JSON_FORMAT} "
-            f"or {Client.XML_FORMAT}")
-
-    @staticmethod
-    def _validate_include_audit_dates(value: bool):
-        if value in [True, False]:
-            return value
-
-        raise ParameterError("Value must be True or False")
-
-    @staticmethod
-    def _validate_mode(value: str):
-        if value.lower() in [Client.PREVIEW_MODE, Client.PURCHASE_MODE]:
-            return value.lower()
-
-        raise ParameterError(
-            f"Mode must be {Client.PREVIEW_MODE} or {Client.PURCHASE_MODE}")
-
-    @staticmethod
-    def _validate_punycode(value: bool):
-        if value in [True, False]:
-            return value
-
-        raise ParameterError(
-            "Punycode parameter value must be True or False")
-
-    @staticmethod
-    def _validate_search_type(value: str):
-        if value.lower() in [Client.CURRENT, Client.HISTORIC]:
-            return value.lower()
-
-        raise ParameterError(
-            f"Search type must be {Client.CURRENT} or {Client.HISTORIC}")
-
-    @staticmethod
-    def _validate_date(value: datetime.date or None):
-        if value is None or isinstance(value, datetime.date):
-            return str(value)
-
-        raise ParameterError(Client.__DATETIME_OR_NONE_MSG)
-
-    @staticmethod
-    def _build_payload(
-            api_key,
-            basic_terms,
-            advanced_terms,
-            mode,
-            punycode,
-            search_type,
-            search_after,
-            include_audit_dates,
-            response_format,
-            created_date_from,
-            created_date_to,
-            updated_date_from,
-            updated_date_to,
-            expired_date_from,
-            expired_date_to,
-    ) -> dict:
-        tmp = {
-            'apiKey': api_key,
-            'mode': mode,
-            'punycode': punycode,
-            'searchType': search_type,
-            'includeAuditDates': include_audit_dates,
-            'responseFormat': response_format,
-            'createdDateFrom': created_date_from,
-            'createdDateTo': created_date_to,
-            'updatedDateFrom': updated_date_from,
-            'updatedDateTo': updated_date_to,
-            'expiredDateFrom': expired_date_from,
-            'expiredDateTo': expired_date_to,
-            'searchAfter': search_after,
-            'basicSearchTerms': basic_terms,
-            'advancedSearchTerms': advanced_terms
-        }
-
-        payload = {}
-        for k, v in tmp.items():
-            if v is not None:
-                payload[k] = v
-        return payload
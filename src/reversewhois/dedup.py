@@ -0,0 +1,241 @@
+import hashlib
+import math
+import sqlite3
+import threading
+
+from .models.response import Domain, Response
+
+
+def _hashes(name: str) -> (int, int):
+    digest = hashlib.blake2b(name.encode('utf-8'), digest_size=16).digest()
+    # The second hash is odd, so probes never repeat a single position
+    return (int.from_bytes(digest[:8], 'little'),
+            int.from_bytes(digest[8:], 'little') | 1)
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        """
+        Fixed-size Bloom filter of strings. Positions are derived from
+        one BLAKE2b digest with double hashing.
+
+        :param capacity: Number of items the filter is sized for
+        :param error_rate: Optional. False-positive rate at capacity.
+                Default is 0.001
+        """
+        if type(capacity) is not int or capacity < 1:
+            raise ValueError("Capacity should be a positive integer")
+        if not 0 < error_rate < 1:
+            raise ValueError("Error rate should be in (0, 1)")
+
+        self._capacity = capacity
+        self._error_rate = error_rate
+        self._size = max(8, math.ceil(
+            -capacity * math.log(error_rate) / math.log(2) ** 2))
+        self._probes = max(1, round(self._size / capacity * math.log(2)))
+        self._bits = bytearray((self._size + 7) // 8)
+        self._count = 0
+
+    def __contains__(self, name: str) -> bool:
+        return self._contains(*_hashes(name))
+
+    def __len__(self) -> int:
+        """Number of items added"""
+        return self._count
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def error_rate(self) -> float:
+        return self._error_rate
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the bit array in bytes"""
+        return len(self._bits)
+
+    def full(self) -> bool:
+        return self._count >= self._capacity
+
+    def add(self, name: str) -> bool:
+        """
+        Add an item.
+
+        :return: True if the item was not in the filter before. False can
+                be a false positive
+        """
+        return self._add(*_hashes(name))
+
+    def _contains(self, h1: int, h2: int) -> bool:
+        bits, size = self._bits, self._size
+        for i in range(self._probes):
+            position = (h1 + i * h2) % size
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    def _add(self, h1: int, h2: int) -> bool:
+        bits, size = self._bits, self._size
+        added = False
+        for i in range(self._probes):
+            position = (h1 + i * h2) % size
+            mask = 1 << (position & 7)
+            if not bits[position >> 3] & mask:
+                bits[position >> 3] |= mask
+                added = True
+        if added:
+            self._count += 1
+        return added
+
+
+class ScalableBloomFilter:
+    def __init__(self, initial_capacity: int = 100000,
+                 error_rate: float = 0.001, growth: int = 2,
+                 tightening: float = 0.5):
+        """
+        Bloom filter that grows by adding larger filters with tighter
+        error rates, so the total false-positive rate stays below
+        `error_rate` however many items are added.
+
+        :param initial_capacity: Optional. Capacity of the first filter.
+                Default is 100000
+        :param error_rate: Optional. Upper bound of the false-positive
+                rate. Default is 0.001
+        :param growth: Optional. Capacity factor of each new filter.
+                Default is 2
+        :param tightening: Optional. Error rate factor of each new filter.
+                Default is 0.5
+        """
+        if type(growth) is not int or growth < 1:
+            raise ValueError("Growth should be a positive integer")
+        if not 0 < tightening < 1:
+            raise ValueError("Tightening should be in (0, 1)")
+
+        self._growth = growth
+        self._tightening = tightening
+        # The rates form a geometric series that sums up to `error_rate`
+        self._filters = [BloomFilter(
+            initial_capacity, error_rate * (1 - tightening))]
+
+    def __contains__(self, name: str) -> bool:
+        h1, h2 = _hashes(name)
+        return any(f._contains(h1, h2) for f in reversed(self._filters))
+
+    def __len__(self) -> int:
+        return sum(len(f) for f in self._filters)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(f.nbytes for f in self._filters)
+
+    def add(self, name: str) -> bool:
+        """
+        Add an item.
+
+        :return: True if the item was not in the filter before. False can
+                be a false positive
+        """
+        h1, h2 = _hashes(name)
+        if any(f._contains(h1, h2) for f in reversed(self._filters)):
+            return False
+        last = self._filters[-1]
+        if last.full():
+            last = BloomFilter(last.capacity * self._growth,
+                               last.error_rate * self._tightening)
+            self._filters.append(last)
+        return last._add(h1, h2)
+
+
+class Deduplicator:
+    def __init__(self, error_rate: float = 0.001,
+                 initial_capacity: int = 100000,
+                 exact: str or None = None):
+        """
+        Skips domains that were already emitted, using a few bytes of
+        memory per domain.
+
+        Without exact verification a new domain is dropped with
+        probability `error_rate`. With it, domains the filter reports as
+        seen are checked against an SQLite table of all emitted names, so
+        no domain is dropped by mistake. Reopening an existing database
+        loads its names into the filter, so domains emitted by an earlier
+        run are not emitted again.
+
+        :param error_rate: Optional. False-positive rate of the filter.
+                Default is 0.001
+        :param initial_capacity: Optional. See `ScalableBloomFilter`
+        :param exact: Optional. SQLite database path for exact
+                verification. Default is None (disabled)
+        """
+        self._filter = ScalableBloomFilter(initial_capacity, error_rate)
+        self._lock = threading.Lock()
+        self._db = None
+        if exact is not None:
+            self._db = sqlite3.connect(exact, check_same_thread=False)
+            with self._db:
+                self._db.execute(
+                    'CREATE TABLE IF NOT EXISTS seen '
+                    '(domain_name TEXT PRIMARY KEY) WITHOUT ROWID')
+            for row in self._db.execute('SELECT domain_name FROM seen'):
+                self._filter.add(row[0])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __len__(self) -> int:
+        """Approximate number of distinct domains seen"""
+        return len(self._filter)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the filter in bytes"""
+        return self._filter.nbytes
+
+    def add(self, name: str) -> bool:
+        """
+        Record a domain name.
+
+        :return: True if the name is new and should be emitted
+        """
+        with self._lock:
+            if self._filter.add(name):
+                if self._db is not None:
+                    self._db.execute(
+                        'INSERT OR IGNORE INTO seen VALUES (?)', (name,))
+                return True
+            if self._db is None:
+                return False
+            return self._db.execute(
+                'INSERT OR IGNORE INTO seen VALUES (?)',
+                (name,)).rowcount == 1
+
+    def filter(self, items):
+        """
+        Drop domains that were already seen.
+
+        :param items: Iterable of `Response` or `Domain` instances, e.g.
+                the result of `Client.iterate_pages`
+        :yields Domain: Each domain once
+        """
+        for item in items:
+            if isinstance(item, Response):
+                for domain in item.domains_list:
+                    if self.add(domain.domain_name):
+                        yield domain
+            elif isinstance(item, Domain):
+                if self.add(item.domain_name):
+                    yield item
+            else:
+                raise TypeError("Expected Response or Domain instances")
+
+    def close(self):
+        if self._db is not None:
+            with self._lock:
+                self._db.commit()
+                self._db.close()
+            self._db = None
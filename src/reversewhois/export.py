@@ -0,0 +1,265 @@
+import csv
+import gzip
+import io
+import json
+
+from .models.response import Domain, Response
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+
+class Exporter:
+    """
+    Base class for writers that stream `Domain` rows to a file.
+
+    Rows are written as pages arrive, so memory use does not depend on
+    the size of the result set. Each row holds the domain name and the
+    audit dates as ISO 8601 strings (or None).
+    """
+    COLUMNS = ('domain_name', 'audit_created_date', 'audit_updated_date')
+
+    def __init__(self, path: str, batch_size: int = 1000):
+        """
+        :param path: Output file path
+        :param batch_size: Optional. Number of domains collected before
+                they are written when single domains are passed.
+                Default is 1000
+        """
+        if type(batch_size) is not int or batch_size < 1:
+            raise ValueError("Batch size should be a positive integer")
+
+        self._path = path
+        self._batch_size = batch_size
+        self._count = 0
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def count(self) -> int:
+        """Number of rows written"""
+        return self._count
+
+    def write(self, items) -> int:
+        """
+        Write pages or domains, e.g. the result of `Client.iterate_pages`,
+        `Client.stream` or `Harvester.harvest`.
+
+        :param items: Iterable of `Response` or `Domain` instances
+        :return: Number of rows written by this call
+        """
+        written = self._count
+        batch = []
+        for item in items:
+            if isinstance(item, Response):
+                self._write_domains(item.domains_list)
+            elif isinstance(item, Domain):
+                batch.append(item)
+                if len(batch) >= self._batch_size:
+                    self._write_domains(batch)
+                    batch = []
+            else:
+                raise TypeError("Expected Response or Domain instances")
+        if batch:
+            self._write_domains(batch)
+        return self._count - written
+
+    def close(self):
+        """
+        Flush buffered rows and close the file
+        """
+        if not self._closed:
+            self._closed = True
+            self._close()
+
+    def _write_domains(self, domains):
+        rows = [Exporter._row(domain) for domain in domains]
+        if rows:
+            self._write_rows(rows)
+            self._count += len(rows)
+
+    def _write_rows(self, rows: list):
+        raise NotImplementedError
+
+    def _close(self):
+        raise NotImplementedError
+
+    @staticmethod
+    def _row(domain: Domain) -> tuple:
+        created = domain.audit_created_date
+        updated = domain.audit_updated_date
+        return (domain.domain_name,
+                created.isoformat() if created is not None else None,
+                updated.isoformat() if updated is not None else None)
+
+
+class _TextExporter(Exporter):
+    def __init__(self, path: str, compression: str or None = None,
+                 buffer_size: int = 1024 * 1024, batch_size: int = 1000):
+        super().__init__(path, batch_size)
+
+        if compression is None and path.endswith('.gz'):
+            compression = 'gzip'
+        if compression not in (None, 'gzip'):
+            raise ValueError("Supported compression: None and 'gzip'")
+        if type(buffer_size) is not int or buffer_size < 1:
+            raise ValueError("Buffer size should be a positive integer")
+
+        raw = open(path, 'wb', buffering=buffer_size)
+        if compression == 'gzip':
+            self._binary = gzip.GzipFile(fileobj=raw, mode='wb')
+            self._raw = raw
+        else:
+            self._binary = raw
+            self._raw = None
+        self._file = io.TextIOWrapper(
+            self._binary, encoding='utf-8', newline='')
+
+    def _close(self):
+        self._file.close()
+        if self._raw is not None:
+            self._raw.close()
+
+
+class NdjsonExporter(_TextExporter):
+    def __init__(self, path: str, compression: str or None = None,
+                 buffer_size: int = 1024 * 1024, batch_size: int = 1000):
+        """
+        Writes one JSON object per line.
+
+        :param path: Output file path
+        :param compression: Optional. None or 'gzip'. Paths ending with
+                '.gz' are compressed by default
+        :param buffer_size: Optional. File buffer size in bytes.
+                Default is 1 MiB
+        :param batch_size: Optional. See `Exporter`
+        """
+        super().__init__(path, compression, buffer_size, batch_size)
+
+    def _write_rows(self, rows: list):
+        columns = Exporter.COLUMNS
+        self._file.write(''.join(
+            json.dumps(dict(zip(columns, row)), ensure_ascii=False) + '\n'
+            for row in rows))
+
+
+class CsvExporter(_TextExporter):
+    def __init__(self, path: str, compression: str or None = None,
+                 buffer_size: int = 1024 * 1024, batch_size: int = 1000):
+        """
+        Writes comma-separated values with a header row. Missing dates
+        are written as empty fields.
+
+        :param path: Output file path
+        :param compression: Optional. None or 'gzip'. Paths ending with
+                '.gz' are compressed by default
+        :param buffer_size: Optional. File buffer size in bytes.
+                Default is 1 MiB
+        :param batch_size: Optional. See `Exporter`
+        """
+        super().__init__(path, compression, buffer_size, batch_size)
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(Exporter.COLUMNS)
+
+    def _write_rows(self, rows: list):
+        self._writer.writerows(rows)
+
+
+class ParquetExporter(Exporter):
+    def __init__(self, path: str, row_group_size: int = 65536,
+                 compression: str = 'snappy', batch_size: int = 1000):
+        """
+        Writes a Parquet file in row groups. Requires pyarrow.
+
+        Only one row group is kept in memory. Audit dates are stored as
+        UTC timestamps.
+
+        :param path: Output file path
+        :param row_group_size: Optional. Rows per row group.
+                Default is 65536
+        :param compression: Optional. Parquet codec, e.g. 'snappy',
+                'gzip' or 'zstd'. Default is 'snappy'
+        :param batch_size: Optional. See `Exporter`
+        """
+        if pyarrow is None:
+            raise ImportError(
+                "pyarrow is required for Parquet export. "
+                "Install it with `pip install reverse-whois[parquet]`")
+        if type(row_group_size) is not int or row_group_size < 1:
+            raise ValueError("Row group size should be a positive integer")
+
+        super().__init__(path, batch_size)
+
+        self._row_group_size = row_group_size
+        self._schema = pyarrow.schema([
+            ('domain_name', pyarrow.string()),
+            ('audit_created_date', pyarrow.timestamp('s', tz='UTC')),
+            ('audit_updated_date', pyarrow.timestamp('s', tz='UTC')),
+        ])
+        self._writer = pyarrow.parquet.ParquetWriter(
+            path, self._schema, compression=compression)
+        self._columns = ([], [], [])
+
+    def _write_domains(self, domains):
+        names, created, updated = self._columns
+        for domain in domains:
+            names.append(domain.domain_name)
+            created.append(domain.audit_created_date)
+            updated.append(domain.audit_updated_date)
+            self._count += 1
+            if len(names) >= self._row_group_size:
+                self._flush()
+                names, created, updated = self._columns
+
+    def _flush(self):
+        if self._columns[0]:
+            self._writer.write_table(pyarrow.Table.from_arrays(
+                [pyarrow.array(column, type=field.type)
+                 for column, field in zip(self._columns, self._schema)],
+                schema=self._schema))
+        self._columns = ([], [], [])
+
+    def _close(self):
+        self._flush()
+        self._writer.close()
+
+
+_EXPORTERS = {
+    'ndjson': NdjsonExporter,
+    'jsonl': NdjsonExporter,
+    'csv': CsvExporter,
+    'parquet': ParquetExporter,
+}
+
+
+def export(items, path: str, file_format: str or None = None,
+           **kwargs) -> int:
+    """
+    Stream pages or domains to a file.
+
+    :param items: Iterable of `Response` or `Domain` instances
+    :param path: Output file path
+    :param file_format: Optional. 'ndjson', 'csv' or 'parquet'. By default
+            it is taken from the file extension, e.g. 'domains.csv.gz'
+    :param kwargs: Options of the selected exporter
+    :return: Number of rows written
+    """
+    if file_format is None:
+        parts = path.lower().split('.')
+        if parts[-1] == 'gz':
+            parts.pop()
+        file_format = parts[-1] if len(parts) > 1 else ''
+    exporter = _EXPORTERS.get(file_format.lower())
+    if exporter is None:
+        raise ValueError("Unsupported export format: " + file_format)
+
+    with exporter(path, **kwargs) as writer:
+        return writer.write(items)
@@ -0,0 +1,167 @@
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+import datetime
+import logging
+
+from .client import Client
+from .dedup import Deduplicator
+from .models.request import Query
+from .models.shard import Shard
+from .exceptions.error import ParameterError
+
+
+class Harvester:
+    """
+    Collects result sets larger than one purchase allows by splitting
+    the creation date range into shards.
+
+    The range is bisected using `preview` counts until every shard
+    matches at most `cap` domains. The shards are then purchased in
+    parallel and the domains are merged without duplicates.
+    """
+    MAX_DOMAINS = 10000
+    EARLIEST_DATE = datetime.date(1985, 1, 1)
+
+    __logger = logging.getLogger(__name__)
+
+    def __init__(self, client: Client, max_workers: int or None = None,
+                 cap: int = MAX_DOMAINS,
+                 deduplicator: Deduplicator or None = None):
+        """
+        :param client: `Client` used for all requests
+        :param max_workers: Optional. Number of concurrent requests.
+                Default is the connection pool size of the client
+        :param cap: Optional. Maximum number of domains in one shard.
+                Default is 10000
+        :param deduplicator: Optional. `Deduplicator` for very large
+                result sets. Default is None (exact set of names)
+        """
+        if max_workers is None:
+            max_workers = client.api_requester.pool_maxsize
+        if type(max_workers) is not int or max_workers < 1:
+            raise ParameterError("max_workers must be a positive integer")
+        if type(cap) is not int or cap < 1:
+            raise ParameterError("cap must be a positive integer")
+
+        self._client = client
+        self._max_workers = max_workers
+        self._cap = cap
+        self._deduplicator = deduplicator
+
+    def shards(self, **kwargs) -> list:
+        """
+        Split the query into shards by creation date.
+
+        Accepts the same keyword arguments as `Client.data`. The range
+        is taken from `created_date_from` and `created_date_to`, by
+        default from 1985-01-01 to today.
+
+        Domains without a creation date are not matched by any shard.
+        A single day with more than `cap` domains cannot be split
+        further; it is returned as is and only its first `cap` domains
+        can be fetched.
+
+        :return: List of `Shard` sorted by date. Empty shards are omitted
+        :raises ConnectionError:
+        :raises ReverseWhoisApiError: Base class for all API errors
+        """
+        query, start, end = self._prepare(kwargs)
+        if start > end:
+            raise ParameterError(
+                "created_date_from must not be later than created_date_to")
+
+        result = []
+        windows = [(start, end)]
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            while windows:
+                counted = list(executor.map(
+                    lambda window: self._count(query, *window), windows))
+                windows = []
+                for shard in counted:
+                    if shard.count > self._cap and shard.splittable():
+                        windows.extend(Harvester._split(shard))
+                        continue
+                    if shard.count > self._cap:
+                        Harvester.__logger.warning(
+                            "%d domains created on %s, only %d can be "
+                            "fetched", shard.count, shard.date_from,
+                            self._cap)
+                    if shard.count > 0:
+                        result.append(shard)
+
+        result.sort(key=lambda s: s.date_from)
+        return result
+
+    def harvest(self, **kwargs):
+        """
+        Fetch all domains matching the query, one shard per worker.
+
+        Accepts the same keyword arguments as `Harvester.shards`.
+
+        :yields Domain: Each domain once, in shard completion order
+        :raises ConnectionError:
+        :raises ReverseWhoisApiError: Base class for all API errors
+        """
+        shards = self.shards(**kwargs)
+        if self._deduplicator is not None:
+            is_new = self._deduplicator.add
+        else:
+            seen = set()
+
+            def is_new(name: str) -> bool:
+                if name in seen:
+                    return False
+                seen.add(name)
+                return True
+
+        # At most one shard per worker is in flight, and a shard's domains
+        # are dropped once yielded, so memory doesn't grow with the result
+        executor = ThreadPoolExecutor(max_workers=self._max_workers)
+        shards = iter(shards)
+        pending = set()
+        try:
+            while True:
+                for shard in shards:
+                    pending.add(executor.submit(self._fetch, shard))
+                    if len(pending) >= self._max_workers:
+                        break
+                if not pending:
+                    return
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    for domain in future.result():
+                        if is_new(domain.domain_name):
+                            yield domain
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
+
+    def _prepare(self, kwargs: dict) -> (Query, datetime.date,
+                                         datetime.date):
+        query = Client._to_query(kwargs)
+        start = query.date('created_date_from')
+        end = query.date('created_date_to')
+        if start is None:
+            start = Harvester.EARLIEST_DATE
+        if end is None:
+            end = datetime.date.today()
+        return query.with_search_after(None), start, end
+
+    def _count(self, query: Query, start: datetime.date,
+               end: datetime.date) -> Shard:
+        query = query.with_dates(created_date_from=start,
+                                 created_date_to=end)
+        count = self._client.preview(query=query).domains_count
+        return Shard(start, end, count, query)
+
+    def _fetch(self, shard: Shard) -> list:
+        domains = []
+        for page in self._client.iterate_pages(query=shard.query):
+            domains.extend(page.domains_list)
+        return domains
+
+    @staticmethod
+    def _split(shard: Shard) -> tuple:
+        middle = shard.date_from + (shard.date_to - shard.date_from) // 2
+        return ((shard.date_from, middle),
+                (middle + datetime.timedelta(days=1), shard.date_to))
@@ -0,0 +1,153 @@
+import bisect
+import threading
+
+
+class Metrics:
+    """
+    Thread-safe registry of counters and latency histograms.
+
+    Pass an instance as `metrics` to `Client` or `ApiRequester`. When no
+    registry is set the instrumentation is skipped entirely.
+
+    Recorded metrics:
+    - reversewhois_requests_total: HTTP attempts by `mode` and `status`
+      (HTTP code or exception name)
+    - reversewhois_stage_seconds: time spent by `stage`: `rate_limit`,
+      `ttfb` (connect and wait for headers), `download`, `decode` and
+      `parse`
+    - reversewhois_response_bytes_total: response bytes by `mode`
+    - reversewhois_retries_total: retried attempts by `reason`
+    - reversewhois_cache_requests_total: cache lookups by `result`
+    - reversewhois_errors_total: failed calls by `mode` and `type`
+    """
+    REQUESTS = 'reversewhois_requests_total'
+    STAGE_SECONDS = 'reversewhois_stage_seconds'
+    RESPONSE_BYTES = 'reversewhois_response_bytes_total'
+    RETRIES = 'reversewhois_retries_total'
+    CACHE_REQUESTS = 'reversewhois_cache_requests_total'
+    ERRORS = 'reversewhois_errors_total'
+
+    DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                       1.0, 2.5, 5.0, 10.0, 30.0)
+
+    _help = {
+        REQUESTS: 'HTTP requests sent to the API',
+        STAGE_SECONDS: 'Time spent in each stage of an API call',
+        RESPONSE_BYTES: 'Bytes received from the API',
+        RETRIES: 'Retried HTTP requests',
+        CACHE_REQUESTS: 'Response cache lookups',
+        ERRORS: 'API calls that raised an error',
+    }
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """
+        :param buckets: Optional. Upper bounds of the histogram buckets in
+                seconds. Default is `Metrics.DEFAULT_BUCKETS`
+        """
+        buckets = tuple(sorted(float(b) for b in buckets))
+        if not buckets:
+            raise ValueError("At least one bucket is required")
+
+        self._buckets = buckets
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+
+    def increment(self, name: str, value: float = 1, **labels):
+        """
+        Add `value` to a counter
+        """
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels):
+        """
+        Record a value in a histogram
+        """
+        key = (name, tuple(sorted(labels.items())))
+        index = bisect.bisect_left(self._buckets, value)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = [[0] * (len(self._buckets) + 1), 0.0, 0]
+                self._histograms[key] = histogram
+            histogram[0][index] += 1
+            histogram[1] += value
+            histogram[2] += 1
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def snapshot(self) -> dict:
+        """
+        Current values as a dictionary:
+        `{name: [{'labels': {...}, 'value': ...}]}` for counters and
+        `{name: [{'labels': {...}, 'count': ..., 'sum': ...,
+        'buckets': {upper bound: cumulative count}}]}` for histograms
+        """
+        with self._lock:
+            counters = list(self._counters.items())
+            histograms = [(key, (list(h[0]), h[1], h[2]))
+                          for key, h in self._histograms.items()]
+
+        result = {}
+        for (name, labels), value in sorted(counters):
+            result.setdefault(name, []).append(
+                {'labels': dict(labels), 'value': value})
+        for (name, labels), (counts, total, count) in sorted(histograms):
+            cumulative, buckets = 0, {}
+            for bound, bucket in zip(self._buckets + (float('inf'),),
+                                     counts):
+                cumulative += bucket
+                buckets[bound] = cumulative
+            result.setdefault(name, []).append({
+                'labels': dict(labels), 'count': count, 'sum': total,
+                'buckets': buckets})
+        return result
+
+    def to_prometheus(self) -> str:
+        """
+        Current values in the Prometheus text exposition format
+        """
+        lines = []
+        for name, series in self.snapshot().items():
+            histogram = 'buckets' in series[0]
+            lines.append('# HELP {} {}'.format(
+                name, Metrics._help.get(name, name)))
+            lines.append('# TYPE {} {}'.format(
+                name, 'histogram' if histogram else 'counter'))
+            for item in series:
+                labels = item['labels']
+                if not histogram:
+                    lines.append('{}{} {}'.format(
+                        name, Metrics._labels(labels),
+                        Metrics._number(item['value'])))
+                    continue
+                for bound, count in item['buckets'].items():
+                    le = '+Inf' if bound == float('inf') \
+                        else Metrics._number(bound)
+                    lines.append('{}_bucket{} {}'.format(
+                        name, Metrics._labels(labels, le=le), count))
+                lines.append('{}_sum{} {}'.format(
+                    name, Metrics._labels(labels),
+                    Metrics._number(item['sum'])))
+                lines.append('{}_count{} {}'.format(
+                    name, Metrics._labels(labels), item['count']))
+        return '\n'.join(lines) + '\n' if lines else ''
+
+    @staticmethod
+    def _labels(labels: dict, **extra) -> str:
+        labels = dict(labels, **extra)
+        if not labels:
+            return ''
+        return '{' + ','.join(
+            '{}="{}"'.format(k, str(v).replace('\\', '\\\\')
+                             .replace('"', '\\"').replace('\n', '\\n'))
+            for k, v in labels.items()) + '}'
+
+    @staticmethod
+    def _number(value: float) -> str:
+        return repr(float(value)) if value != int(value) else str(int(value))
@@ -1,24 +1,44 @@
 class BaseModel:
+    __slots__ = ()
+
     def __init__(self):
         pass
 
     def __str__(self):
         result = {}
-        for k, v in self.__dict__.items():
-            result[k] = str(v)
+        for k in self._fields():
+            result[k] = str(getattr(self, k))
         return str(result)
 
     def __repr__(self):
         return self.__str__()
 
     def __eq__(self, other):
-        is_equal = isinstance(other, self.__class__)
-        for k, v in self.__dict__.values():
-            is_equal = is_equal and (other.__dict__.get(k) == v)
-
-        return is_equal
+        if not isinstance(other, self.__class__):
+            return False
+        for k in self._fields():
+            if getattr(self, k) != getattr(other, k):
+                return False
+        return True
 
     def __getitem__(self, item):
-        if type(item) is str and item in self.__dict__:
-            return self.__dict__[item]
+        if type(item) is str and item in self._fields():
+            return getattr(self, item)
         raise KeyError("Invalid key: {}".format(item))
+
+    @classmethod
+    def _fields(cls) -> tuple:
+        """
+        Public fields of the model, taken from the class annotations.
+        Fields may be plain attributes or properties.
+        """
+        fields = cls.__dict__.get('_model_fields')
+        if fields is None:
+            names = []
+            for klass in reversed(cls.__mro__):
+                for name in klass.__dict__.get('__annotations__', {}):
+                    if not name.startswith('_') and name not in names:
+                        names.append(name)
+            fields = tuple(names)
+            cls._model_fields = fields
+        return fields
@@ -0,0 +1,27 @@
+from .base import BaseModel
+from .response import Response
+
+
+class BatchResult(BaseModel):
+    __slots__ = ('index', 'query', 'response', 'error')
+
+    index: int
+    query: dict
+    response: Response or None
+    error: Exception or None
+
+    def __init__(self, index: int, query: dict,
+                 response: Response or None = None,
+                 error: Exception or None = None):
+        super().__init__()
+
+        self.index = index
+        self.query = query
+        self.response = response
+        self.error = error
+
+    def ok(self) -> bool:
+        """
+        Checks if the query succeeded
+        """
+        return self.error is None
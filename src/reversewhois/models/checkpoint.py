@@ -0,0 +1,19 @@
+from .base import BaseModel
+
+
+class Checkpoint(BaseModel):
+    __slots__ = ('fingerprint', 'search_after', 'pages', 'updated')
+
+    fingerprint: str
+    search_after: int
+    pages: int
+    updated: float
+
+    def __init__(self, fingerprint: str, search_after: int, pages: int,
+                 updated: float = 0.0):
+        super().__init__()
+
+        self.fingerprint = fingerprint
+        self.search_after = search_after
+        self.pages = pages
+        self.updated = updated
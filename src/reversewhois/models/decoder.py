@@ -0,0 +1,67 @@
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+def _stdlib_loads(data: bytes or str):
+    return json.loads(data)
+
+
+def _ujson_loads(data: bytes or str):
+    if type(data) is not str:
+        data = bytes(data).decode('UTF-8')
+    return ujson.loads(data)
+
+
+_BACKENDS = {'json': _stdlib_loads}
+if ujson is not None:
+    _BACKENDS['ujson'] = _ujson_loads
+if orjson is not None:
+    _BACKENDS['orjson'] = orjson.loads
+
+_backend = 'orjson' if orjson is not None \
+    else 'ujson' if ujson is not None else 'json'
+_loads = _BACKENDS[_backend]
+
+
+def loads(data: bytes or str):
+    """
+    Decode a JSON document from bytes or str with the selected backend.
+
+    :raises ValueError: invalid JSON. All backends raise subclasses of it
+    """
+    return _loads(data)
+
+
+def available_backends() -> list:
+    return list(_BACKENDS)
+
+
+def get_backend() -> str:
+    """
+    Name of the JSON backend in use
+    """
+    return _backend
+
+
+def set_backend(name: str):
+    """
+    Select the JSON backend: `orjson`, `ujson` or `json` (standard library).
+    The fastest installed one is selected by default.
+
+    :raises ValueError: the backend is not installed
+    """
+    global _backend, _loads
+    if name not in _BACKENDS:
+        raise ValueError("JSON backend {} is not available. Options: {}"
+                         .format(name, ', '.join(_BACKENDS)))
+    _backend = name
+    _loads = _BACKENDS[name]
@@ -0,0 +1,27 @@
+from .base import BaseModel
+
+
+class SnapshotDiff(BaseModel):
+    __slots__ = ('fingerprint', 'added', 'removed', 'count', 'full_refresh')
+
+    fingerprint: str
+    added: list
+    removed: list
+    count: int
+    full_refresh: bool
+
+    def __init__(self, fingerprint: str, added: list, removed: list,
+                 count: int, full_refresh: bool):
+        super().__init__()
+
+        self.fingerprint = fingerprint
+        self.added = added
+        self.removed = removed
+        self.count = count
+        self.full_refresh = full_refresh
+
+    def changed(self) -> bool:
+        """
+        Checks if any domain was added or removed
+        """
+        return bool(self.added or self.removed)
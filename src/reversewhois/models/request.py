@@ -1,3 +1,9 @@
+import datetime
+import hashlib
+import json
+
+from ..exceptions.error import ParameterError
+
 
 class Fields:
     domain_name = 'DomainName'
@@ -63,3 +69,380 @@ class Fields:
     @staticmethod
     def values() -> list:
         return [Fields.__dict__[k] for k in Fields.keys()]
+
+
+_FIELD_NAMES = frozenset(Fields.values())
+
+_DATETIME_OR_NONE_MSG = 'Value should be None or an instance of ' \
+                        'datetime.date'
+
+
+class Query:
+    """
+    Validated, immutable set of query parameters.
+
+    Validation runs once when the query is created and the serialized
+    payload is cached, so paging with `with_search_after` is cheap.
+    Queries are hashable; equal parameters give equal queries.
+    """
+    __slots__ = ('_payload', '_key', '_fingerprint')
+
+    JSON_FORMAT = 'json'
+    XML_FORMAT = 'xml'
+    PREVIEW_MODE = 'preview'
+    PURCHASE_MODE = 'purchase'
+    CURRENT = 'current'
+    HISTORIC = 'historic'
+
+    _DATE_PARAMETERS = (
+        ('created_date_from', 'createdDateFrom'),
+        ('created_date_to', 'createdDateTo'),
+        ('updated_date_from', 'updatedDateFrom'),
+        ('updated_date_to', 'updatedDateTo'),
+        ('expired_date_from', 'expiredDateFrom'),
+        ('expired_date_to', 'expiredDateTo'),
+    )
+
+    def __init__(self, **kwargs):
+        """
+        :key basic_terms: Required if advanced_terms aren't specified.
+                Dictionary. Take a look at API documentation for the format
+        :key advanced_terms: Required if basic_terms aren't specified
+                List. Take a look at API documentation for the format
+        :key mode: Optional. Supported options - `Query.PREVIEW_MODE` and
+                `Query.PURCHASE_MODE`. Default is `Query.PREVIEW_MODE`
+        :key search_type: Optional. Supported options - `Query.CURRENT`
+                and `Query.HISTORIC`. Default is `Query.CURRENT`
+        :key punycode: Optional. Boolean. Default value is `True`
+        :key include_audit_dates: Optional. Boolean. Default value is `False`
+        :key created_date_from: Optional. datetime.date.
+        :key created_date_to: Optional. datetime.date.
+        :key updated_date_from: Optional. datetime.date.
+        :key updated_date_to: Optional. datetime.date.
+        :key expired_date_from: Optional. datetime.date.
+        :key expired_date_to: Optional. datetime.date.
+        :key response_format: Optional. use constants
+                JSON_FORMAT and XML_FORMAT
+        :key search_after: Optional. Integer.
+        :raises ParameterError: invalid parameter's value
+        """
+
+        if 'basic_terms' in kwargs:
+            basic_terms = Query._validate_basic_terms(kwargs['basic_terms'])
+        else:
+            basic_terms = None
+
+        if 'advanced_terms' in kwargs:
+            advanced_terms = Query._validate_advanced_terms(
+                kwargs['advanced_terms'])
+        else:
+            advanced_terms = None
+
+        if not advanced_terms and not basic_terms:
+            raise ParameterError(
+                "Required one from basic_terms and advanced_terms")
+
+        if 'output_format' in kwargs:
+            kwargs['response_format'] = kwargs['output_format']
+        if 'response_format' in kwargs:
+            response_format = Query._validate_response_format(
+                kwargs['response_format'])
+        else:
+            response_format = Query.JSON_FORMAT
+
+        if 'search_type' in kwargs:
+            search_type = Query._validate_search_type(kwargs['search_type'])
+        else:
+            search_type = Query.CURRENT
+
+        if 'search_after' in kwargs:
+            search_after = Query._validate_search_after(
+                kwargs['search_after'])
+        else:
+            search_after = None
+
+        if 'punycode' in kwargs:
+            punycode = Query._validate_punycode(kwargs['punycode'])
+        else:
+            punycode = True
+
+        if 'include_audit_dates' in kwargs:
+            include_audit_dates = Query._validate_include_audit_dates(
+                kwargs['include_audit_dates'])
+        else:
+            include_audit_dates = False
+
+        if 'mode' in kwargs:
+            mode = Query._validate_mode(kwargs['mode'])
+        else:
+            mode = Query.PREVIEW_MODE
+
+        payload = {
+            'mode': mode,
+            'punycode': punycode,
+            'searchType': search_type,
+            'includeAuditDates': include_audit_dates,
+            'responseFormat': response_format,
+        }
+        for name, key in Query._DATE_PARAMETERS:
+            if name in kwargs:
+                payload[key] = Query._validate_date(kwargs[name])
+        payload['searchAfter'] = search_after
+        payload['basicSearchTerms'] = basic_terms
+        payload['advancedSearchTerms'] = advanced_terms
+
+        self._set_payload(
+            {k: v for k, v in payload.items() if v is not None})
+
+    def __eq__(self, other):
+        return isinstance(other, Query) and self.key == other.key
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __repr__(self):
+        return 'Query({})'.format(self.key)
+
+    @property
+    def mode(self) -> str:
+        return self._payload['mode']
+
+    @property
+    def response_format(self) -> str:
+        return self._payload['responseFormat']
+
+    @property
+    def search_after(self) -> int or None:
+        return self._payload.get('searchAfter')
+
+    @property
+    def key(self) -> str:
+        """
+        Canonical JSON form of the parameters
+        """
+        if self._key is None:
+            self._key = json.dumps(
+                self._payload, sort_keys=True, separators=(',', ':'),
+                ensure_ascii=False)
+        return self._key
+
+    @property
+    def fingerprint(self) -> str:
+        """
+        SHA-256 of the canonical form, e.g. for cache keys and file names
+        """
+        if self._fingerprint is None:
+            self._fingerprint = hashlib.sha256(
+                self.key.encode('utf-8')).hexdigest()
+        return self._fingerprint
+
+    def payload(self, api_key: str or None = None) -> dict:
+        """
+        Request payload. A new dictionary is returned on every call, with
+        its own copies of the search terms
+        """
+        payload = dict(self._payload)
+        terms = payload.get('basicSearchTerms')
+        if terms is not None:
+            payload['basicSearchTerms'] = {
+                key: list(value) for key, value in terms.items()}
+        terms = payload.get('advancedSearchTerms')
+        if terms is not None:
+            payload['advancedSearchTerms'] = [dict(item) for item in terms]
+        if api_key is not None:
+            payload['apiKey'] = api_key
+        return payload
+
+    def with_search_after(self, value: int or None) -> 'Query':
+        """
+        Copy of the query for the page after `value`
+        """
+        payload = dict(self._payload)
+        if value is None:
+            payload.pop('searchAfter', None)
+        else:
+            payload['searchAfter'] = Query._validate_search_after(value)
+        return Query._from_payload(payload)
+
+    def with_mode(self, value: str) -> 'Query':
+        """
+        Copy of the query in the given mode
+        """
+        value = Query._validate_mode(value)
+        if value == self.mode:
+            return self
+        payload = dict(self._payload)
+        payload['mode'] = value
+        return Query._from_payload(payload)
+
+    def with_response_format(self, value: str) -> 'Query':
+        """
+        Copy of the query with the given response format
+        """
+        value = Query._validate_response_format(value)
+        if value == self.response_format:
+            return self
+        payload = dict(self._payload)
+        payload['responseFormat'] = value
+        return Query._from_payload(payload)
+
+    def with_audit_dates(self, value: bool) -> 'Query':
+        """
+        Copy of the query with `include_audit_dates` set to the value
+        """
+        value = Query._validate_include_audit_dates(value)
+        if value == self._payload['includeAuditDates']:
+            return self
+        payload = dict(self._payload)
+        payload['includeAuditDates'] = value
+        return Query._from_payload(payload)
+
+    def with_dates(self, **kwargs) -> 'Query':
+        """
+        Copy of the query with the given date parameters, e.g.
+        `created_date_from=datetime.date(2020, 1, 1)`. None removes the
+        parameter
+
+        :raises ParameterError: unknown parameter or invalid value
+        """
+        names = dict(Query._DATE_PARAMETERS)
+        payload = dict(self._payload)
+        for name, value in kwargs.items():
+            if name not in names:
+                raise ParameterError("Unknown date parameter " + name)
+            value = Query._validate_date(value)
+            if value is None:
+                payload.pop(names[name], None)
+            else:
+                payload[names[name]] = value
+        return Query._from_payload(payload)
+
+    def date(self, name: str) -> datetime.date or None:
+        """
+        Value of a date parameter, e.g. `created_date_from`
+        """
+        names = dict(Query._DATE_PARAMETERS)
+        if name not in names:
+            raise ParameterError("Unknown date parameter " + name)
+        value = self._payload.get(names[name])
+        if value is None:
+            return None
+        return datetime.datetime.strptime(value[:10], '%Y-%m-%d').date()
+
+    def _set_payload(self, payload: dict):
+        self._payload = payload
+        self._key = None
+        self._fingerprint = None
+
+    @staticmethod
+    def _from_payload(payload: dict) -> 'Query':
+        query = Query.__new__(Query)
+        query._set_payload(payload)
+        return query
+
+    @staticmethod
+    def _validate_basic_terms(value) -> dict:
+        include, exclude = [], []
+        if value is None:
+            raise ParameterError("Terms list cannot be None.")
+        elif type(value) is dict:
+            if 'include' in value:
+                include = list(map(lambda s: str(s), value['include']))
+                include = list(
+                    filter(lambda s: s is not None and len(s) > 0, include))
+                if not 1 <= len(include) <= 4:
+                    raise ParameterError("Include terms list must include "
+                                         "from 1 to 4 terms.")
+            if 'exclude' in value:
+                exclude = list(map(lambda s: str(s), value['exclude']))
+                exclude = list(
+                    filter(lambda s: s is not None and len(s) > 0, exclude))
+                if len(exclude) > 4:
+                    raise ParameterError("Exclude terms list must include "
+                                         "from 0 to 4 terms.")
+            if include:
+                return {'include': include, 'exclude': exclude}
+
+        raise ParameterError("Expected a dict with 2 lists of strings.")
+
+    @staticmethod
+    def _validate_advanced_terms(value) -> list:
+        if value is None:
+            raise ParameterError("Terms list cannot be None.")
+        elif type(value) is list:
+            if not 1 <= len(value) <= 4:
+                raise ParameterError(
+                    "Terms list must include form 1 to 4 items.")
+            terms = []
+            for item in value:
+                if type(item) is not dict \
+                        or 'field' not in item or 'term' not in item:
+                    raise ParameterError(
+                        "Invalid advanced search terms format.")
+                if item['field'] not in _FIELD_NAMES:
+                    raise ParameterError("Unknown field name.")
+                if item['term'] is None or type(item['term']) is not str \
+                        or len(item['term']) < 2:
+                    raise ParameterError("Term should be non-empty string.")
+                terms.append(dict(item))
+            return terms
+
+        raise ParameterError("Expected a list of pairs field <-> term.")
+
+    @staticmethod
+    def _validate_search_after(value):
+        if value is not None and int(value) > 0:
+            return int(value)
+
+        raise ParameterError(
+            "Search after parameter value must be an integer greater "
+            "than zero or None")
+
+    @staticmethod
+    def _validate_response_format(value: str):
+        if value.lower() in [Query.JSON_FORMAT, Query.XML_FORMAT]:
+            return value.lower()
+
+        raise ParameterError(
+            f"Response format must be {Query.JSON_FORMAT} "
+            f"or {Query.XML_FORMAT}")
+
+    @staticmethod
+    def _validate_include_audit_dates(value: bool):
+        if value in [True, False]:
+            return value
+
+        raise ParameterError("Value must be True or False")
+
+    @staticmethod
+    def _validate_mode(value: str):
+        if value.lower() in [Query.PREVIEW_MODE, Query.PURCHASE_MODE]:
+            return value.lower()
+
+        raise ParameterError(
+            f"Mode must be {Query.PREVIEW_MODE} or {Query.PURCHASE_MODE}")
+
+    @staticmethod
+    def _validate_punycode(value: bool):
+        if value in [True, False]:
+            return value
+
+        raise ParameterError(
+            "Punycode parameter value must be True or False")
+
+    @staticmethod
+    def _validate_search_type(value: str):
+        if value.lower() in [Query.CURRENT, Query.HISTORIC]:
+            return value.lower()
+
+        raise ParameterError(
+            f"Search type must be {Query.CURRENT} or {Query.HISTORIC}")
+
+    @staticmethod
+    def _validate_date(value: datetime.date or None):
+        if value is None:
+            return None
+        if isinstance(value, datetime.date):
+            return str(value)
+
+        raise ParameterError(_DATETIME_OR_NONE_MSG)
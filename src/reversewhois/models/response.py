@@ -11,22 +11,54 @@ if sys.version_info < (3, 9):
 
 _re_date_format = re.compile(r'^\d\d\d\d-\d\d-\d\d$')
 _re_datetime_format = re.compile(
-    r'^(\d\d\d\d-\d\d-\d\dT\d\d:\d\d:\d\d)\+(\d\d):(\d\d)$')
+    r'\d\d\d\d-\d\d-\d\dT\d\d:\d\d:\d\d\+\d\d:\d\d')
 
 
 def _datetime_value(values: dict, key: str) -> datetime.datetime or None:
     if key in values and values[key] is not None:
-        value = values[key]
-        match = _re_datetime_format.fullmatch(value)
-        if match is not None:
-            (dt, tz_hours, tz_minutes) = match.groups()
-            value = "{}+{}{}".format(dt, tz_hours, tz_minutes)
-            return datetime.datetime.strptime(
-                value, '%Y-%m-%dT%H:%M:%S%z')
+        return _shared_datetime(values[key])
 
     return None
 
 
+# Audit dates repeat a lot within a result set, so equal values share one
+# datetime object and all datetimes with the same offset share one tzinfo
+_timezones = {}
+_datetimes = {}
+_DATETIMES_CACHE_SIZE = 65536
+
+
+def _timezone(hours: str, minutes: str) -> datetime.timezone:
+    key = (hours, minutes)
+    tz = _timezones.get(key)
+    if tz is None:
+        tz = datetime.timezone(
+            datetime.timedelta(hours=int(hours), minutes=int(minutes)))
+        _timezones[key] = tz
+    return tz
+
+
+def _shared_datetime(value: str) -> datetime.datetime or None:
+    result = _datetimes.get(value)
+    if result is not None:
+        return result
+
+    match = _re_datetime_format.fullmatch(value)
+    if match is None:
+        return None
+    # The regex has validated the layout, so fixed slices are safe and much
+    # cheaper than strptime
+    result = datetime.datetime(
+        int(value[0:4]), int(value[5:7]), int(value[8:10]),
+        int(value[11:13]), int(value[14:16]), int(value[17:19]),
+        tzinfo=_timezone(value[20:22], value[23:25]))
+
+    if len(_datetimes) >= _DATETIMES_CACHE_SIZE:
+        _datetimes.clear()
+    _datetimes[value] = result
+    return result
+
+
 def _date_value(values: dict, key: str) -> datetime.date or None:
     if key in values and values[key] is not None:
         if _re_date_format.match(values[key]) is not None:
@@ -42,6 +74,11 @@ def _string_value(values: dict, key: str) -> str:
     return ''
 
 
+def _raw_string(values: dict, key: str) -> str or None:
+    value = values.get(key)
+    return value if type(value) is str else None
+
+
 def _int_value(values: dict, key: str) -> int:
     if key in values and values[key]:
         return int(values[key])
@@ -54,13 +91,6 @@ def _list_value(values: dict, key: str) -> list:
     return []
 
 
-def _list_of_objects(values: dict, key: str, classname: str) -> list:
-    r = []
-    if key in values and type(values[key]) is list:
-        r = [globals()[classname](x) for x in values[key]]
-    return r
-
-
 def _timestamp2datetime(timestamp: int) -> datetime.datetime or None:
     if timestamp is not None:
         return datetime.datetime.fromtimestamp(timestamp)
@@ -68,6 +98,8 @@ def _timestamp2datetime(timestamp: int) -> datetime.datetime or None:
 
 
 class Domain(BaseModel):
+    __slots__ = ('domain_name', '_audit_created_date', '_audit_updated_date')
+
     domain_name: str
     audit_created_date: datetime.datetime or None
     audit_updated_date: datetime.datetime or None
@@ -76,21 +108,155 @@ class Domain(BaseModel):
         super().__init__()
 
         self.domain_name = ''
-        self.audit_created_date = None
-        self.audit_updated_date = None
+        # Audit dates keep the raw string until first access
+        self._audit_created_date = None
+        self._audit_updated_date = None
 
         if type(value) is str:
-            self.domain_name = value
+            self.domain_name = sys.intern(value)
         if type(value) is dict:
-            self.domain_name = _string_value(value, 'domainName')
-            if 'audit' in value:
-                self.audit_created_date = _datetime_value(
-                    value['audit'], 'createdDate')
-                self.audit_updated_date = _datetime_value(
-                    value['audit'], 'updatedDate')
+            self.domain_name = sys.intern(_string_value(value, 'domainName'))
+            audit = value.get('audit')
+            if type(audit) is dict:
+                self._audit_created_date = _raw_string(audit, 'createdDate')
+                self._audit_updated_date = _raw_string(audit, 'updatedDate')
+        if type(value) is tuple:
+            # (name, created, updated) as rebuilt from a `ParsePool` worker,
+            # missing dates are empty strings
+            self.domain_name = sys.intern(value[0])
+            self._audit_created_date = value[1] or None
+            self._audit_updated_date = value[2] or None
+
+    @property
+    def audit_created_date(self) -> datetime.datetime or None:
+        if type(self._audit_created_date) is str:
+            self._audit_created_date = _shared_datetime(
+                self._audit_created_date)
+        return self._audit_created_date
+
+    @audit_created_date.setter
+    def audit_created_date(self, value: datetime.datetime or None):
+        self._audit_created_date = value
+
+    @property
+    def audit_updated_date(self) -> datetime.datetime or None:
+        if type(self._audit_updated_date) is str:
+            self._audit_updated_date = _shared_datetime(
+                self._audit_updated_date)
+        return self._audit_updated_date
+
+    @audit_updated_date.setter
+    def audit_updated_date(self, value: datetime.datetime or None):
+        self._audit_updated_date = value
+
+
+class DomainList(list):
+    """
+    List of `Domain` built lazily from the decoded `domainsList`.
+
+    Items are converted to `Domain` on access. With `cache=True` (default)
+    the converted object replaces the raw item, so it is built only once.
+    `Response` always caches; `cache=False` is an internal switch for code
+    that builds its own `DomainList` and reads each item once.
+    """
+    __slots__ = ('_cache',)
+
+    def __init__(self, values=(), cache: bool = True):
+        super().__init__(values)
+        self._cache = cache
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return DomainList(super().__getitem__(index), self._cache)
+        item = super().__getitem__(index)
+        if type(item) is Domain:
+            return item
+        domain = Domain(item)
+        if self._cache:
+            super().__setitem__(index, domain)
+        return domain
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __reversed__(self):
+        for i in range(len(self) - 1, -1, -1):
+            yield self[i]
+
+    def __contains__(self, item):
+        return any(domain == item for domain in self)
+
+    def __eq__(self, other):
+        if isinstance(other, list):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    def __add__(self, other):
+        return list(self) + list(other)
+
+    def __mul__(self, n):
+        return list(self) * n
+
+    __rmul__ = __mul__
+
+    def __repr__(self):
+        return repr(list(self))
+
+    def __str__(self):
+        return str(list(self))
+
+    def __copy__(self):
+        return DomainList(super().__iter__(), self._cache)
+
+    def copy(self):
+        return self.__copy__()
+
+    def pop(self, index=-1):
+        domain = self[index]
+        super().pop(index)
+        return domain
+
+    def index(self, value, *args):
+        return list(self).index(value, *args)
+
+    def count(self, value):
+        return list(self).count(value)
+
+    def remove(self, value):
+        del self[self.index(value)]
+
+    def sort(self, *, key=None, reverse=False):
+        items = list(self)
+        items.sort(key=key, reverse=reverse)
+        self[:] = items
+
+    def names(self) -> list:
+        """
+        Domain names without building `Domain` objects
+        """
+        names = []
+        for item in super().__iter__():
+            if type(item) is str:
+                names.append(item)
+            elif type(item) is Domain:
+                names.append(item.domain_name)
+            elif type(item) is dict:
+                names.append(_string_value(item, 'domainName'))
+            elif type(item) is tuple:
+                names.append(item[0])
+            else:
+                names.append('')
+        return names
 
 
 class Response(BaseModel):
+    __slots__ = ('domains_count', 'next_page_search_after', 'domains_list')
+
     domains_count: int
     next_page_search_after: str or None
     if sys.version_info < (3, 9):
@@ -103,14 +269,14 @@ class Response(BaseModel):
 
         self.domains_count = 0
         self.next_page_search_after = None
-        self.domains_list = []
+        self.domains_list = DomainList()
 
         if values is not None:
             self.domains_count = _int_value(values, 'domainsCount')
             self.next_page_search_after = _int_value(
                 values, 'nextPageSearchAfter')
-            self.domains_list = _list_of_objects(
-                values, 'domainsList', 'Domain')
+            if type(values.get('domainsList')) is list:
+                self.domains_list = DomainList(values['domainsList'])
 
     def has_next(self) -> bool:
         """
@@ -121,13 +287,15 @@ class Response(BaseModel):
 
 
 class ErrorMessage(BaseModel):
+    __slots__ = ('code', 'message')
+
     code: int
     message: str
 
     def __init__(self, values):
         super().__init__()
 
-        self.int = 0
+        self.code = 0
         self.message = ''
 
         if values is not None:
@@ -0,0 +1,28 @@
+import datetime
+
+from .base import BaseModel
+from .request import Query
+
+
+class Shard(BaseModel):
+    __slots__ = ('date_from', 'date_to', 'count', 'query')
+
+    date_from: datetime.date
+    date_to: datetime.date
+    count: int
+    query: Query
+
+    def __init__(self, date_from: datetime.date, date_to: datetime.date,
+                 count: int, query: Query):
+        super().__init__()
+
+        self.date_from = date_from
+        self.date_to = date_to
+        self.count = count
+        self.query = query
+
+    def splittable(self) -> bool:
+        """
+        Checks if the date range spans more than one day
+        """
+        return self.date_from < self.date_to
@@ -0,0 +1,199 @@
+import codecs
+from json import JSONDecoder, JSONDecodeError
+
+from .response import Domain
+from ..exceptions.error import UnparsableApiResponseError
+
+
+_decoder = JSONDecoder()
+_whitespace = ' \t\n\r'
+
+_DOMAINS_LIST = 'domainsList'
+
+
+def _skip_whitespace(buffer: str, pos: int) -> int:
+    while pos < len(buffer) and buffer[pos] in _whitespace:
+        pos += 1
+    return pos
+
+
+def _parse_events(chunks):
+    """
+    Incremental tokenizer for the top-level object of a JSON response.
+
+    Yields `('field', key, value)` for top-level members and
+    `('domain', value)` for every item of `domainsList` as soon as the item
+    has been received completely. Only the item being decoded is kept in
+    memory, so the whole body is never materialized.
+    """
+    decode = codecs.getincrementaldecoder('utf-8')()
+    chunks = iter(chunks)
+    buffer = ''
+    pos = 0
+    eof = False
+    state = 'start'
+    key = None
+
+    while True:
+        pos = _skip_whitespace(buffer, pos)
+        if pos >= len(buffer) and not eof:
+            state_needs_data = True
+        else:
+            state_needs_data = False
+            char = buffer[pos] if pos < len(buffer) else ''
+
+            if state == 'start':
+                if char != '{':
+                    raise JSONDecodeError("Expecting '{'", buffer, pos)
+                pos += 1
+                state = 'key'
+            elif state == 'key':
+                if char == '}':
+                    return
+                value, end = _decode_value(buffer, pos, eof)
+                if end is None:
+                    state_needs_data = True
+                else:
+                    if not isinstance(value, str):
+                        raise JSONDecodeError(
+                            "Expecting property name", buffer, pos)
+                    key, pos, state = value, end, 'colon'
+            elif state == 'colon':
+                if char != ':':
+                    raise JSONDecodeError("Expecting ':'", buffer, pos)
+                pos += 1
+                state = 'list' if key == _DOMAINS_LIST else 'value'
+            elif state == 'value':
+                value, end = _decode_value(buffer, pos, eof)
+                if end is None:
+                    state_needs_data = True
+                else:
+                    yield 'field', key, value
+                    pos, state = end, 'next_key'
+            elif state == 'next_key':
+                if char == '}':
+                    return
+                if char != ',':
+                    raise JSONDecodeError("Expecting ','", buffer, pos)
+                pos += 1
+                state = 'key'
+            elif state == 'list':
+                if char == '[':
+                    pos += 1
+                    state = 'first_item'
+                else:
+                    # Not a list, e.g. null. Report it as a regular field
+                    state = 'value'
+            elif state in ('first_item', 'item'):
+                if char == ']' and state == 'first_item':
+                    pos += 1
+                    state = 'next_key'
+                else:
+                    value, end = _decode_value(buffer, pos, eof)
+                    if end is None:
+                        state_needs_data = True
+                    else:
+                        yield 'domain', value
+                        pos, state = end, 'next_item'
+            elif state == 'next_item':
+                if char == ']':
+                    pos += 1
+                    state = 'next_key'
+                elif char == ',':
+                    pos += 1
+                    state = 'item'
+                else:
+                    raise JSONDecodeError("Expecting ',' or ']'", buffer, pos)
+
+        if state_needs_data:
+            if eof:
+                raise JSONDecodeError("Unexpected end of data", buffer, pos)
+            try:
+                chunk = next(chunks)
+                text = decode.decode(chunk)
+            except StopIteration:
+                text = decode.decode(b'', final=True)
+                eof = True
+            buffer = buffer[pos:] + text
+            pos = 0
+
+
+def _decode_value(buffer: str, pos: int, eof: bool):
+    """
+    Returns `(value, end)` or `(None, None)` if more data is needed
+    """
+    try:
+        value, end = _decoder.raw_decode(buffer, pos)
+    except JSONDecodeError:
+        if eof:
+            raise
+        return None, None
+    # A number may continue in the next chunk
+    if end >= len(buffer) and not eof:
+        return None, None
+    return value, end
+
+
+class DomainStream:
+    domains_count: int
+    next_page_search_after: int or None
+
+    def __init__(self, chunks):
+        """
+        Lazily parsed purchase response.
+
+        Iterating yields `Domain` instances while the body is downloaded.
+        `domains_count` and `next_page_search_after` are set as soon as
+        they are read; the API sends them before the list of domains.
+
+        :param chunks: Iterable of `bytes` with the JSON response body
+        """
+        self._chunks = chunks
+        self._events = _parse_events(chunks)
+        self._has_count = False
+        self.domains_count = 0
+        self.next_page_search_after = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __iter__(self):
+        try:
+            for event in self._events:
+                if event[0] == 'domain':
+                    yield Domain(event[1])
+                else:
+                    self._set_field(event[1], event[2])
+        except JSONDecodeError as error:
+            raise UnparsableApiResponseError(
+                "Could not parse API response", error)
+
+        if not self._has_count:
+            raise UnparsableApiResponseError(
+                "Could not find the correct root element.", None)
+
+    def close(self):
+        """
+        Stop reading and release the underlying connection
+        """
+        self._events.close()
+        if hasattr(self._chunks, 'close'):
+            self._chunks.close()
+
+    def has_next(self) -> bool:
+        """
+        Checks if there are a next page. Reliable after the stream has
+        been consumed
+        """
+        return self.next_page_search_after is not None \
+            and self.next_page_search_after != 0
+
+    def _set_field(self, key: str, value):
+        if key == 'domainsCount':
+            self.domains_count = int(value) if value else 0
+            self._has_count = True
+        elif key == 'nextPageSearchAfter':
+            self.next_page_search_after = int(value) if value else 0
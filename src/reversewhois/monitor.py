@@ -0,0 +1,240 @@
+import datetime
+import sqlite3
+import threading
+
+from .client import Client
+from .models.diff import SnapshotDiff
+from .models.request import Query
+
+
+class SnapshotStore:
+    """
+    Base class for storage of the domain names seen by each monitored
+    query, keyed by `Query.fingerprint`.
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def state(self, fingerprint: str) -> tuple or None:
+        """
+        Date of the last run and number of known domains, or None if the
+        query has not been run yet
+        """
+        raise NotImplementedError
+
+    def known(self, fingerprint: str, names) -> set:
+        """
+        Subset of `names` present in the snapshot
+        """
+        raise NotImplementedError
+
+    def names(self, fingerprint: str):
+        """
+        Iterate over all domain names in the snapshot
+        """
+        raise NotImplementedError
+
+    def update(self, fingerprint: str, run_date: datetime.date,
+               added, removed=()):
+        """
+        Add and remove names and set the date of the last run
+        """
+        raise NotImplementedError
+
+    def delete(self, fingerprint: str):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class SqliteSnapshotStore(SnapshotStore):
+    _schema = (
+        '''CREATE TABLE IF NOT EXISTS snapshots (
+            fingerprint TEXT PRIMARY KEY,
+            run_date TEXT NOT NULL
+        )''',
+        '''CREATE TABLE IF NOT EXISTS snapshot_domains (
+            fingerprint TEXT NOT NULL,
+            domain_name TEXT NOT NULL,
+            PRIMARY KEY (fingerprint, domain_name)
+        ) WITHOUT ROWID''',
+    )
+
+    def __init__(self, path: str):
+        """
+        Stores snapshots in an SQLite database. Only domain names are
+        kept, so a snapshot costs a few dozen bytes per domain.
+
+        :param path: Database file path. ':memory:' keeps it in memory
+        """
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=30,
+                                   check_same_thread=False)
+        with self._db:
+            for statement in SqliteSnapshotStore._schema:
+                self._db.execute(statement)
+
+    def state(self, fingerprint: str) -> tuple or None:
+        with self._lock:
+            row = self._db.execute(
+                'SELECT run_date FROM snapshots WHERE fingerprint = ?',
+                (fingerprint,)).fetchone()
+            if row is None:
+                return None
+            count = self._db.execute(
+                'SELECT COUNT(*) FROM snapshot_domains '
+                'WHERE fingerprint = ?', (fingerprint,)).fetchone()[0]
+        return (datetime.datetime.strptime(row[0], '%Y-%m-%d').date(),
+                count)
+
+    def known(self, fingerprint: str, names) -> set:
+        names = list(names)
+        result = set()
+        # Stay below the default limit of 999 SQL variables
+        with self._lock:
+            for i in range(0, len(names), 900):
+                chunk = names[i:i + 900]
+                rows = self._db.execute(
+                    'SELECT domain_name FROM snapshot_domains '
+                    'WHERE fingerprint = ? AND domain_name IN ({})'.format(
+                        ','.join('?' * len(chunk))),
+                    [fingerprint] + chunk)
+                result.update(row[0] for row in rows)
+        return result
+
+    def names(self, fingerprint: str):
+        with self._lock:
+            rows = self._db.execute(
+                'SELECT domain_name FROM snapshot_domains '
+                'WHERE fingerprint = ?', (fingerprint,)).fetchall()
+        for row in rows:
+            yield row[0]
+
+    def update(self, fingerprint: str, run_date: datetime.date,
+               added, removed=()):
+        with self._lock, self._db:
+            self._db.execute(
+                'INSERT OR REPLACE INTO snapshots (fingerprint, run_date) '
+                'VALUES (?, ?)', (fingerprint, str(run_date)))
+            self._db.executemany(
+                'DELETE FROM snapshot_domains '
+                'WHERE fingerprint = ? AND domain_name = ?',
+                ((fingerprint, name) for name in removed))
+            self._db.executemany(
+                'INSERT OR IGNORE INTO snapshot_domains '
+                '(fingerprint, domain_name) VALUES (?, ?)',
+                ((fingerprint, name) for name in added))
+
+    def delete(self, fingerprint: str):
+        with self._lock, self._db:
+            self._db.execute('DELETE FROM snapshots WHERE fingerprint = ?',
+                             (fingerprint,))
+            self._db.execute(
+                'DELETE FROM snapshot_domains WHERE fingerprint = ?',
+                (fingerprint,))
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class Monitor:
+    """
+    Reports domains added to or removed from the result set of a query
+    since the previous run.
+
+    The first run purchases the whole result set. Later runs purchase
+    only domains created or updated since the previous run and compare
+    the `preview` count with the snapshot. If the counts disagree, some
+    domains stopped matching the query and the whole result set is
+    purchased again to find them.
+
+    Domains that start matching without a new created or updated date
+    are not in the purchased window. When as many domains stop matching,
+    the counts agree and both changes go unnoticed until the next full
+    refresh, so pass `full_refresh=True` from time to time, e.g. weekly.
+
+    A single purchase returns at most 10000 domains, so larger result
+    sets should be split into narrower queries.
+    """
+
+    def __init__(self, client: Client, store: SnapshotStore):
+        """
+        :param client: `Client` used for all requests
+        :param store: `SnapshotStore` with the domains seen so far
+        """
+        self._client = client
+        self._store = store
+
+    def run(self, full_refresh: bool = False, **kwargs) -> SnapshotDiff:
+        """
+        Fetch the changes since the previous run and update the snapshot.
+
+        Accepts the same keyword arguments as `Client.data`.
+
+        :param full_refresh: Optional. Purchase the whole result set even
+                if the counts agree, to find all removed domains.
+                Default is False
+
+        :return: `SnapshotDiff` with new `Domain` objects in `added` and
+                names that no longer match in `removed`
+        :raises ConnectionError:
+        :raises ReverseWhoisApiError: Base class for all API errors
+        """
+        query = Client._to_query(kwargs).with_search_after(None) \
+            .with_mode(Query.PREVIEW_MODE).with_audit_dates(True)
+        fingerprint = query.fingerprint
+        # Changes made while this run is in progress are picked up by the
+        # next one, which starts from this date
+        today = datetime.date.today()
+
+        state = self._store.state(fingerprint)
+        if state is None:
+            domains = self._fetch(query)
+            self._store.update(fingerprint, today, domains)
+            return SnapshotDiff(fingerprint, list(domains.values()), [],
+                                len(domains), True)
+
+        since, known_count = state
+        if not full_refresh:
+            count = self._client.preview(query=query).domains_count
+            window = self._fetch(Monitor._window(
+                query, 'created_date_from', since))
+            window.update(self._fetch(Monitor._window(
+                query, 'updated_date_from', since)))
+            known = self._store.known(fingerprint, window)
+            added = [domain for name, domain in window.items()
+                     if name not in known]
+            if count == known_count + len(added):
+                self._store.update(
+                    fingerprint, today, (d.domain_name for d in added))
+                return SnapshotDiff(fingerprint, added, [], count, False)
+
+        current = self._fetch(query)
+        previous = set(self._store.names(fingerprint))
+        added = [domain for name, domain in current.items()
+                 if name not in previous]
+        removed = sorted(previous.difference(current))
+        self._store.update(fingerprint, today,
+                           (d.domain_name for d in added), removed)
+        return SnapshotDiff(fingerprint, added, removed, len(current), True)
+
+    @staticmethod
+    def _window(query: Query, name: str, since: datetime.date) -> Query:
+        # Keep the bound of the query when it is later than the last run
+        bound = query.date(name)
+        if bound is not None and bound > since:
+            return query
+        return query.with_dates(**{name: since})
+
+    def _fetch(self, query: Query) -> dict:
+        domains = {}
+        for page in self._client.iterate_pages(query=query):
+            for domain in page.domains_list:
+                domains[domain.domain_name] = domain
+        return domains
@@ -1,3 +1,7 @@
-__all__ = ['ApiRequester']
+__all__ = ['ApiRequester', 'AsyncApiRequester', 'RetryPolicy',
+           'RateLimiter', 'TokenBucket', 'FileTokenBucket']
 
 from .http import ApiRequester
+from .retry import RetryPolicy
+from .ratelimit import RateLimiter, TokenBucket, FileTokenBucket
+from .async_http import AsyncApiRequester
@@ -0,0 +1,194 @@
+from .http import ApiRequester
+from .keypool import ApiKeyPool
+from .retry import RetryPolicy
+from .transport import _validate_pool_size
+from ..version import VERSION, LIBRARY_NAME
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+class AsyncApiRequester:
+    OPTIONS = ('base_url', 'timeout', 'pool_maxsize', 'idle_timeout',
+               'key_pool')
+    __connect_timeout = 5
+    __user_agent = "{name}/{ver}".format(name=LIBRARY_NAME, ver=VERSION)
+    _base_url: str
+    _timeout: float
+
+    def __init__(self, **kwargs):
+        """
+
+        :param kwargs: Supported parameters:
+        - base_url: (optional) API endpoint URL; str
+        - timeout: (optional) API call timeout in seconds; float
+        - pool_maxsize: (optional) Maximum number of concurrent connections
+                per host; int. Default is 100
+        - idle_timeout: (optional) Keep-alive timeout for idle connections
+                in seconds; float. Default is 60
+        - key_pool: (optional) API keys used in rotation, replacing the key
+                of the payload; ApiKeyPool or None. Default is None
+        :raises ValueError: invalid value or unsupported parameter
+        """
+        if aiohttp is None:
+            raise ImportError(
+                "aiohttp is required for the asyncio client. "
+                "Install it with `pip install reverse-whois[async]`")
+        unsupported = sorted(set(kwargs) - set(AsyncApiRequester.OPTIONS))
+        if unsupported:
+            raise ValueError(
+                "Unsupported parameters: " + ', '.join(unsupported))
+
+        self._base_url = ''
+        self.timeout = 30
+        self._pool_maxsize = 100
+        self._idle_timeout = 60.0
+        self._session = None
+        self._key_pool = None
+
+        if 'base_url' in kwargs:
+            self.base_url = kwargs['base_url']
+        if 'timeout' in kwargs:
+            self.timeout = kwargs['timeout']
+        if 'pool_maxsize' in kwargs:
+            self._pool_maxsize = _validate_pool_size(
+                kwargs['pool_maxsize'])
+        if 'idle_timeout' in kwargs:
+            if kwargs['idle_timeout'] is None or kwargs['idle_timeout'] <= 0:
+                raise ValueError("Idle timeout should be positive")
+            self._idle_timeout = kwargs['idle_timeout']
+        if 'key_pool' in kwargs:
+            self.key_pool = kwargs['key_pool']
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    @property
+    def base_url(self) -> str:
+        return self._base_url
+
+    @base_url.setter
+    def base_url(self, url: str):
+        if url is None or len(url) <= 8 or not url.startswith('http'):
+            raise ValueError("Invalid URL specified.")
+        self._base_url = url
+
+    @property
+    def timeout(self) -> float:
+        """API call timeout in seconds"""
+        return self._timeout
+
+    @timeout.setter
+    def timeout(self, value: float):
+        """API call timeout in seconds"""
+        if value is not None and 1 <= value <= 60:
+            self._timeout = value
+        else:
+            raise ValueError("Timeout value should be in [1, 60]")
+
+    @property
+    def key_pool(self) -> ApiKeyPool or None:
+        """API keys used in rotation"""
+        return self._key_pool
+
+    @key_pool.setter
+    def key_pool(self, value: ApiKeyPool or None):
+        """API keys used in rotation"""
+        if value is not None and not isinstance(value, ApiKeyPool):
+            raise ValueError("Expected an ApiKeyPool instance or None")
+        self._key_pool = value
+
+    async def close(self):
+        """
+        Close the underlying session and all its connections
+        """
+        if self._session is not None:
+            await self._session.close()
+        self._session = None
+
+    async def get(self, payload: dict) -> str:
+        content = await self._request('GET', {}, params=payload)
+        return content.decode('UTF-8')
+
+    async def post(self, data: dict) -> str:
+        return (await self.post_raw(data)).decode('UTF-8')
+
+    async def post_raw(self, data: dict) -> bytes:
+        """
+        Send a POST request and return the undecoded response body
+        """
+        headers = {}
+        if 'apiKey' in data:
+            headers['X-Authentication-Token'] = data.pop('apiKey')
+
+        return await self._request('POST', headers, json=data)
+
+    async def _request(self, method: str, headers: dict, **kwargs) \
+            -> bytes:
+        pool = self._key_pool
+        if pool is None:
+            async with self._get_session().request(
+                    method, self.base_url, headers=headers,
+                    timeout=self._client_timeout(), **kwargs) as response:
+                return await AsyncApiRequester._handle_response(response)
+
+        failed = []
+        while True:
+            key = await pool.acquire_async(failed)
+            headers['X-Authentication-Token'] = key
+            try:
+                async with self._get_session().request(
+                        method, self.base_url, headers=headers,
+                        timeout=self._client_timeout(), **kwargs) \
+                        as response:
+                    content = await response.read()
+                    status = response.status
+                    retry_after = response.headers.get('Retry-After')
+            except BaseException:
+                pool.release(key)
+                raise
+            pool.release(key, status,
+                         RetryPolicy.parse_retry_after(retry_after)
+                         if retry_after else None)
+            failed.append(key)
+            if status not in (402, 403) or not pool.available(failed):
+                break
+
+        if not 200 <= status < 300:
+            ApiRequester._raise_for_status(
+                status, content.decode('UTF-8', errors='replace'))
+        return content
+
+    def _get_session(self):
+        # The session has to be created inside a running event loop
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=0,
+                limit_per_host=self._pool_maxsize,
+                keepalive_timeout=self._idle_timeout
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers={'User-Agent': AsyncApiRequester.__user_agent}
+            )
+        return self._session
+
+    def _client_timeout(self):
+        return aiohttp.ClientTimeout(
+            connect=AsyncApiRequester.__connect_timeout,
+            sock_read=self.timeout
+        )
+
+    @staticmethod
+    async def _handle_response(response) -> bytes:
+        content = await response.read()
+        if 200 <= response.status < 300:
+            return content
+
+        ApiRequester._raise_for_status(
+            response.status, content.decode('UTF-8', errors='replace'))
@@ -1,7 +1,18 @@
-from requests import request, Response
+from contextlib import contextmanager
+from requests.exceptions import ConnectionError, Timeout, ReadTimeout, \
+    ChunkedEncodingError, ContentDecodingError
+from urllib3.exceptions import ReadTimeoutError
+from .keypool import ApiKeyPool
+from .ratelimit import RateLimiter
+from .retry import RetryPolicy
+from .transport import Transport, TransportResponse, RequestsTransport, \
+    _validate_pool_size
+from ..metrics import Metrics
 from ..exceptions.error import ApiAuthError, HttpApiError, BadRequestError
 from ..version import VERSION, LIBRARY_NAME
 import logging
+import threading
+import time
 
 
 class ApiRequester:
@@ -10,6 +21,7 @@ class ApiRequester:
     __user_agent = "{name}/{ver}".format(name=LIBRARY_NAME, ver=VERSION)
     _base_url: str
     _timeout: float
+    _transport: Transport
 
     def __init__(self, **kwargs):
         """
@@ -17,14 +29,80 @@ class ApiRequester:
         :param kwargs: Supported parameters:
         - base_url: (optional) API endpoint URL; str
         - timeout: (optional) API call timeout in seconds; float
+        - pool_connections: (optional) Number of per-host connection pools
+                to keep; int. Default is 10
+        - pool_maxsize: (optional) Maximum number of keep-alive connections
+                per host; int. Default is 10
+        - pool_block: (optional) Wait for a free connection instead of
+                opening an extra one when the pool is exhausted; bool.
+                Default is False
+        - idle_timeout: (optional) Drop pooled connections that were not
+                used for this many seconds; float or None. Default is 60
+        - retry: (optional) Retry policy for transient failures;
+                RetryPolicy or None. Default is None (no retries)
+        - rate_limiter: (optional) Limiter consulted before every request,
+                including retries; RateLimiter or None. Default is None
+        - metrics: (optional) Registry for request counters and stage
+                timings; Metrics or None. Default is None (disabled)
+        - key_pool: (optional) API keys used in rotation, replacing the key
+                of the payload; ApiKeyPool or None. Default is None
+        - transport: (optional) HTTP backend, e.g. `Urllib3Transport` or
+                `HttpxTransport`; Transport. The pool options above apply to
+                the default `RequestsTransport` only
         """
         self._base_url = ''
         self.timeout = 30
+        self._pool_connections = 10
+        self._pool_maxsize = 10
+        self._pool_block = False
+        self._idle_timeout = 60.0
+        self._transport = None
+        self._last_used = 0.0
+        self._lock = threading.Lock()
+        self._retry = None
+        self._rate_limiter = None
+        self._metrics = None
+        self._key_pool = None
 
         if 'base_url' in kwargs:
             self.base_url = kwargs['base_url']
         if 'timeout' in kwargs:
             self.timeout = kwargs['timeout']
+        if 'pool_connections' in kwargs:
+            self._pool_connections = _validate_pool_size(
+                kwargs['pool_connections'])
+        if 'pool_maxsize' in kwargs:
+            self._pool_maxsize = _validate_pool_size(
+                kwargs['pool_maxsize'])
+        if 'pool_block' in kwargs:
+            self._pool_block = bool(kwargs['pool_block'])
+        if 'idle_timeout' in kwargs:
+            self.idle_timeout = kwargs['idle_timeout']
+        if 'retry' in kwargs:
+            self.retry = kwargs['retry']
+        if 'rate_limiter' in kwargs:
+            self.rate_limiter = kwargs['rate_limiter']
+        if 'metrics' in kwargs:
+            self.metrics = kwargs['metrics']
+        if 'key_pool' in kwargs:
+            self.key_pool = kwargs['key_pool']
+        if kwargs.get('transport') is not None:
+            if not isinstance(kwargs['transport'], Transport):
+                raise ValueError("Expected a Transport instance")
+            self._transport = kwargs['transport']
+            self._pool_maxsize = self._transport.pool_maxsize
+        else:
+            self._transport = RequestsTransport(
+                pool_connections=self._pool_connections,
+                pool_maxsize=self._pool_maxsize,
+                pool_block=self._pool_block
+            )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
 
     @property
     def base_url(self) -> str:
@@ -49,49 +127,337 @@ class ApiRequester:
         else:
             raise ValueError("Timeout value should be in [1, 60]")
 
+    @property
+    def pool_maxsize(self) -> int:
+        """Maximum number of keep-alive connections per host"""
+        return self._pool_maxsize
+
+    @property
+    def idle_timeout(self) -> float or None:
+        """Idle time in seconds after which pooled connections are dropped"""
+        return self._idle_timeout
+
+    @idle_timeout.setter
+    def idle_timeout(self, value: float or None):
+        """Idle time in seconds after which pooled connections are dropped"""
+        if value is None or value > 0:
+            self._idle_timeout = value
+        else:
+            raise ValueError("Idle timeout should be None or positive")
+
+    @property
+    def retry(self) -> RetryPolicy or None:
+        """Retry policy for transient failures"""
+        return self._retry
+
+    @retry.setter
+    def retry(self, value: RetryPolicy or None):
+        """Retry policy for transient failures"""
+        if value is not None and not isinstance(value, RetryPolicy):
+            raise ValueError("Expected a RetryPolicy instance or None")
+        self._retry = value
+
+    @property
+    def rate_limiter(self) -> RateLimiter or None:
+        """Limiter consulted before every request"""
+        return self._rate_limiter
+
+    @rate_limiter.setter
+    def rate_limiter(self, value: RateLimiter or None):
+        """Limiter consulted before every request"""
+        if value is not None and not isinstance(value, RateLimiter):
+            raise ValueError("Expected a RateLimiter instance or None")
+        self._rate_limiter = value
+
+    @property
+    def metrics(self) -> Metrics or None:
+        """Registry for request counters and stage timings"""
+        return self._metrics
+
+    @metrics.setter
+    def metrics(self, value: Metrics or None):
+        """Registry for request counters and stage timings"""
+        if value is not None and not isinstance(value, Metrics):
+            raise ValueError("Expected a Metrics instance or None")
+        self._metrics = value
+
+    @property
+    def key_pool(self) -> ApiKeyPool or None:
+        """API keys used in rotation"""
+        return self._key_pool
+
+    @key_pool.setter
+    def key_pool(self, value: ApiKeyPool or None):
+        """API keys used in rotation"""
+        if value is not None and not isinstance(value, ApiKeyPool):
+            raise ValueError("Expected an ApiKeyPool instance or None")
+        self._key_pool = value
+
+    @property
+    def transport(self) -> Transport:
+        """HTTP backend"""
+        return self._transport
+
+    def close(self):
+        """
+        Close all pooled connections. The requester stays usable, the next
+        call opens a new connection.
+        """
+        with self._lock:
+            self._transport.close()
+
     def get(self, payload: dict) -> str:
-        headers = {
-            'User-Agent': ApiRequester.__user_agent,
-            'Connection': 'close'
-        }
-        response = request(
-            "GET",
-            self.base_url,
+        response = self._send(
+            'GET',
+            download=True,
             params=payload,
-            headers=headers,
-            timeout=(ApiRequester.__connect_timeout, self.timeout)
+            timeout=(ApiRequester.__connect_timeout, self.timeout),
+            stream=True
         )
 
-        return ApiRequester._handle_response(response)
+        return ApiRequester._handle_response(response).decode('UTF-8')
 
     def post(self, data: dict) -> str:
-        headers = {
-            'User-Agent': ApiRequester.__user_agent,
-            'Connection': 'close'
-        }
+        return self.post_raw(data).decode('UTF-8')
+
+    def post_raw(self, data: dict) -> bytes:
+        """
+        Send a POST request and return the undecoded response body
+        """
+        headers = {}
         if 'apiKey' in data:
             headers['X-Authentication-Token'] = data.pop('apiKey')
 
-        response = request(
+        response = self._send(
             'POST',
-            self.base_url,
+            download=True,
             json=data,
             headers=headers,
-            timeout=(ApiRequester.__connect_timeout, self.timeout)
+            timeout=(ApiRequester.__connect_timeout, self.timeout),
+            stream=True
         )
 
         return ApiRequester._handle_response(response)
 
+    def post_stream(self, data: dict, chunk_size: int = 65536):
+        """
+        Send a POST request and return a generator over the response body
+        chunks as they arrive. The connection is released when the
+        generator is exhausted or closed.
+        """
+        headers = {}
+        if 'apiKey' in data:
+            headers['X-Authentication-Token'] = data.pop('apiKey')
+
+        response = self._send(
+            'POST',
+            json=data,
+            headers=headers,
+            timeout=(ApiRequester.__connect_timeout, self.timeout),
+            stream=True
+        )
+
+        if not 200 <= response.status_code < 300:
+            try:
+                ApiRequester._raise_for_status(
+                    response.status_code, response.text)
+            finally:
+                response.close()
+
+        return ApiRequester._iter_chunks(response, chunk_size)
+
     @staticmethod
-    def _handle_response(response: Response) -> str:
+    def _iter_chunks(response: TransportResponse, chunk_size: int):
+        try:
+            with _body_errors():
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    yield chunk
+        finally:
+            response.close()
+
+    def _send(self, method: str, download: bool = False,
+              **kwargs) -> TransportResponse:
+        """
+        Send a request with retries. With `download` the body of the
+        returned response is read within the attempt, so connection
+        resets, truncated bodies and read timeouts during the download are
+        retried as well, following `retry_on_connection_error` and
+        `retry_on_timeout`.
+        """
+        kwargs['headers'] = dict(kwargs.get('headers') or {})
+        kwargs['headers']['User-Agent'] = ApiRequester.__user_agent
+        policy = self._retry
+        if policy is None:
+            response = self._request(method, **kwargs)
+            if download:
+                self._download(response, kwargs)
+            return response
+
+        started = time.monotonic()
+        attempt = 0
+        delay = 0.0
+        while True:
+            attempt += 1
+            try:
+                response = self._request(method, **kwargs)
+                if download \
+                        and response.status_code not in policy.status_codes:
+                    self._download(response, kwargs)
+            except (ConnectionError, Timeout, ChunkedEncodingError,
+                    ContentDecodingError) as error:
+                retryable = policy.retry_on_timeout \
+                    if isinstance(error, Timeout) \
+                    else policy.retry_on_connection_error
+                delay = policy.backoff(delay)
+                if not retryable or not policy.can_retry(
+                        attempt, time.monotonic() - started, delay):
+                    raise
+                reason = type(error).__name__
+            else:
+                if response.status_code not in policy.status_codes:
+                    return response
+                delay = policy.delay(
+                    delay, response.headers.get('Retry-After'))
+                if response.status_code == 429 \
+                        and self._key_pool is not None:
+                    # The pool rests the throttled key and waits by itself
+                    # if no other key is available
+                    delay = 0.0
+                if not policy.can_retry(
+                        attempt, time.monotonic() - started, delay):
+                    if download:
+                        self._download(response, kwargs)
+                    return response
+                response.close()
+                reason = 'HTTP {}'.format(response.status_code)
+
+            ApiRequester.__logger.warning(
+                "Attempt %d failed (%s), retrying in %.2f s",
+                attempt, reason, delay)
+            if self._metrics is not None:
+                self._metrics.increment(Metrics.RETRIES, reason=reason)
+            time.sleep(delay)
+
+    def _request(self, method: str, **kwargs) -> TransportResponse:
+        pool = self._key_pool
+        if pool is None:
+            return self._attempt(method, **kwargs)
+
+        headers = kwargs['headers']
+        failed = []
+        while True:
+            key = pool.acquire(failed)
+            headers['X-Authentication-Token'] = key
+            try:
+                response = self._attempt(method, **kwargs)
+            except BaseException:
+                pool.release(key)
+                raise
+            retry_after = response.headers.get('Retry-After')
+            pool.release(key, response.status_code,
+                         RetryPolicy.parse_retry_after(retry_after)
+                         if retry_after else None)
+            failed.append(key)
+            # Another key may still have credits or access
+            if response.status_code not in (402, 403) \
+                    or not pool.available(failed):
+                return response
+            response.close()
+
+    def _attempt(self, method: str, **kwargs) -> TransportResponse:
+        metrics = self._metrics
+        if metrics is None:
+            if self._rate_limiter is not None:
+                self._rate_limiter.acquire()
+            return self._transport_for_call().request(
+                method, self.base_url, **kwargs)
+
+        payload = kwargs.get('json') or kwargs.get('params') or {}
+        mode = payload.get('mode', '')
+        started = time.perf_counter()
+        if self._rate_limiter is not None:
+            self._rate_limiter.acquire()
+            now = time.perf_counter()
+            metrics.observe(Metrics.STAGE_SECONDS, now - started,
+                            stage='rate_limit')
+            started = now
+        try:
+            response = self._transport_for_call().request(
+                method, self.base_url, **kwargs)
+        except Exception as error:
+            metrics.increment(Metrics.REQUESTS, mode=mode,
+                              status=type(error).__name__)
+            raise
+        metrics.observe(Metrics.STAGE_SECONDS,
+                        time.perf_counter() - started, stage='ttfb')
+        metrics.increment(Metrics.REQUESTS, mode=mode,
+                          status=str(response.status_code))
+        return response
+
+    def _download(self, response: TransportResponse, kwargs: dict):
+        """
+        Read the whole body of a streamed response
+        """
+        metrics = self._metrics
+        started = time.perf_counter()
+        try:
+            with _body_errors():
+                size = len(response.content)
+        finally:
+            response.close()
+        # Older urllib3 versions return a body cut by a connection reset
+        # without an error
+        length = response.headers.get('Content-Length')
+        if length and length.isdigit() and size < int(length) \
+                and not response.headers.get('Content-Encoding'):
+            raise ConnectionError(
+                "Connection closed after {} of {} bytes".format(
+                    size, length))
+        if metrics is not None:
+            payload = kwargs.get('json') or kwargs.get('params') or {}
+            metrics.observe(Metrics.STAGE_SECONDS,
+                            time.perf_counter() - started, stage='download')
+            metrics.increment(Metrics.RESPONSE_BYTES, size,
+                              mode=payload.get('mode', ''))
+
+    def _transport_for_call(self) -> Transport:
+        with self._lock:
+            now = time.monotonic()
+            if self._idle_timeout is not None \
+                    and now - self._last_used > self._idle_timeout:
+                ApiRequester.__logger.debug(
+                    "Dropping connections idle for more than %s s",
+                    self._idle_timeout)
+                self._transport.close()
+            self._last_used = now
+            return self._transport
+
+    @staticmethod
+    def _handle_response(response: TransportResponse) -> bytes:
         if 200 <= response.status_code < 300:
-            return response.content.decode('UTF-8')
+            return response.content
+
+        ApiRequester._raise_for_status(response.status_code, response.text)
+
+    @staticmethod
+    def _raise_for_status(status_code: int, text: str):
+        if status_code in [401, 402, 403]:
+            raise ApiAuthError(text)
+
+        if status_code in [400, 422]:
+            raise BadRequestError(text)
 
-        if response.status_code in [401, 402, 403]:
-            raise ApiAuthError(response.text)
+        if status_code >= 300:
+            raise HttpApiError(text)
 
-        if response.status_code in [400, 422]:
-            raise BadRequestError(response.text)
 
-        if response.status_code >= 300:
-            raise HttpApiError(response.text)
+@contextmanager
+def _body_errors():
+    # requests reports a read timeout in the middle of the body as a
+    # ConnectionError wrapping urllib3's ReadTimeoutError
+    try:
+        yield
+    except ConnectionError as error:
+        if error.args and isinstance(error.args[0], ReadTimeoutError):
+            raise ReadTimeout(*error.args) from error
+        raise
@@ -0,0 +1,206 @@
+import asyncio
+import threading
+import time
+
+from ..exceptions.error import ApiAuthError
+
+
+class _KeyState:
+    __slots__ = ('key', 'weight', 'current', 'in_flight', 'requests',
+                 'throttled', 'exhausted', 'until', 'exhausted_until')
+
+    def __init__(self, key: str, weight: float):
+        self.key = key
+        self.weight = weight
+        self.current = 0.0
+        self.in_flight = 0
+        self.requests = 0
+        self.throttled = 0
+        self.exhausted = 0
+        self.until = 0.0
+        self.exhausted_until = 0.0
+
+
+class ApiKeyPool:
+    """
+    Spreads requests over several API keys.
+
+    Pass an instance instead of the API key to `Client` or `AsyncClient`.
+    Every HTTP attempt, including retries, takes a key from the pool and
+    reports its outcome back:
+    - a 429 response takes the key out of rotation for the `Retry-After`
+      time or `throttle_cooldown` seconds
+    - a 402 or 403 response (credits exhausted, access denied) takes it
+      out for `exhausted_cooldown` seconds, and the request is repeated
+      with the other keys in rotation, each at most once
+
+    When all keys are throttled, callers wait for the first one to come
+    back. When all keys are exhausted, `ApiAuthError` is raised.
+    """
+    ROUND_ROBIN = 'round_robin'
+    LEAST_LOADED = 'least_loaded'
+
+    def __init__(self, keys, strategy: str = ROUND_ROBIN,
+                 throttle_cooldown: float = 1.0,
+                 exhausted_cooldown: float = 3600.0):
+        """
+        :param keys: API keys, or a dictionary of API keys and their
+                positive weights, e.g. the rate limits of the keys
+        :param strategy: Optional. `ApiKeyPool.ROUND_ROBIN` (weighted
+                round-robin) or `ApiKeyPool.LEAST_LOADED` (the key with
+                the fewest requests in flight per weight).
+                Default is `ApiKeyPool.ROUND_ROBIN`
+        :param throttle_cooldown: Optional. Seconds a key rests after a
+                429 response without `Retry-After`. Default is 1
+        :param exhausted_cooldown: Optional. Seconds a key rests after a
+                402 or 403 response. Default is 3600
+        """
+        if isinstance(keys, str):
+            raise ValueError("Expected a collection of API keys")
+        if not isinstance(keys, dict):
+            keys = dict.fromkeys(keys, 1)
+        if not keys:
+            raise ValueError("At least one API key is required")
+        for key, weight in keys.items():
+            if type(key) is not str or not key:
+                raise ValueError("API keys should be non-empty strings")
+            if type(weight) not in (int, float) or weight <= 0:
+                raise ValueError("Key weights should be positive numbers")
+        if strategy not in (ApiKeyPool.ROUND_ROBIN, ApiKeyPool.LEAST_LOADED):
+            raise ValueError("Unknown strategy: {}".format(strategy))
+        if throttle_cooldown < 0 or exhausted_cooldown < 0:
+            raise ValueError("Cooldowns should be non-negative")
+
+        self._states = [_KeyState(key, float(weight))
+                        for key, weight in keys.items()]
+        self._by_key = {state.key: state for state in self._states}
+        self._strategy = strategy
+        self._throttle_cooldown = throttle_cooldown
+        self._exhausted_cooldown = exhausted_cooldown
+        self._lock = threading.Lock()
+
+    @property
+    def keys(self) -> list:
+        return [state.key for state in self._states]
+
+    @property
+    def strategy(self) -> str:
+        return self._strategy
+
+    def acquire(self, exclude=()) -> str:
+        """
+        Take a key for one request, waiting while all keys are throttled.
+        Every call must be followed by `release`.
+
+        :param exclude: Optional. Keys not to use, e.g. the ones that
+                already failed for this request
+        :raises ApiAuthError: all keys are exhausted or excluded
+        """
+        while True:
+            key, wait = self._take(exclude)
+            if key is not None:
+                return key
+            time.sleep(wait)
+
+    async def acquire_async(self, exclude=()) -> str:
+        """
+        Coroutine version of `acquire` that doesn't block the event loop
+        """
+        while True:
+            key, wait = self._take(exclude)
+            if key is not None:
+                return key
+            await asyncio.sleep(wait)
+
+    def release(self, key: str, status: int or None = None,
+                retry_after: float or None = None):
+        """
+        Report the outcome of a request sent with `key`
+
+        :param status: Optional. HTTP status code, None if no response was
+                received
+        :param retry_after: Optional. `Retry-After` of a 429 response in
+                seconds
+        """
+        with self._lock:
+            state = self._by_key[key]
+            state.in_flight -= 1
+            state.requests += 1
+            now = time.monotonic()
+            if status == 429:
+                state.throttled += 1
+                cooldown = self._throttle_cooldown \
+                    if retry_after is None else retry_after
+                state.until = max(state.until, now + cooldown)
+            elif status in (402, 403):
+                state.exhausted += 1
+                state.exhausted_until = now + self._exhausted_cooldown
+                state.until = max(state.until, state.exhausted_until)
+
+    def available(self, exclude=()) -> bool:
+        """
+        Checks if a key can be taken without waiting
+        """
+        now = time.monotonic()
+        with self._lock:
+            return any(state.until <= now for state in self._states
+                       if state.key not in exclude)
+
+    def reset(self, key: str or None = None):
+        """
+        Put a key, or all keys, back into rotation, e.g. after a top-up
+        """
+        with self._lock:
+            for state in self._states:
+                if key is None or state.key == key:
+                    state.until = 0.0
+                    state.exhausted_until = 0.0
+
+    def stats(self) -> dict:
+        """
+        Usage by key: `{key: {'weight', 'in_flight', 'requests',
+        'throttled', 'exhausted', 'available_in'}}`, where
+        `available_in` is the remaining cooldown in seconds
+        """
+        now = time.monotonic()
+        with self._lock:
+            return {state.key: {
+                'weight': state.weight,
+                'in_flight': state.in_flight,
+                'requests': state.requests,
+                'throttled': state.throttled,
+                'exhausted': state.exhausted,
+                'available_in': max(0.0, state.until - now),
+            } for state in self._states}
+
+    def _take(self, exclude) -> (str or None, float):
+        """
+        Select a key in rotation, or return the time until one comes back
+        """
+        now = time.monotonic()
+        with self._lock:
+            candidates = [state for state in self._states
+                          if state.key not in exclude]
+            ready = [state for state in candidates if state.until <= now]
+            if not ready:
+                waiting = [state.until for state in candidates
+                           if state.exhausted_until <= now]
+                if not waiting:
+                    raise ApiAuthError(
+                        "All API keys of the pool are exhausted or failed")
+                return None, min(waiting) - now
+
+            if self._strategy == ApiKeyPool.LEAST_LOADED:
+                state = min(ready, key=lambda s: (
+                    s.in_flight / s.weight, s.requests / s.weight))
+            else:
+                # Smooth weighted round-robin: keys are interleaved in
+                # proportion to their weights instead of in bursts
+                total = 0.0
+                for candidate in ready:
+                    candidate.current += candidate.weight
+                    total += candidate.weight
+                state = max(ready, key=lambda s: s.current)
+                state.current -= total
+            state.in_flight += 1
+            return state.key, 0.0
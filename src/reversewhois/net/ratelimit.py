@@ -0,0 +1,123 @@
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+
+class RateLimiter:
+    """
+    Base class for client-side rate limiters consulted by `ApiRequester`
+    before every request.
+    """
+
+    def acquire(self):
+        """
+        Block until a request is allowed
+        """
+        raise NotImplementedError
+
+
+def _validate(rate: float, burst: int):
+    if rate is None or rate <= 0:
+        raise ValueError("Rate should be positive")
+    if type(burst) is not int or burst < 1:
+        raise ValueError("Burst should be a positive integer")
+
+
+def _take(tokens: float, updated: float, now: float, rate: float,
+          burst: int) -> (float, float):
+    """
+    Refill the bucket and reserve one token. Returns the new token count,
+    which is negative when the caller has to wait, and the wait time
+    """
+    tokens = min(float(burst), tokens + (now - updated) * rate) - 1
+    wait = -tokens / rate if tokens < 0 else 0.0
+    return tokens, wait
+
+
+class TokenBucket(RateLimiter):
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        Token bucket shared by all threads of the process.
+
+        :param rate: Requests per second
+        :param burst: Optional. Number of requests that may be sent at once
+                after an idle period. Default is 1
+        """
+        _validate(rate, burst)
+        self._rate = rate
+        self._burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            self._tokens, wait = _take(
+                self._tokens, self._updated, now, self._rate, self._burst)
+            self._updated = now
+        # Sleeping outside the lock: the token is already reserved, so
+        # callers are released in order at the configured rate
+        if wait > 0:
+            time.sleep(wait)
+
+
+class FileTokenBucket(RateLimiter):
+    def __init__(self, path: str, rate: float, burst: int = 1):
+        """
+        Token bucket stored in a file, shared by all processes on the host
+        that use the same path. Access is serialized with a file lock.
+
+        :param path: Path of the state file. Created if missing
+        :param rate: Requests per second for all processes together
+        :param burst: Optional. Number of requests that may be sent at once
+                after an idle period. Default is 1
+        """
+        _validate(rate, burst)
+        self._path = path
+        self._rate = rate
+        self._burst = burst
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock, open(self._path, 'a+b') as file:
+            FileTokenBucket._lock_file(file)
+            try:
+                file.seek(0)
+                state = file.read().split()
+                now = time.time()
+                if len(state) == 2:
+                    tokens, updated = float(state[0]), float(state[1])
+                else:
+                    tokens, updated = float(self._burst), now
+                tokens, wait = _take(
+                    tokens, updated, now, self._rate, self._burst)
+                file.seek(0)
+                file.truncate()
+                file.write('{!r} {!r}'.format(tokens, now).encode('ascii'))
+                file.flush()
+            finally:
+                FileTokenBucket._unlock_file(file)
+        if wait > 0:
+            time.sleep(wait)
+
+    @staticmethod
+    def _lock_file(file):
+        if fcntl is not None:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+        else:
+            file.seek(0)
+            msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+
+    @staticmethod
+    def _unlock_file(file):
+        if fcntl is not None:
+            fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+        else:
+            file.seek(0)
+            msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
@@ -0,0 +1,108 @@
+from email.utils import parsedate_to_datetime
+import datetime
+import random
+
+
+class RetryPolicy:
+    DEFAULT_STATUS_CODES = (429, 500, 502, 503, 504)
+
+    def __init__(self, max_attempts: int = 5,
+                 status_codes=DEFAULT_STATUS_CODES,
+                 retry_on_timeout: bool = True,
+                 retry_on_connection_error: bool = True,
+                 backoff_base: float = 0.5,
+                 backoff_cap: float = 30,
+                 total_budget: float or None = 120,
+                 respect_retry_after: bool = True):
+        """
+        Retry policy for `ApiRequester`. Delays follow the decorrelated
+        jitter scheme: each delay is random between `backoff_base` and
+        three times the previous delay, capped by `backoff_cap`.
+
+        Every attempt re-sends the same payload, so retrying a page that
+        is addressed by `searchAfter` neither skips nor repeats domains.
+
+        :param max_attempts: Optional. Total attempts including the first
+                one. Default is 5
+        :param status_codes: Optional. HTTP codes that are retried.
+                Default is 429, 500, 502, 503 and 504
+        :param retry_on_timeout: Optional. Retry connect and read timeouts.
+                Default is True
+        :param retry_on_connection_error: Optional. Retry failed
+                connections. Default is True
+        :param backoff_base: Optional. Minimum delay in seconds.
+                Default is 0.5
+        :param backoff_cap: Optional. Maximum delay in seconds.
+                Default is 30
+        :param total_budget: Optional. Give up when the next attempt would
+                start later than this many seconds after the first one.
+                None means no limit. Default is 120
+        :param respect_retry_after: Optional. Wait as long as the
+                `Retry-After` header asks when it is present.
+                Default is True
+        """
+        if type(max_attempts) is not int or max_attempts < 1:
+            raise ValueError("max_attempts should be a positive integer")
+        if backoff_base < 0 or backoff_cap < backoff_base:
+            raise ValueError("Expected 0 <= backoff_base <= backoff_cap")
+        if total_budget is not None and total_budget < 0:
+            raise ValueError("total_budget should be None or non-negative")
+
+        self.max_attempts = max_attempts
+        self.status_codes = frozenset(status_codes)
+        self.retry_on_timeout = retry_on_timeout
+        self.retry_on_connection_error = retry_on_connection_error
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.total_budget = total_budget
+        self.respect_retry_after = respect_retry_after
+
+    def backoff(self, previous: float) -> float:
+        """
+        Next delay in seconds after a delay of `previous` seconds
+        """
+        upper = max(self.backoff_base, previous * 3)
+        return min(self.backoff_cap,
+                   random.uniform(self.backoff_base, upper))
+
+    def delay(self, previous: float, retry_after: str or None = None) \
+            -> float:
+        """
+        Next delay, honoring the `Retry-After` header value if allowed
+        """
+        if self.respect_retry_after and retry_after:
+            seconds = RetryPolicy.parse_retry_after(retry_after)
+            if seconds is not None:
+                return seconds
+        return self.backoff(previous)
+
+    def can_retry(self, attempt: int, elapsed: float, delay: float) -> bool:
+        """
+        Checks if another attempt is allowed after `attempt` attempts
+        """
+        if attempt >= self.max_attempts:
+            return False
+        if self.total_budget is not None \
+                and elapsed + delay > self.total_budget:
+            return False
+        return True
+
+    @staticmethod
+    def parse_retry_after(value: str) -> float or None:
+        """
+        Seconds to wait from a `Retry-After` value, either delta-seconds or
+        an HTTP date
+        """
+        value = value.strip()
+        if value.isdigit():
+            return float(value)
+        try:
+            date = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if date is None:
+            return None
+        if date.tzinfo is None:
+            date = date.replace(tzinfo=datetime.timezone.utc)
+        now = datetime.datetime.now(datetime.timezone.utc)
+        return max(0.0, (date - now).total_seconds())
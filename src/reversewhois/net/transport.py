@@ -0,0 +1,358 @@
+from contextlib import contextmanager
+from urllib.parse import urlencode
+import json as jsonlib
+import threading
+
+from requests import Session
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError, Timeout
+import urllib3
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+def _validate_pool_size(value: int) -> int:
+    if type(value) is int and value > 0:
+        return value
+    raise ValueError("Pool size should be a positive integer")
+
+
+def _encode(url: str, json, params) -> (str, bytes or None):
+    if params:
+        url += ('&' if '?' in url else '?') + urlencode(params)
+    if json is None:
+        return url, None
+    return url, jsonlib.dumps(json).encode('utf-8')
+
+
+class TransportResponse:
+    """
+    Response returned by a `Transport`. It offers the part of the
+    `requests.Response` interface that `ApiRequester` uses, so the
+    requests backend can return its responses unchanged.
+    """
+    status_code: int
+    headers: dict
+
+    def __init__(self, status_code: int, headers):
+        self.status_code = status_code
+        self.headers = headers
+        self._content = None
+
+    @property
+    def content(self) -> bytes:
+        if self._content is None:
+            try:
+                self._content = self._read()
+            finally:
+                self.close()
+        return self._content
+
+    @property
+    def text(self) -> str:
+        return self.content.decode('UTF-8', errors='replace')
+
+    def iter_content(self, chunk_size: int = 65536):
+        if self._content is not None:
+            for i in range(0, len(self._content), chunk_size):
+                yield self._content[i:i + chunk_size]
+            return
+        yield from self._chunks(chunk_size)
+
+    def close(self):
+        pass
+
+    def _read(self) -> bytes:
+        raise NotImplementedError
+
+    def _chunks(self, chunk_size: int):
+        yield self._read()
+
+
+class Transport:
+    """
+    Base class for the HTTP backends of `ApiRequester`.
+
+    A transport sends one request and returns a response with
+    `status_code`, `headers`, `content`, `text`, `iter_content` and
+    `close`. It doesn't retry, raise on HTTP error codes or follow
+    redirects. Connection failures and timeouts are raised as
+    `requests.exceptions.ConnectionError` and `Timeout`, whatever the
+    backend, so retries and error handling don't depend on it.
+    """
+    pool_maxsize = 10
+
+    def request(self, method: str, url: str, headers: dict or None = None,
+                json=None, params: dict or None = None,
+                timeout: tuple or None = None, stream: bool = False):
+        """
+        Send a request
+
+        :param json: Optional. Object sent as the JSON body
+        :param params: Optional. Query string parameters
+        :param timeout: Optional. `(connect, read)` timeouts in seconds
+        :param stream: Optional. Return as soon as the headers arrive and
+                read the body on demand. Default is False
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """
+        Close pooled connections. The transport stays usable.
+        """
+        pass
+
+
+class RequestsTransport(Transport):
+    def __init__(self, pool_connections: int = 10, pool_maxsize: int = 10,
+                 pool_block: bool = False):
+        """
+        Backend based on `requests`, the default one.
+
+        :param pool_connections: Optional. Number of per-host connection
+                pools to keep. Default is 10
+        :param pool_maxsize: Optional. Maximum number of keep-alive
+                connections per host. Default is 10
+        :param pool_block: Optional. Wait for a free connection instead of
+                opening an extra one. Default is False
+        """
+        self.pool_maxsize = _validate_pool_size(pool_maxsize)
+        self._adapter = HTTPAdapter(
+            pool_connections=_validate_pool_size(pool_connections),
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block
+        )
+        self._session = Session()
+        self._session.mount('http://', self._adapter)
+        self._session.mount('https://', self._adapter)
+
+    def request(self, method: str, url: str, headers: dict or None = None,
+                json=None, params: dict or None = None,
+                timeout: tuple or None = None, stream: bool = False):
+        return self._session.request(
+            method, url, headers=headers, json=json, params=params,
+            timeout=timeout, stream=stream)
+
+    def close(self):
+        self._adapter.close()
+
+
+class _Urllib3Response(TransportResponse):
+    def __init__(self, raw):
+        super().__init__(raw.status, raw.headers)
+        self._raw = raw
+
+    def close(self):
+        # Closes the connection only if the body was not read completely,
+        # otherwise it is already back in the pool
+        self._raw.close()
+        self._raw.release_conn()
+
+    def _read(self) -> bytes:
+        with _urllib3_errors():
+            return self._raw.read()
+
+    def _chunks(self, chunk_size: int):
+        try:
+            with _urllib3_errors():
+                yield from self._raw.stream(chunk_size)
+        finally:
+            self.close()
+
+
+@contextmanager
+def _urllib3_errors():
+    try:
+        yield
+    except urllib3.exceptions.NewConnectionError as error:
+        # A subclass of the connect timeout error in urllib3 1.x
+        raise ConnectionError(error) from error
+    except urllib3.exceptions.TimeoutError as error:
+        raise Timeout(error) from error
+    except urllib3.exceptions.HTTPError as error:
+        raise ConnectionError(error) from error
+
+
+class Urllib3Transport(Transport):
+    def __init__(self, pool_connections: int = 10, pool_maxsize: int = 10,
+                 pool_block: bool = False):
+        """
+        Backend using a `urllib3.PoolManager` directly, which skips the
+        per-request overhead of `requests` sessions.
+
+        :param pool_connections: Optional. Number of per-host connection
+                pools to keep. Default is 10
+        :param pool_maxsize: Optional. Maximum number of keep-alive
+                connections per host. Default is 10
+        :param pool_block: Optional. Wait for a free connection instead of
+                opening an extra one. Default is False
+        """
+        self.pool_maxsize = _validate_pool_size(pool_maxsize)
+        self._manager = urllib3.PoolManager(
+            num_pools=_validate_pool_size(pool_connections),
+            maxsize=pool_maxsize,
+            block=pool_block
+        )
+
+    def request(self, method: str, url: str, headers: dict or None = None,
+                json=None, params: dict or None = None,
+                timeout: tuple or None = None, stream: bool = False):
+        url, body = _encode(url, json, params)
+        headers = dict(headers or {})
+        if body is not None:
+            headers['Content-Type'] = 'application/json'
+        if timeout is not None:
+            timeout = urllib3.Timeout(connect=timeout[0], read=timeout[1])
+        with _urllib3_errors():
+            raw = self._manager.request(
+                method, url, body=body, headers=headers, timeout=timeout,
+                retries=False, redirect=False, preload_content=False)
+        response = _Urllib3Response(raw)
+        if not stream:
+            response.content
+        return response
+
+    def close(self):
+        self._manager.clear()
+
+
+class _HttpxResponse(TransportResponse):
+    def __init__(self, raw):
+        super().__init__(raw.status_code, raw.headers)
+        self._raw = raw
+
+    def close(self):
+        self._raw.close()
+
+    def _read(self) -> bytes:
+        with _httpx_errors():
+            return self._raw.read()
+
+    def _chunks(self, chunk_size: int):
+        try:
+            with _httpx_errors():
+                yield from self._raw.iter_bytes(chunk_size)
+        finally:
+            self.close()
+
+
+@contextmanager
+def _httpx_errors():
+    try:
+        yield
+    except httpx.TimeoutException as error:
+        raise Timeout(error) from error
+    except httpx.TransportError as error:
+        raise ConnectionError(error) from error
+
+
+class HttpxTransport(Transport):
+    def __init__(self, http2: bool = True, pool_maxsize: int = 10):
+        """
+        Backend based on `httpx`. With HTTP/2 concurrent requests are
+        multiplexed as streams over one connection per host, so many
+        parallel queries don't need as many TCP and TLS handshakes.
+        Requires the `http2` extra.
+
+        :param http2: Optional. Negotiate HTTP/2 with servers that
+                support it. Default is True
+        :param pool_maxsize: Optional. Maximum number of connections.
+                Default is 10
+        """
+        if httpx is None:
+            raise ImportError(
+                "httpx is required for the HTTP/2 transport. "
+                "Install it with `pip install reverse-whois[http2]`")
+
+        self.pool_maxsize = _validate_pool_size(pool_maxsize)
+        self._http2 = bool(http2)
+        self._client = None
+        self._lock = threading.Lock()
+
+    def request(self, method: str, url: str, headers: dict or None = None,
+                json=None, params: dict or None = None,
+                timeout: tuple or None = None, stream: bool = False):
+        client = self._client_for_call()
+        if timeout is not None:
+            timeout = httpx.Timeout(timeout[1], connect=timeout[0])
+        with _httpx_errors():
+            request = client.build_request(
+                method, url, headers=headers, json=json, params=params,
+                timeout=timeout)
+            raw = client.send(request, stream=True)
+        response = _HttpxResponse(raw)
+        if not stream:
+            response.content
+        return response
+
+    def close(self):
+        # A closed httpx client can't be reused, the next request creates
+        # a new one
+        with self._lock:
+            client, self._client = self._client, None
+        if client is not None:
+            client.close()
+
+    def _client_for_call(self):
+        with self._lock:
+            if self._client is None:
+                self._client = httpx.Client(
+                    http2=self._http2,
+                    limits=httpx.Limits(
+                        max_connections=self.pool_maxsize,
+                        max_keepalive_connections=self.pool_maxsize))
+            return self._client
+
+
+class _Headers(dict):
+    """
+    Dictionary with case-insensitive keys
+    """
+    def __init__(self, headers: dict):
+        super().__init__((k.lower(), v) for k, v in headers.items())
+
+    def __getitem__(self, key):
+        return super().__getitem__(key.lower())
+
+    def __contains__(self, key):
+        return super().__contains__(key.lower())
+
+    def get(self, key, default=None):
+        return super().get(key.lower(), default)
+
+
+class _MemoryResponse(TransportResponse):
+    def __init__(self, status_code: int, headers: dict, body: bytes):
+        super().__init__(status_code, _Headers(headers))
+        self._content = body
+
+
+class MemoryTransport(Transport):
+    def __init__(self, handler):
+        """
+        Transport that answers requests in memory, for tests.
+
+        :param handler: Callable `(method, url, headers, body)` returning
+                `(status code, headers, body bytes)`. `body` is the encoded
+                JSON body or None, query parameters are part of `url`. It
+                may raise `requests.exceptions.ConnectionError` or
+                `Timeout` to simulate network failures. To answer like
+                the API, use `FakeApiServer.respond`:
+                `lambda m, u, h, b: server.respond(
+                h.get('X-Authentication-Token'), b)`
+        """
+        self._handler = handler
+        self.requests = []
+
+    def request(self, method: str, url: str, headers: dict or None = None,
+                json=None, params: dict or None = None,
+                timeout: tuple or None = None, stream: bool = False):
+        url, body = _encode(url, json, params)
+        headers = dict(headers or {})
+        self.requests.append((method, url, headers, body))
+        status, response_headers, content = self._handler(
+            method, url, headers, body)
+        return _MemoryResponse(status, response_headers, content)
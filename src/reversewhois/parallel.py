@@ -0,0 +1,192 @@
+from concurrent.futures import ProcessPoolExecutor
+import asyncio
+import os
+import threading
+import time
+
+from .metrics import Metrics
+from .models import decoder
+from .models.response import DomainList, Response
+from .exceptions.error import UnparsableApiResponseError
+
+
+def _parse_page(raw: bytes or str):
+    """
+    Decode a page in a worker process.
+
+    The result is a tuple `(domains count, next page cursor, number of
+    domains, names, created dates, updated dates)` where the last three
+    are newline-joined strings, or None for the dates when the page has no
+    audit dates. A few large strings pickle much faster than thousands of
+    small objects. On failure a `(message, ValueError or None)` pair is
+    returned, because `UnparsableApiResponseError` can't be unpickled.
+    """
+    try:
+        parsed = decoder.loads(raw)
+    except ValueError as error:
+        return "Could not parse API response", ValueError(str(error))
+    if type(parsed) is not dict or 'domainsCount' not in parsed:
+        return "Could not find the correct root element.", None
+
+    # Reuse the model code for the scalar fields
+    head = Response({'domainsCount': parsed['domainsCount'],
+                     'nextPageSearchAfter':
+                         parsed.get('nextPageSearchAfter')})
+    items = parsed.get('domainsList')
+    if type(items) is not list:
+        items = []
+
+    names = []
+    created = []
+    updated = []
+    audit = False
+    for item in items:
+        if type(item) is str:
+            names.append(item)
+            created.append('')
+            updated.append('')
+            continue
+        if type(item) is not dict:
+            item = {}
+        name = item.get('domainName')
+        names.append(str(name) if name else '')
+        dates = item.get('audit')
+        if type(dates) is dict:
+            audit = True
+        else:
+            dates = {}
+        value = dates.get('createdDate')
+        created.append(value if type(value) is str else '')
+        value = dates.get('updatedDate')
+        updated.append(value if type(value) is str else '')
+
+    if not audit:
+        return head.domains_count, head.next_page_search_after, \
+            len(names), '\n'.join(names), None, None
+    return head.domains_count, head.next_page_search_after, len(names), \
+        '\n'.join(names), '\n'.join(created), '\n'.join(updated)
+
+
+def _rebuild(compact: tuple) -> Response:
+    if len(compact) == 2:
+        raise UnparsableApiResponseError(*compact)
+
+    count, search_after, size, names, created, updated = compact
+    result = Response(None)
+    result.domains_count = count
+    result.next_page_search_after = search_after
+    if size == 0:
+        return result
+
+    names = names.split('\n')
+    if created is None:
+        result.domains_list = DomainList(names)
+    else:
+        result.domains_list = DomainList(zip(
+            names, created.split('\n'), updated.split('\n')))
+    return result
+
+
+class ParsePool:
+    """
+    Decodes API pages on a pool of worker processes.
+
+    Decoding a large page holds the GIL, so a single process can't fetch
+    and parse faster than one core allows. With a `ParsePool` passed as
+    `parse_pool` to `Client` or `AsyncClient`, the raw page bytes go to a
+    worker process and come back as a few strings, from which the
+    `Response` is rebuilt. `Domain` objects are built lazily as usual.
+    Threads that wait for a worker release the GIL, so fetching and
+    parsing scale independently.
+
+    Clients parse pages smaller than `min_size` bytes in their own process,
+    because for them the transfer costs more than the decoding.
+
+    One pool can be shared by several clients. It must be closed by its
+    owner, it is not closed with the client.
+
+    With metrics enabled the `decode` stage covers the round trip to the
+    worker and the `parse` stage the rebuild of the `Response`.
+    """
+
+    def __init__(self, max_workers: int or None = None,
+                 min_size: int = 262144):
+        """
+        :param max_workers: Optional. Number of worker processes.
+                Default is the number of CPUs
+        :param min_size: Optional. Smallest page in bytes sent to a
+                worker. Default is 256 KiB
+        """
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        if type(max_workers) is not int or max_workers < 1:
+            raise ValueError("max_workers should be a positive integer")
+        if type(min_size) is not int or min_size < 0:
+            raise ValueError("min_size should be a non-negative integer")
+
+        self._max_workers = max_workers
+        self._min_size = min_size
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def max_workers(self) -> int:
+        return self._max_workers
+
+    @property
+    def min_size(self) -> int:
+        return self._min_size
+
+    def parse(self, raw: bytes or str,
+              metrics: Metrics or None = None) -> Response:
+        """
+        Decode a page in a worker process
+
+        :raises UnparsableApiResponseError:
+        """
+        if metrics is None:
+            return _rebuild(
+                self._executor_for_call().submit(_parse_page, raw).result())
+
+        started = time.perf_counter()
+        future = self._executor_for_call().submit(_parse_page, raw)
+        compact = future.result()
+        decoded = time.perf_counter()
+        result = _rebuild(compact)
+        metrics.observe(Metrics.STAGE_SECONDS, decoded - started,
+                        stage='decode')
+        metrics.observe(Metrics.STAGE_SECONDS,
+                        time.perf_counter() - decoded, stage='parse')
+        return result
+
+    async def parse_async(self, raw: bytes or str) -> Response:
+        """
+        Coroutine version of `parse` that doesn't block the event loop
+
+        :raises UnparsableApiResponseError:
+        """
+        future = self._executor_for_call().submit(_parse_page, raw)
+        return _rebuild(await asyncio.wrap_future(future))
+
+    def close(self):
+        """
+        Stop the worker processes. The pool stays usable, the next call
+        starts new ones.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def _executor_for_call(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self._max_workers)
+            return self._executor
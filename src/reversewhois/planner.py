@@ -0,0 +1,453 @@
+from concurrent.futures import ThreadPoolExecutor
+import heapq
+import itertools
+
+from .client import Client
+from .harvest import Harvester
+from .models.request import Fields, Query
+from .exceptions.error import ParameterError
+
+
+class Expression:
+    """
+    Base class of boolean search expressions. Combine them with `&`, `|`
+    and `~`.
+    """
+
+    def __and__(self, other):
+        return And(self, other)
+
+    def __or__(self, other):
+        return Or(self, other)
+
+    def __invert__(self):
+        return Not(self)
+
+    def _negate(self) -> 'Expression':
+        raise NotImplementedError
+
+    def _dnf(self) -> list:
+        """
+        Disjunctive normal form: list of (positive terms, negative terms)
+        pairs of frozensets
+        """
+        raise NotImplementedError
+
+
+class Term(Expression):
+    __slots__ = ('value', 'field')
+
+    def __init__(self, value: str, field: str or None = None):
+        """
+        :param value: Search string
+        :param field: Optional. One of `Fields` values for an advanced
+                search term. Default is None (any field)
+        """
+        if type(value) is not str or len(value) < 1 \
+                or field is not None and len(value) < 2:
+            raise ParameterError("Term should be a non-empty string")
+        if field is not None and field not in Fields.values():
+            raise ParameterError("Unknown field name.")
+        self.value = value
+        self.field = field
+
+    def __eq__(self, other):
+        return isinstance(other, Term) \
+            and (self.value, self.field) == (other.value, other.field)
+
+    def __hash__(self):
+        return hash((self.value, self.field))
+
+    def __repr__(self):
+        if self.field is None:
+            return 'Term({!r})'.format(self.value)
+        return 'Term({!r}, {!r})'.format(self.value, self.field)
+
+    def _sort_key(self) -> tuple:
+        return self.field or '', self.value
+
+    def _negate(self) -> Expression:
+        return Not(self)
+
+    def _dnf(self) -> list:
+        return [(frozenset([self]), frozenset())]
+
+
+class And(Expression):
+    def __init__(self, *children: Expression):
+        if not children:
+            raise ParameterError("And needs at least one expression")
+        self.children = children
+
+    def _negate(self) -> Expression:
+        return Or(*(child._negate() for child in self.children))
+
+    def _dnf(self) -> list:
+        result = [(frozenset(), frozenset())]
+        for child in self.children:
+            result = [
+                (left[0] | right[0], left[1] | right[1])
+                for left, right in itertools.product(result, child._dnf())
+                if not (left[0] | right[0]) & (left[1] | right[1])
+            ]
+            if len(result) > QueryPlanner.MAX_CONJUNCTIONS:
+                raise ParameterError("Expression is too complex")
+        return result
+
+
+class Or(Expression):
+    def __init__(self, *children: Expression):
+        if not children:
+            raise ParameterError("Or needs at least one expression")
+        self.children = children
+
+    def _negate(self) -> Expression:
+        return And(*(child._negate() for child in self.children))
+
+    def _dnf(self) -> list:
+        result = []
+        for child in self.children:
+            result.extend(child._dnf())
+        return result
+
+
+class Not(Expression):
+    def __init__(self, child: Expression):
+        self.child = child
+
+    def _negate(self) -> Expression:
+        return self.child
+
+    def _dnf(self) -> list:
+        if isinstance(self.child, Term):
+            return [(frozenset(), frozenset([self.child]))]
+        return self.child._negate()._dnf()
+
+
+class _Conjunction:
+    __slots__ = ('positives', 'negatives')
+
+    def __init__(self, positives: list, negatives: list):
+        self.positives = positives
+        self.negatives = negatives
+
+
+class Plan:
+    """
+    API calls that answer an expression. `queries` are purchased,
+    `counts` holds the preview count of every query considered.
+    """
+
+    def __init__(self, conjunctions: list, counts: dict, parts: dict):
+        self._conjunctions = conjunctions
+        self._parts = parts
+        self.counts = counts
+        self.queries = list(dict.fromkeys(
+            part for query in parts for part in parts[query]))
+
+    def estimated_domains(self) -> int:
+        """
+        Upper bound of the number of domains purchased
+        """
+        return sum(self.counts.get(q, 0) for q in self.queries)
+
+
+class QueryPlanner:
+    """
+    Evaluates boolean expressions of any number of terms with several
+    API calls.
+
+    The expression is normalized to an OR of ANDs. Positive terms of an
+    AND are sent in groups of four, and up to four negative basic terms
+    become `exclude` terms; the other negative terms are purchased and
+    subtracted. `preview` counts pick the purchases:
+
+    * every group is formed around one of the most selective terms;
+    * the largest negative terms are excluded on the server;
+    * a subtracted term is narrowed to the smallest positive group with
+      room for it, and skipped if nothing matches;
+    * ANDs with an empty group are skipped and intersections start with
+      the smallest group.
+
+    A single purchase returns at most `cap` domains. Larger purchases
+    are split by creation date like `Harvester` does; if that's not
+    possible the plan fails instead of returning a truncated result.
+    Calls run in parallel and the set operations are sorted merges.
+    """
+    MAX_CONJUNCTIONS = 64
+    MAX_TERMS = 4
+    MAX_DOMAINS = 10000
+
+    def __init__(self, client: Client, max_workers: int or None = None,
+                 cap: int = MAX_DOMAINS):
+        """
+        :param client: `Client` used for all requests
+        :param max_workers: Optional. Number of concurrent requests.
+                Default is the connection pool size of the client
+        :param cap: Optional. Maximum number of domains in one purchase.
+                Default is 10000
+        """
+        if max_workers is None:
+            max_workers = client.api_requester.pool_maxsize
+        if type(max_workers) is not int or max_workers < 1:
+            raise ParameterError("max_workers must be a positive integer")
+        if type(cap) is not int or cap < 1:
+            raise ParameterError("cap must be a positive integer")
+
+        self._client = client
+        self._max_workers = max_workers
+        self._cap = cap
+
+    def plan(self, expression: Expression, **kwargs) -> Plan:
+        """
+        Compile an expression into API calls.
+
+        :param expression: `Term`, `And`, `Or` or `Not` expression
+        :param kwargs: Optional. Other parameters of every call, e.g.
+                `search_type` or `created_date_from`
+        :return: `Plan`
+        :raises ParameterError: expression cannot be evaluated, e.g. a
+                sub-query matches more than `cap` domains created on the
+                same day or without a creation date
+        :raises ConnectionError:
+        :raises ReverseWhoisApiError: Base class for all API errors
+        """
+        for name in ('query', 'basic_terms', 'advanced_terms', 'mode'):
+            if name in kwargs:
+                raise ParameterError(name + " cannot be used with planner")
+
+        conjunctions = []
+        for positives, negatives in dict.fromkeys(expression._dnf()):
+            if not positives:
+                raise ParameterError(
+                    "Every alternative needs at least one positive term")
+            conjunctions.append((positives, negatives))
+
+        # Preview the negative terms, and the positive terms of every
+        # AND with too many of them for one group
+        counts = {}
+        previews = []
+        for positives, negatives in conjunctions:
+            for terms in QueryPlanner._kinds(positives):
+                if len(terms) > QueryPlanner.MAX_TERMS:
+                    previews.extend(QueryPlanner._query([term], [], kwargs)
+                                    for term in terms)
+            previews.extend(QueryPlanner._query([term], [], kwargs)
+                            for term in negatives)
+        self._preview(previews, counts)
+
+        groups = [(QueryPlanner._groups(positives, counts, kwargs),
+                   {term: QueryPlanner._query([term], [], kwargs)
+                    for term in negatives})
+                  for positives, negatives in conjunctions]
+        self._preview([query for positive, _ in groups
+                       for _, _, query in positive], counts)
+
+        drafts = [QueryPlanner._draft(positive, negative, counts, kwargs)
+                  for positive, negative in groups
+                  if all(counts[query] > 0 for _, _, query in positive)]
+        self._preview([query for positive, negative in drafts
+                       for query in positive + negative], counts)
+
+        planned = []
+        for positive, negative in drafts:
+            if any(counts[query] == 0 for query in positive):
+                continue
+            planned.append(_Conjunction(
+                sorted(positive, key=lambda query: counts[query]),
+                [query for query in negative if counts[query] > 0]))
+
+        parts = {}
+        for conjunction in planned:
+            for query in conjunction.positives + conjunction.negatives:
+                if query not in parts:
+                    parts[query] = self._split(query, counts)
+        return Plan(planned, counts, parts)
+
+    def execute(self, expression: Expression or Plan, **kwargs):
+        """
+        Evaluate an expression or a prepared plan.
+
+        :param expression: Expression or `Plan`
+        :param kwargs: Optional. See `QueryPlanner.plan`
+        :yields Domain: Matching domains sorted by name
+        :raises ConnectionError:
+        :raises ReverseWhoisApiError: Base class for all API errors
+        """
+        if isinstance(expression, Plan):
+            plan = expression
+        else:
+            plan = self.plan(expression, **kwargs)
+
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            fetched = dict(zip(plan.queries,
+                               executor.map(self._fetch, plan.queries)))
+        for query, parts in plan._parts.items():
+            if len(parts) > 1:
+                fetched[query] = list(_union(
+                    [fetched[part] for part in parts]))
+
+        results = []
+        for conjunction in plan._conjunctions:
+            matched = iter(fetched[conjunction.positives[0]])
+            for query in conjunction.positives[1:]:
+                matched = _intersect(matched, iter(fetched[query]))
+            if conjunction.negatives:
+                matched = _difference(matched, _union(
+                    [fetched[q] for q in conjunction.negatives]))
+            results.append(matched)
+        yield from _union(results)
+
+    def _preview(self, queries: list, counts: dict):
+        """
+        Add the counts of the queries not counted yet to `counts`
+        """
+        queries = [q for q in dict.fromkeys(queries) if q not in counts]
+        for result in self._client.batch(queries, self._max_workers):
+            if not result.ok():
+                raise result.error
+            counts[result.query] = result.response.domains_count
+
+    def _split(self, query: Query, counts: dict) -> list:
+        """
+        Purchases that together return all domains of the query
+        """
+        if counts[query] <= self._cap:
+            return [query]
+        harvester = Harvester(self._client, self._max_workers, self._cap)
+        shards = harvester.shards(query=query)
+        if any(shard.count > self._cap for shard in shards) \
+                or sum(shard.count for shard in shards) < counts[query]:
+            raise ParameterError(
+                "{} matches {} domains and cannot be split into purchases "
+                "of at most {}".format(query, counts[query], self._cap))
+        for shard in shards:
+            counts[shard.query] = shard.count
+        return [shard.query for shard in shards]
+
+    def _fetch(self, query: Query) -> list:
+        domains = []
+        for page in self._client.iterate_pages(query=query):
+            domains.extend(page.domains_list)
+        domains.sort(key=lambda domain: domain.domain_name)
+        return domains
+
+    @staticmethod
+    def _kinds(terms) -> tuple:
+        """
+        Basic and advanced terms, each sorted
+        """
+        return (sorted((t for t in terms if t.field is None),
+                       key=Term._sort_key),
+                sorted((t for t in terms if t.field is not None),
+                       key=Term._sort_key))
+
+    @staticmethod
+    def _groups(terms, counts: dict, kwargs: dict) -> list:
+        """
+        Groups of up to four positive terms of the same kind as
+        (terms, excluded terms, query). The most selective terms lead
+        one group each, which bounds the size of every group
+        """
+        groups = []
+        for kind in QueryPlanner._kinds(terms):
+            ranked = sorted(kind, key=lambda term: counts.get(
+                QueryPlanner._query([term], [], kwargs), 0))
+            number = -(-len(ranked) // QueryPlanner.MAX_TERMS)
+            groups.extend(sorted(ranked[i::number], key=Term._sort_key)
+                          for i in range(number))
+        return [(group, [], QueryPlanner._query(group, [], kwargs))
+                for group in groups]
+
+    @staticmethod
+    def _draft(positive: list, negative: dict, counts: dict,
+               kwargs: dict) -> (list, list):
+        """
+        Queries to intersect and queries to subtract for one AND
+        """
+        # Excluding on the server saves purchasing the largest
+        # negative terms; the rest are subtracted locally
+        remaining = sorted(
+            (term for term, query in negative.items() if counts[query] > 0),
+            key=lambda term: (-counts[negative[term]], term._sort_key()))
+        carriers = [group for group in positive if group[0][0].field is None]
+        excluded = [term for term in remaining
+                    if term.field is None][:QueryPlanner.MAX_TERMS]
+        if carriers and excluded:
+            carrier = max(carriers, key=lambda group: counts[group[2]])
+            replacement = QueryPlanner._query(carrier[0], excluded, kwargs)
+            positive = [(carrier[0], excluded, replacement)
+                        if group is carrier else group for group in positive]
+        else:
+            excluded = []
+
+        subtracted = []
+        for term in remaining:
+            if term in excluded:
+                continue
+            # Domains of a positive group that also match the term are
+            # the only ones subtracting the term can remove
+            bases = [group for group in positive
+                     if (group[0][0].field is None) == (term.field is None)
+                     and len(group[0]) < QueryPlanner.MAX_TERMS]
+            if not bases:
+                subtracted.append(negative[term])
+                continue
+            terms, exclude, _ = min(bases, key=lambda group: counts.get(
+                QueryPlanner._query(group[0], [], kwargs), 0))
+            subtracted.append(
+                QueryPlanner._query(terms + [term], exclude, kwargs))
+        return [query for _, _, query in positive], subtracted
+
+    @staticmethod
+    def _query(include: list, exclude: list, kwargs: dict) -> Query:
+        if include[0].field is None:
+            terms = {'basic_terms': {
+                'include': [term.value for term in include],
+                'exclude': [term.value for term in exclude]}}
+        else:
+            terms = {'advanced_terms': [
+                {'field': term.field, 'term': term.value}
+                for term in include]}
+        return Query(**terms, **kwargs)
+
+
+def _name(domain) -> str:
+    return domain.domain_name
+
+
+def _intersect(left, right):
+    """
+    Items of the sorted iterator `left` also present in `right`
+    """
+    current = next(right, None)
+    for item in left:
+        while current is not None and _name(current) < _name(item):
+            current = next(right, None)
+        if current is None:
+            return
+        if _name(current) == _name(item):
+            yield item
+
+
+def _difference(left, right):
+    """
+    Items of the sorted iterator `left` missing from `right`
+    """
+    current = next(right, None)
+    for item in left:
+        while current is not None and _name(current) < _name(item):
+            current = next(right, None)
+        if current is None or _name(current) != _name(item):
+            yield item
+
+
+def _union(iterables: list):
+    """
+    Sorted union of sorted iterables without duplicates
+    """
+    previous = None
+    for item in heapq.merge(*iterables, key=_name):
+        if previous is None or _name(item) != previous:
+            previous = _name(item)
+            yield item
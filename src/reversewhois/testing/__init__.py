@@ -0,0 +1,4 @@
+__all__ = ['FakeApiServer', 'LoadTestResult', 'run_load_test']
+
+from .server import FakeApiServer
+from .loadtest import LoadTestResult, run_load_test
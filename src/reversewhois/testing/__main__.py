@@ -0,0 +1,3 @@
+from .loadtest import main
+
+main()
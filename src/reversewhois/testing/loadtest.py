@@ -0,0 +1,166 @@
+"""
+Load test of `Client` against the fake API server or any other endpoint.
+
+    python -m reversewhois.testing --concurrency 8 --prefetch 2 \
+        --domains 50000 --latency 0.05 --duration 10
+"""
+import argparse
+import threading
+import time
+
+from ..client import Client
+from ..net.retry import RetryPolicy
+from ..net.transport import RequestsTransport, Urllib3Transport, \
+    HttpxTransport
+from .server import FakeApiServer
+
+
+class LoadTestResult:
+    def __init__(self, elapsed: float, requests: int, domains: int,
+                 errors: int, latencies: list):
+        self.elapsed = elapsed
+        self.requests = requests
+        self.domains = domains
+        self.errors = errors
+        self.latencies = sorted(latencies)
+
+    @property
+    def requests_per_second(self) -> float:
+        return self.requests / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def domains_per_second(self) -> float:
+        return self.domains / self.elapsed if self.elapsed else 0.0
+
+    def percentile(self, value: float) -> float:
+        """
+        Page latency in seconds at the given percentile, e.g. 99
+        """
+        if not self.latencies:
+            return 0.0
+        index = min(len(self.latencies) - 1,
+                    int(round(value / 100 * (len(self.latencies) - 1))))
+        return self.latencies[index]
+
+    def summary(self) -> str:
+        return (
+            '{:.1f} s, {} pages, {} domains, {} errors\n'
+            '{:.1f} requests/s, {:.0f} domains/s\n'
+            'latency p50 {:.1f} ms, p90 {:.1f} ms, p99 {:.1f} ms'.format(
+                self.elapsed, self.requests, self.domains, self.errors,
+                self.requests_per_second, self.domains_per_second,
+                self.percentile(50) * 1000, self.percentile(90) * 1000,
+                self.percentile(99) * 1000))
+
+
+def run_load_test(client: Client, duration: float = 10,
+                  concurrency: int = 4, prefetch: int = 0,
+                  **kwargs) -> LoadTestResult:
+    """
+    Paginate through the query repeatedly from `concurrency` threads that
+    share the client.
+
+    Latency is the time a worker waits for each page, so with prefetching
+    it shows how much of the request time is hidden.
+
+    :param client: `Client` to measure
+    :param duration: Optional. Seconds to run. Default is 10
+    :param concurrency: Optional. Number of threads. Default is 4
+    :param prefetch: Optional. See `Client.iterate_pages`. Default is 0
+    :param kwargs: Optional. Query parameters. By default a basic term
+            search for 'test'
+    :return: `LoadTestResult`
+    """
+    if not kwargs:
+        kwargs = {'basic_terms': {'include': ['test']}}
+
+    lock = threading.Lock()
+    latencies = []
+    totals = {'requests': 0, 'domains': 0, 'errors': 0}
+    deadline = time.monotonic() + duration
+
+    def worker():
+        while time.monotonic() < deadline:
+            pages = client.iterate_pages(prefetch=prefetch, **kwargs)
+            try:
+                while time.monotonic() < deadline:
+                    started = time.perf_counter()
+                    page = next(pages, None)
+                    if page is None:
+                        break
+                    waited = time.perf_counter() - started
+                    with lock:
+                        latencies.append(waited)
+                        totals['requests'] += 1
+                        totals['domains'] += len(page.domains_list)
+            except Exception:
+                with lock:
+                    totals['errors'] += 1
+            finally:
+                pages.close()
+
+    started = time.monotonic()
+    threads = [threading.Thread(target=worker, daemon=True)
+               for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return LoadTestResult(time.monotonic() - started, totals['requests'],
+                          totals['domains'], totals['errors'], latencies)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Measure Client throughput against a local fake API')
+    parser.add_argument('--url', help='endpoint to test instead of a '
+                                      'local fake server')
+    parser.add_argument('--api-key', default='at_' + '0' * 29)
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--prefetch', type=int, default=0)
+    parser.add_argument('--pool-maxsize', type=int, default=10)
+    parser.add_argument('--transport', default='requests',
+                        choices=('requests', 'urllib3', 'httpx', 'http2'))
+    parser.add_argument('--retries', type=int, default=0,
+                        help='attempts per request, 0 disables retries')
+    parser.add_argument('--domains', type=int, default=25000)
+    parser.add_argument('--page-size', type=int, default=10000)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--throttle-rate', type=float, default=0.0)
+    args = parser.parse_args(argv)
+
+    server = None
+    url = args.url
+    if url is None:
+        server = FakeApiServer(
+            domains=args.domains, page_size=args.page_size,
+            latency=args.latency, jitter=args.jitter,
+            error_rate=args.error_rate, throttle_rate=args.throttle_rate,
+            retry_after=0)
+        server.start()
+        url = server.url
+
+    if args.transport == 'urllib3':
+        transport = Urllib3Transport(pool_maxsize=args.pool_maxsize)
+    elif args.transport in ('httpx', 'http2'):
+        transport = HttpxTransport(http2=args.transport == 'http2',
+                                   pool_maxsize=args.pool_maxsize)
+    else:
+        transport = RequestsTransport(pool_maxsize=args.pool_maxsize)
+    options = {'base_url': url, 'transport': transport}
+    if args.retries:
+        options['retry'] = RetryPolicy(max_attempts=args.retries)
+    try:
+        with Client(args.api_key, **options) as client:
+            result = run_load_test(client, args.duration, args.concurrency,
+                                   args.prefetch)
+        print(result.summary())
+        if server is not None:
+            print('server:', server.stats())
+    finally:
+        if server is not None:
+            server.stop()
@@ -0,0 +1,289 @@
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from xml.sax.saxutils import escape
+import datetime
+import hashlib
+import json
+import random
+import threading
+import time
+
+
+class _HttpServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+
+class FakeApiServer:
+    """
+    Local stand-in for the Reverse WHOIS API v2 for tests and load tests.
+
+    It implements the POST contract of `/api/v2`: the
+    `X-Authentication-Token` header, preview and purchase modes,
+    `searchAfter` pagination, JSON and XML formats, audit dates and
+    creation date filters. Every query matches a synthetic, deterministic
+    set of domains whose names are derived from the search terms.
+    """
+    PATH = '/api/v2'
+    EPOCH = datetime.date(2000, 1, 1)
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0,
+                 domains: int = 25000, page_size: int = 10000,
+                 latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, throttle_rate: float = 0.0,
+                 retry_after: int = 1, api_keys=None,
+                 seed: int or None = None):
+        """
+        :param host: Optional. Interface to listen on. Default is 127.0.0.1
+        :param port: Optional. Port, 0 picks a free one. Default is 0
+        :param domains: Optional. Number of domains matched by every
+                query. Default is 25000
+        :param page_size: Optional. Domains per purchase page.
+                Default is 10000
+        :param latency: Optional. Delay of every response in seconds.
+                Default is 0
+        :param jitter: Optional. Random extra delay up to this many
+                seconds. Default is 0
+        :param error_rate: Optional. Share of requests answered with 503.
+                Default is 0
+        :param throttle_rate: Optional. Share of requests answered with 429
+                and a `Retry-After` header. Default is 0
+        :param retry_after: Optional. `Retry-After` value in seconds.
+                Default is 1
+        :param api_keys: Optional. Accepted API keys. Default is None
+                (any key is accepted, a missing key is rejected)
+        :param seed: Optional. Seed of the error injection
+        """
+        if type(domains) is not int or domains < 0:
+            raise ValueError("domains should be a non-negative integer")
+        if type(page_size) is not int or page_size < 1:
+            raise ValueError("page_size should be a positive integer")
+        if not 0 <= error_rate + throttle_rate <= 1:
+            raise ValueError("Error and throttle rates should add up to "
+                             "a value in [0, 1]")
+
+        self.domains = domains
+        self.page_size = page_size
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.api_keys = None if api_keys is None else set(api_keys)
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._responses = {}
+        self._server = _HttpServer((host, port), self._handler())
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return 'http://{}:{}{}'.format(host, port, FakeApiServer.PATH)
+
+    def start(self):
+        """
+        Serve requests on a background thread
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._server.serve_forever, args=(0.05,),
+                name='fake-reverse-whois', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def stats(self) -> dict:
+        """
+        Number of requests and responses by HTTP status
+        """
+        with self._lock:
+            return {'requests': self._requests,
+                    'responses': dict(self._responses)}
+
+    def created_date(self, index: int) -> datetime.date:
+        """
+        Creation date of the domain at `index`. Dates grow with the index
+        and are spread over about 20 years
+        """
+        return FakeApiServer.EPOCH + datetime.timedelta(
+            days=index * 7300 // max(self.domains, 1))
+
+    def respond(self, token: str or None, body: bytes) -> tuple:
+        """
+        Status code, headers and body for a request
+        """
+        status = self._inject()
+        if status == 429:
+            return 429, {'Retry-After': str(self.retry_after)}, \
+                FakeApiServer._error(429, 'Too many requests')
+        if status == 503:
+            return 503, {}, FakeApiServer._error(503, 'Service unavailable')
+
+        try:
+            payload = json.loads(body.decode('utf-8'))
+        except ValueError:
+            return 400, {}, FakeApiServer._error(400, 'Malformed JSON')
+        if type(payload) is not dict:
+            return 400, {}, FakeApiServer._error(400, 'Malformed JSON')
+
+        token = token or payload.get('apiKey')
+        if not token or self.api_keys is not None \
+                and token not in self.api_keys:
+            return 401, {}, FakeApiServer._error(401, 'Access restricted')
+
+        terms = payload.get('basicSearchTerms') \
+            or payload.get('advancedSearchTerms')
+        mode = payload.get('mode', 'preview')
+        if not terms or mode not in ('preview', 'purchase'):
+            return 422, {}, FakeApiServer._error(
+                422, 'Invalid search terms or mode')
+
+        start, end = self._date_range(payload)
+        if mode == 'preview':
+            result = {'domainsCount': end - start}
+        else:
+            result = self._page(payload, terms, start, end)
+
+        if str(payload.get('responseFormat', 'json')).lower() == 'xml':
+            return 200, {'Content-Type': 'application/xml'}, \
+                FakeApiServer._xml(result)
+        return 200, {'Content-Type': 'application/json'}, \
+            json.dumps(result).encode('utf-8')
+
+    def _inject(self) -> int or None:
+        with self._lock:
+            self._requests += 1
+            value = self._random.random()
+        if value < self.throttle_rate:
+            return 429
+        if value < self.throttle_rate + self.error_rate:
+            return 503
+        return None
+
+    def _date_range(self, payload: dict) -> (int, int):
+        start, end = 0, self.domains
+        if payload.get('createdDateFrom'):
+            start = self._first_index(payload['createdDateFrom'])
+        if payload.get('createdDateTo'):
+            date = datetime.datetime.strptime(
+                payload['createdDateTo'][:10], '%Y-%m-%d').date()
+            end = self._first_index(
+                str(date + datetime.timedelta(days=1)))
+        return start, max(start, end)
+
+    def _first_index(self, value: str) -> int:
+        date = datetime.datetime.strptime(value[:10], '%Y-%m-%d').date()
+        low, high = 0, self.domains
+        while low < high:
+            middle = (low + high) // 2
+            if self.created_date(middle) < date:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _page(self, payload: dict, terms, start: int, end: int) -> dict:
+        prefix = hashlib.sha1(json.dumps(terms, sort_keys=True).encode(
+            'utf-8')).hexdigest()[:8]
+        offset = start
+        if payload.get('searchAfter'):
+            offset = max(start, int(payload['searchAfter']))
+        stop = min(end, offset + self.page_size)
+
+        audit = payload.get('includeAuditDates') is True
+        domains = []
+        for index in range(offset, stop):
+            name = 'd{}-{}.com'.format(prefix, index)
+            if not audit:
+                domains.append(name)
+                continue
+            created = '{}T00:00:00+00:00'.format(self.created_date(index))
+            domains.append({'domainName': name, 'audit': {
+                'createdDate': created, 'updatedDate': created}})
+        return {
+            'nextPageSearchAfter': stop if stop < end else None,
+            'domainsCount': end - start,
+            'domainsList': domains
+        }
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                body = self.rfile.read(length)
+                if self.path.split('?')[0] != FakeApiServer.PATH:
+                    self._send(404, {}, FakeApiServer._error(404, 'Not found'))
+                    return
+                status, headers, raw = server.respond(
+                    self.headers.get('X-Authentication-Token'), body)
+                delay = server.latency
+                if server.jitter:
+                    delay += random.uniform(0, server.jitter)
+                if delay > 0:
+                    time.sleep(delay)
+                self._send(status, headers, raw)
+
+            def _send(self, status: int, headers: dict, raw: bytes):
+                with server._lock:
+                    server._responses[status] = \
+                        server._responses.get(status, 0) + 1
+                self.send_response(status)
+                headers.setdefault('Content-Type', 'application/json')
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header('Content-Length', str(len(raw)))
+                self.end_headers()
+                self.wfile.write(raw)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    @staticmethod
+    def _error(code: int, message: str) -> bytes:
+        return json.dumps({'code': code, 'messages': message}).encode('utf-8')
+
+    @staticmethod
+    def _xml(result: dict) -> bytes:
+        parts = ['<?xml version="1.0" encoding="utf-8"?><root>']
+        for key, value in result.items():
+            if key != 'domainsList':
+                parts.append('<{0}>{1}</{0}>'.format(
+                    key, '' if value is None else value))
+                continue
+            parts.append('<domainsList>')
+            for domain in value:
+                if type(domain) is str:
+                    parts.append('<domain><domainName>{}</domainName>'
+                                 '</domain>'.format(escape(domain)))
+                    continue
+                parts.append(
+                    '<domain><domainName>{}</domainName><audit>'
+                    '<createdDate>{}</createdDate>'
+                    '<updatedDate>{}</updatedDate></audit></domain>'.format(
+                        escape(domain['domainName']),
+                        domain['audit']['createdDate'],
+                        domain['audit']['updatedDate']))
+            parts.append('</domainsList>')
+        parts.append('</root>')
+        return ''.join(parts).encode('utf-8')
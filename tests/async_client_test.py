@@ -0,0 +1,102 @@
+import asyncio
+import unittest
+
+from reversewhois import AsyncClient, ApiAuthError, ParameterError
+
+from tests.helpers import API_KEY, JsonHandler, LocalServer
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+class _Handler(JsonHandler):
+    def do_POST(self):
+        body = self.read_json()
+        if self.headers.get('X-Authentication-Token') != API_KEY:
+            self.reply(403, {'code': 403, 'messages': 'Access restricted'})
+            return
+        page = body.get('searchAfter', 0)
+        self.reply(200, {
+            'nextPageSearchAfter': page + 1 if page < 2 else None,
+            'domainsCount': 3,
+            'domainsList': ['page{}.com'.format(page)]
+        })
+
+
+@unittest.skipIf(aiohttp is None, 'aiohttp is not installed')
+class TestAsyncClient(unittest.TestCase):
+    """
+    AsyncClient tests against a local HTTP server.
+    """
+    def setUp(self) -> None:
+        self.server = LocalServer(_Handler)
+        self.url = self.server.url
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self) -> None:
+        self.loop.close()
+        self.server.close()
+
+    def _run(self, coro):
+        return self.loop.run_until_complete(coro)
+
+    def test_iterate_pages(self):
+        async def collect():
+            async with AsyncClient(API_KEY, base_url=self.url) as client:
+                return [page.domains_list[0].domain_name
+                        async for page in client.iterate_pages(
+                            basic_terms={'include': ['test']})]
+
+        self.assertEqual(
+            self._run(collect()), ['page0.com', 'page1.com', 'page2.com'])
+
+    def test_concurrent_previews(self):
+        async def gather():
+            async with AsyncClient(API_KEY, base_url=self.url) as client:
+                return await asyncio.gather(*[
+                    client.preview(basic_terms={'include': [str(i)]})
+                    for i in range(20)])
+
+        for response in self._run(gather()):
+            self.assertEqual(response.domains_count, 3)
+
+    def test_auth_error(self):
+        async def call():
+            async with AsyncClient('at_11111111111111111111111111111',
+                                   base_url=self.url) as client:
+                await client.preview(basic_terms={'include': ['test']})
+
+        with self.assertRaises(ApiAuthError):
+            self._run(call())
+
+    def test_validation(self):
+        async def call():
+            async with AsyncClient(API_KEY, base_url=self.url) as client:
+                await client.preview()
+
+        with self.assertRaises(ParameterError):
+            self._run(call())
+
+    def test_prefetch_not_supported(self):
+        async def call():
+            async with AsyncClient(API_KEY, base_url=self.url) as client:
+                async for _ in client.iterate_pages(
+                        basic_terms={'include': ['test']}, prefetch=2):
+                    pass
+
+        with self.assertRaises(ParameterError):
+            self._run(call())
+
+    def test_unsupported_options(self):
+        for name in ('retry', 'rate_limiter', 'metrics', 'cache'):
+            with self.assertRaises(ParameterError):
+                AsyncClient(API_KEY, **{name: None})
+        client = AsyncClient(API_KEY)
+        self.assertEqual(client.base_url,
+                         'https://reverse-whois.whoisxmlapi.com/api/v2')
+
+
+if __name__ == '__main__':
+    unittest.main()
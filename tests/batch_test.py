@@ -0,0 +1,57 @@
+import threading
+import time
+import unittest
+
+from reversewhois import Client, BatchResult, ParameterError
+
+from tests.helpers import API_KEY, StubRequester
+
+
+class TestBatch(unittest.TestCase):
+    def setUp(self) -> None:
+        self.client = Client(API_KEY)
+        self.client.api_requester = StubRequester(self._respond,
+                                                  pool_maxsize=4)
+        self.lock = threading.Lock()
+        self.active = 0
+        self.max_active = 0
+
+    def _respond(self, data: dict) -> dict:
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        term = data['basicSearchTerms']['include'][0]
+        # Later queries finish first
+        time.sleep(0.05 / (1 + int(term)))
+        with self.lock:
+            self.active -= 1
+        return {'domainsCount': int(term), 'domainsList': []}
+
+    def _queries(self, n):
+        return ({'basic_terms': {'include': [str(i)]}} for i in range(n))
+
+    def test_ordered(self):
+        results = list(self.client.batch(self._queries(10), max_workers=3))
+        self.assertEqual([r.index for r in results], list(range(10)))
+        self.assertEqual([r.response.domains_count for r in results],
+                         list(range(10)))
+        self.assertLessEqual(self.max_active, 3)
+        self.assertGreater(self.max_active, 1)
+
+    def test_completion_order(self):
+        results = list(self.client.batch(
+            self._queries(8), max_workers=8, ordered=False))
+        self.assertEqual(sorted(r.index for r in results), list(range(8)))
+        self.assertNotEqual([r.index for r in results], list(range(8)))
+
+    def test_failures_are_results(self):
+        queries = [{'basic_terms': {'include': ['1']}}, {}]
+        results = list(self.client.batch(queries))
+        self.assertIsInstance(results[1], BatchResult)
+        self.assertTrue(results[0].ok())
+        self.assertFalse(results[1].ok())
+        self.assertIsInstance(results[1].error, ParameterError)
+
+
+if __name__ == '__main__':
+    unittest.main()
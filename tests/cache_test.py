@@ -0,0 +1,161 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from reversewhois import Client, Query, SqliteResponseCache, \
+    MemoryResponseCache, UnparsableApiResponseError
+
+from tests.helpers import API_KEY, StubRequester
+
+
+def _respond(bodies=()):
+    """
+    Answers with the queued `bodies`, then with the number of requests
+    as `domainsCount`
+    """
+    bodies = list(bodies)
+    calls = []
+
+    def respond(data: dict):
+        calls.append(data)
+        if bodies:
+            return bodies.pop(0)
+        return {'domainsCount': len(calls), 'domainsList': []}
+    return respond
+
+
+class TestSqliteResponseCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, 'cache.sqlite')
+
+    def tearDown(self) -> None:
+        self.dir.cleanup()
+
+    def test_key_is_canonical(self):
+        first = Query(basic_terms={'include': ['a']}, search_after=1)
+        second = Query(search_after=1, basic_terms={'include': ['a']})
+        third = first.with_search_after(2)
+        self.assertEqual(first.fingerprint, second.fingerprint)
+        self.assertNotEqual(first.fingerprint, third.fingerprint)
+
+    def test_ttl_per_mode(self):
+        with SqliteResponseCache(self.path, preview_ttl=0.05) as cache:
+            cache.set('p', 'preview', b'preview')
+            cache.set('q', 'purchase', b'purchase')
+            self.assertEqual(cache.get('p'), b'preview')
+            time.sleep(0.1)
+            self.assertIsNone(cache.get('p'))
+            self.assertEqual(cache.get('q'), b'purchase')
+            self.assertEqual((cache.hits, cache.misses), (2, 1))
+
+    def test_size_eviction(self):
+        with SqliteResponseCache(self.path, max_size=25) as cache:
+            cache.set('a', 'purchase', b'a' * 10)
+            cache.set('b', 'purchase', b'b' * 10)
+            cache.get('a')
+            cache.set('c', 'purchase', b'c' * 10)
+            self.assertIsNone(cache.get('b'))
+            self.assertIsNotNone(cache.get('a'))
+            self.assertEqual(cache.stats()['size'], 20)
+
+    def test_persistent(self):
+        with SqliteResponseCache(self.path) as cache:
+            cache.set('a', 'purchase', b'value')
+        with SqliteResponseCache(self.path) as cache:
+            self.assertEqual(cache.get('a'), b'value')
+
+    def test_client_uses_cache(self):
+        requester = StubRequester(_respond())
+        with SqliteResponseCache(self.path) as cache:
+            client = Client(API_KEY, cache=cache)
+            client.api_requester = requester
+            terms = {'include': ['test']}
+            first = client.preview(basic_terms=terms)
+            second = client.preview(basic_terms=terms)
+            client.purchase(basic_terms=terms)
+            self.assertEqual(first, second)
+            self.assertEqual(len(requester.payloads), 2)
+            self.assertEqual(cache.hits, 1)
+
+    def test_invalid_responses_not_cached(self):
+        xml = b'<?xml version="1.0"?><root><domainsCount>1</domainsCount>'
+        requester = StubRequester(_respond([
+            b'{"messages": "temporary failure"}',
+            b'{"domainsCount": 1, "domainsLi',
+            xml,
+            xml + b'</root>',
+        ]))
+        with SqliteResponseCache(self.path) as cache:
+            client = Client(API_KEY, cache=cache)
+            client.api_requester = requester
+            terms = {'include': ['test']}
+            for _ in range(2):
+                with self.assertRaises(UnparsableApiResponseError):
+                    client.preview(basic_terms=terms)
+            for _ in range(3):
+                client.raw_data(basic_terms=terms, response_format='xml')
+            self.assertEqual(len(requester.payloads), 4)
+            for _ in range(2):
+                self.assertEqual(
+                    client.preview(basic_terms=terms).domains_count, 5)
+            self.assertEqual(len(requester.payloads), 5)
+
+    def test_endpoints_do_not_share_entries(self):
+        terms = {'include': ['test']}
+        with SqliteResponseCache(self.path) as cache:
+            counts = []
+            for url in ('http://one/api/v2', 'http://two/api/v2'):
+                client = Client(API_KEY, cache=cache)
+                client.api_requester = StubRequester(
+                    lambda data, n=len(counts): {'domainsCount': n},
+                    base_url=url)
+                for _ in range(2):
+                    counts.append(
+                        client.preview(basic_terms=terms).domains_count)
+            self.assertEqual(counts, [0, 0, 2, 2])
+            self.assertEqual(cache.hits, 2)
+
+
+class TestMemoryResponseCache(unittest.TestCase):
+    def test_lru(self):
+        cache = MemoryResponseCache(max_entries=2)
+        cache.set('a', 'preview', b'a')
+        cache.set('b', 'preview', b'b')
+        cache.get('a')
+        cache.set('c', 'preview', b'c')
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), b'a')
+        self.assertEqual(cache.stats()['entries'], 2)
+
+    def test_ttl(self):
+        cache = MemoryResponseCache(preview_ttl=0.05)
+        cache.set('a', 'preview', b'a')
+        time.sleep(0.1)
+        self.assertIsNone(cache.get('a'))
+
+    def test_concurrent_queries_coalesced(self):
+        requester = StubRequester(_respond(), delay=0.2)
+        client = Client(API_KEY, cache=MemoryResponseCache(),
+                        coalesce=True)
+        client.api_requester = requester
+        results = []
+
+        def query():
+            results.append(client.preview(basic_terms={'include': ['hot']}))
+
+        threads = [threading.Thread(target=query) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(requester.payloads), 1)
+        self.assertEqual(len(results), 10)
+        client.preview(basic_terms={'include': ['hot']})
+        self.assertEqual(len(requester.payloads), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+import asyncio
+import os
+import tempfile
+import unittest
+
+from reversewhois import AsyncClient, Client, HttpApiError, ParameterError, \
+    Query, FileCheckpointStore, SqliteCheckpointStore
+
+from tests.helpers import API_KEY, AsyncStubRequester, StubRequester, pages
+
+
+def _cursors(requester: StubRequester) -> list:
+    return [p.get('searchAfter', 0) for p in requester.payloads]
+
+
+class _CheckpointTests:
+    def setUp(self) -> None:
+        self.dir = tempfile.TemporaryDirectory()
+        self.store = self._store()
+        self.client = Client(API_KEY)
+        self.terms = {'include': ['test']}
+
+    def tearDown(self) -> None:
+        self.store.close()
+        self.dir.cleanup()
+
+    def _store(self):
+        raise NotImplementedError
+
+    def _names(self, **kwargs) -> list:
+        return [page.domains_list[0].domain_name
+                for page in self.client.iterate_pages(
+                    basic_terms=self.terms, checkpoint=self.store,
+                    **kwargs)]
+
+    def test_resume_after_failure(self):
+        self.client.api_requester = StubRequester(pages(6, fail_on=3))
+        names = []
+        with self.assertRaises(HttpApiError):
+            for page in self.client.iterate_pages(
+                    basic_terms=self.terms, checkpoint=self.store):
+                names.append(page.domains_list[0].domain_name)
+        self.assertEqual(len(names), 3)
+
+        fingerprint = Query(basic_terms=self.terms,
+                            mode='purchase').fingerprint
+        state = self.store.load(fingerprint)
+        self.assertEqual(state.search_after, 3)
+        self.assertEqual(state.pages, 3)
+
+        requester = StubRequester(pages(6))
+        self.client.api_requester = requester
+        self.assertEqual(self._names(),
+                         ['page{}.com'.format(i) for i in range(3, 6)])
+        self.assertEqual(_cursors(requester), [3, 4, 5])
+        self.assertIsNone(self.store.load(fingerprint))
+
+    def test_unprocessed_page_is_fetched_again(self):
+        self.client.api_requester = StubRequester(pages(4))
+        result = self.client.iterate_pages(basic_terms=self.terms,
+                                           checkpoint=self.store)
+        next(result)
+        next(result)
+        result.close()
+
+        requester = StubRequester(pages(4))
+        self.client.api_requester = requester
+        self.assertEqual(self._names(prefetch=2),
+                         ['page{}.com'.format(i) for i in range(1, 4)])
+
+    def test_other_query_starts_from_scratch(self):
+        self.client.api_requester = StubRequester(pages(3, fail_on=1))
+        with self.assertRaises(HttpApiError):
+            self._names()
+        self.client.api_requester = StubRequester(pages(3))
+        self.terms = {'include': ['other']}
+        self.assertEqual(len(self._names()), 3)
+
+    def test_async_client_resumes(self):
+        self.client.api_requester = StubRequester(pages(4, fail_on=2))
+        with self.assertRaises(HttpApiError):
+            self._names()
+
+        client = AsyncClient(API_KEY)
+        requester = AsyncStubRequester(pages(4))
+        client.api_requester = requester
+
+        async def collect():
+            return [page.domains_list[0].domain_name
+                    async for page in client.iterate_pages(
+                        basic_terms=self.terms, checkpoint=self.store)]
+
+        loop = asyncio.new_event_loop()
+        try:
+            names = loop.run_until_complete(collect())
+        finally:
+            loop.close()
+        self.assertEqual(names, ['page2.com', 'page3.com'])
+        self.assertEqual(_cursors(requester), [2, 3])
+        self.assertIsNone(self.store.load(
+            Query(basic_terms=self.terms, mode='purchase').fingerprint))
+
+    def test_invalid_store(self):
+        with self.assertRaises(ParameterError):
+            list(self.client.iterate_pages(basic_terms=self.terms,
+                                           checkpoint='state'))
+
+
+class TestFileCheckpointStore(_CheckpointTests, unittest.TestCase):
+    def _store(self):
+        return FileCheckpointStore(os.path.join(self.dir.name, 'state'))
+
+
+class TestSqliteCheckpointStore(_CheckpointTests, unittest.TestCase):
+    def _store(self):
+        return SqliteCheckpointStore(
+            os.path.join(self.dir.name, 'state.sqlite'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import os
+import tempfile
+import unittest
+
+from reversewhois import BloomFilter, ScalableBloomFilter, Deduplicator, \
+    Domain, Response
+
+
+class TestBloomFilter(unittest.TestCase):
+    def test_no_false_negatives(self):
+        bloom = BloomFilter(1000, 0.01)
+        names = ['test{}.com'.format(i) for i in range(1000)]
+        for name in names:
+            bloom.add(name)
+        self.assertTrue(all(name in bloom for name in names))
+
+    def test_false_positive_rate(self):
+        bloom = BloomFilter(10000, 0.01)
+        for i in range(10000):
+            bloom.add('in{}.com'.format(i))
+        false = sum('out{}.com'.format(i) in bloom for i in range(10000))
+        self.assertLess(false / 10000, 0.02)
+        # About 1.2 bytes per item at 1%
+        self.assertLess(bloom.nbytes, 10000 * 2)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            BloomFilter(0)
+        with self.assertRaises(ValueError):
+            BloomFilter(10, 1.5)
+
+
+class TestScalableBloomFilter(unittest.TestCase):
+    def test_grows(self):
+        bloom = ScalableBloomFilter(initial_capacity=100, error_rate=0.01)
+        names = ['test{}.com'.format(i) for i in range(5000)]
+        added = sum(bloom.add(name) for name in names)
+        self.assertGreater(added, 4900)
+        self.assertTrue(all(name in bloom for name in names))
+        self.assertFalse(bloom.add('test0.com'))
+        false = sum('out{}.com'.format(i) in bloom for i in range(10000))
+        self.assertLess(false / 10000, 0.02)
+
+
+class TestDeduplicator(unittest.TestCase):
+    def _pages(self):
+        for start in (0, 5, 10):
+            yield Response({
+                'domainsCount': 10,
+                'domainsList': ['test{}.com'.format(i)
+                                for i in range(start, start + 10)]
+            })
+
+    def test_filter(self):
+        with Deduplicator() as dedup:
+            names = [d.domain_name for d in dedup.filter(self._pages())]
+            self.assertEqual(names, ['test{}.com'.format(i)
+                                     for i in range(20)])
+            more = list(dedup.filter([Domain('test3.com'),
+                                      Domain('new.com')]))
+            self.assertEqual([d.domain_name for d in more], ['new.com'])
+
+    def test_exact_verification(self):
+        # A tiny filter with a high error rate reports most names as seen;
+        # the exact check must still let every new name through
+        with Deduplicator(error_rate=0.5, initial_capacity=1,
+                          exact=':memory:') as dedup:
+            dedup._filter = BloomFilter(1, 0.5)
+            names = ['test{}.com'.format(i) for i in range(200)]
+            self.assertTrue(all(dedup.add(name) for name in names))
+            self.assertFalse(any(dedup.add(name) for name in names))
+
+    def test_reopened_store(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'seen.sqlite')
+            with Deduplicator(exact=path) as dedup:
+                self.assertEqual(len(list(dedup.filter(self._pages()))), 20)
+            with Deduplicator(exact=path) as dedup:
+                self.assertEqual(len(dedup), 20)
+                more = list(dedup.filter([Domain('test3.com'),
+                                          Domain('new.com')]))
+                self.assertEqual([d.domain_name for d in more], ['new.com'])
+
+
+if __name__ == '__main__':
+    unittest.main()
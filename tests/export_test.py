@@ -0,0 +1,90 @@
+import csv
+import gzip
+import json
+import os
+import tempfile
+import unittest
+
+from reversewhois import Domain, Response, NdjsonExporter, CsvExporter, \
+    ParquetExporter, export
+
+try:
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+
+def _page(start: int, count: int) -> Response:
+    return Response({
+        'domainsCount': count,
+        'domainsList': [{
+            'domainName': 'test{}.com'.format(i),
+            'audit': {
+                'createdDate': '2020-01-02T03:04:05+00:00',
+                'updatedDate': None
+            }
+        } for i in range(start, start + count)]
+    })
+
+
+class TestExport(unittest.TestCase):
+    def setUp(self) -> None:
+        self.dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.dir.cleanup()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.dir.name, name)
+
+    def _pages(self):
+        return (_page(i * 10, 10) for i in range(5))
+
+    def test_ndjson(self):
+        path = self._path('domains.ndjson')
+        with NdjsonExporter(path) as exporter:
+            self.assertEqual(exporter.write(self._pages()), 50)
+        with open(path, encoding='utf-8') as file:
+            rows = [json.loads(line) for line in file]
+        self.assertEqual(len(rows), 50)
+        self.assertEqual(rows[0], {
+            'domain_name': 'test0.com',
+            'audit_created_date': '2020-01-02T03:04:05+00:00',
+            'audit_updated_date': None
+        })
+
+    def test_gzip_csv(self):
+        path = self._path('domains.csv.gz')
+        self.assertEqual(export(self._pages(), path), 50)
+        with gzip.open(path, 'rt', encoding='utf-8', newline='') as file:
+            rows = list(csv.reader(file))
+        self.assertEqual(rows[0], list(CsvExporter.COLUMNS))
+        self.assertEqual(len(rows), 51)
+        self.assertEqual(rows[50][0], 'test49.com')
+        self.assertEqual(rows[50][2], '')
+
+    def test_domains(self):
+        path = self._path('domains.jsonl')
+        domains = (Domain('test{}.com'.format(i)) for i in range(25))
+        self.assertEqual(export(domains, path, batch_size=10), 25)
+        with open(path, encoding='utf-8') as file:
+            self.assertEqual(len(file.readlines()), 25)
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            export(self._pages(), self._path('domains.txt'))
+        with self.assertRaises(TypeError):
+            export(['test.com'], self._path('domains.csv'))
+
+    @unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+    def test_parquet_row_groups(self):
+        path = self._path('domains.parquet')
+        with ParquetExporter(path, row_group_size=20) as exporter:
+            exporter.write(self._pages())
+        parquet = pyarrow.parquet.ParquetFile(path)
+        self.assertEqual(parquet.metadata.num_rows, 50)
+        self.assertEqual(parquet.metadata.num_row_groups, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import datetime
+import unittest
+
+from reversewhois import Client, ApiAuthError, HttpApiError, RetryPolicy, \
+    Harvester
+from reversewhois.testing import FakeApiServer, run_load_test
+
+_KEY = 'at_00000000000000000000000000000'
+
+
+class TestFakeApiServer(unittest.TestCase):
+    def setUp(self) -> None:
+        self.server = FakeApiServer(domains=2500, page_size=1000, seed=1)
+        self.server.start()
+        self.client = Client(_KEY, base_url=self.server.url)
+        self.terms = {'include': ['test']}
+
+    def tearDown(self) -> None:
+        self.client.close()
+        self.server.stop()
+
+    def test_preview_and_pagination(self):
+        self.assertEqual(
+            self.client.preview(basic_terms=self.terms).domains_count, 2500)
+        pages = list(self.client.iterate_pages(basic_terms=self.terms))
+        self.assertEqual([len(p.domains_list) for p in pages],
+                         [1000, 1000, 500])
+        names = [d.domain_name for p in pages for d in p.domains_list]
+        self.assertEqual(len(set(names)), 2500)
+
+    def test_audit_dates_and_date_filter(self):
+        date = self.server.created_date(1234)
+        response = self.client.purchase(
+            basic_terms=self.terms, include_audit_dates=True,
+            created_date_from=date, created_date_to=date)
+        self.assertGreater(response.domains_count, 0)
+        for domain in response.domains_list:
+            self.assertEqual(domain.audit_created_date.date(), date)
+
+    def test_harvester(self):
+        harvester = Harvester(self.client, max_workers=4, cap=400)
+        names = [d.domain_name for d in harvester.harvest(
+            basic_terms=self.terms, created_date_from=FakeApiServer.EPOCH,
+            created_date_to=datetime.date(2020, 12, 31))]
+        self.assertEqual(len(set(names)), 2500)
+
+    def test_xml(self):
+        raw = self.client.raw_data(basic_terms=self.terms,
+                                   response_format=Client.XML_FORMAT)
+        self.assertTrue(raw.startswith('<?xml'))
+        self.assertIn('<domainsCount>2500</domainsCount>', raw)
+
+    def test_authentication(self):
+        self.server.api_keys = {'at_11111111111111111111111111111'}
+        with self.assertRaises(ApiAuthError):
+            self.client.preview(basic_terms=self.terms)
+
+    def test_throttling(self):
+        self.server.throttle_rate = 1.0
+        self.server.retry_after = 0
+        with self.assertRaises(HttpApiError):
+            self.client.preview(basic_terms=self.terms)
+        self.server.throttle_rate = 0.5
+        self.client.api_requester.retry = RetryPolicy(
+            max_attempts=20, backoff_base=0, backoff_cap=0.01)
+        for _ in range(5):
+            self.client.preview(basic_terms=self.terms)
+        self.assertGreater(self.server.stats()['responses'][429], 1)
+
+    def test_load_test(self):
+        result = run_load_test(self.client, duration=0.3, concurrency=2,
+                               prefetch=1)
+        self.assertGreater(result.requests, 0)
+        self.assertEqual(result.errors, 0)
+        self.assertEqual(result.domains % 500, 0)
+        self.assertLessEqual(result.percentile(50), result.percentile(99))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import datetime
+import unittest
+
+from reversewhois import Client, Harvester, Query
+
+from tests.helpers import API_KEY, StubRequester
+
+
+def _serve(records: list, cap: int):
+    """
+    Serves a fixed set of (name, created date) pairs. Purchases return
+    at most `cap` domains, pages hold 3 domains each
+    """
+    def respond(data: dict) -> dict:
+        start = data.get('createdDateFrom', '0000-00-00')
+        end = data.get('createdDateTo', '9999-99-99')
+        matched = [name for name, created in records
+                   if start <= str(created) <= end]
+        if data['mode'] == 'preview':
+            return {'domainsCount': len(matched)}
+
+        matched = matched[:cap]
+        offset = data.get('searchAfter', 0)
+        more = offset + 3 < len(matched)
+        return {
+            'domainsCount': len(matched),
+            'nextPageSearchAfter': offset + 3 if more else None,
+            'domainsList': matched[offset:offset + 3]
+        }
+    return respond
+
+
+class TestHarvester(unittest.TestCase):
+    def setUp(self) -> None:
+        self.client = Client(API_KEY)
+        self.start = datetime.date(2020, 1, 1)
+        self.terms = {'include': ['bank']}
+
+    def _records(self, days: int, per_day: int) -> list:
+        records = []
+        for day in range(days):
+            created = self.start + datetime.timedelta(days=day)
+            for i in range(per_day):
+                records.append(('d{}-{}.com'.format(day, i), created))
+        return records
+
+    def _harvester(self, records: list, cap: int) -> Harvester:
+        self.requester = StubRequester(_serve(records, cap),
+                                       pool_maxsize=4)
+        self.client.api_requester = self.requester
+        return Harvester(self.client, max_workers=4, cap=cap)
+
+    def test_shards_are_under_cap(self):
+        harvester = self._harvester(self._records(30, 2), 10)
+        shards = harvester.shards(
+            basic_terms=self.terms, created_date_from=self.start,
+            created_date_to=self.start + datetime.timedelta(days=29))
+        self.assertTrue(all(0 < s.count <= 10 for s in shards))
+        self.assertEqual(sum(s.count for s in shards), 60)
+        for previous, shard in zip(shards, shards[1:]):
+            self.assertEqual(
+                previous.date_to + datetime.timedelta(days=1),
+                shard.date_from)
+
+    def test_harvest_is_complete_and_unique(self):
+        records = self._records(30, 2)
+        # The same name appears on two dates
+        records.append(('d0-0.com', self.start + datetime.timedelta(days=5)))
+        harvester = self._harvester(records, 10)
+        names = [d.domain_name for d in harvester.harvest(
+            basic_terms=self.terms, created_date_from=self.start,
+            created_date_to=self.start + datetime.timedelta(days=29))]
+        self.assertEqual(len(names), len(set(names)))
+        self.assertEqual(set(names), {name for name, _ in records})
+
+    def test_query_dates_are_used(self):
+        harvester = self._harvester(self._records(10, 1), 100)
+        query = Query(basic_terms=self.terms,
+                      created_date_from=self.start,
+                      created_date_to=self.start)
+        shards = harvester.shards(query=query)
+        self.assertEqual(len(shards), 1)
+        self.assertEqual(shards[0].count, 1)
+        self.assertEqual(self.requester.count('preview'), 1)
+
+    def test_single_day_over_cap(self):
+        harvester = self._harvester(self._records(1, 20), 5)
+        with self.assertLogs('reversewhois.harvest', 'WARNING'):
+            shards = harvester.shards(
+                basic_terms=self.terms, created_date_from=self.start,
+                created_date_to=self.start + datetime.timedelta(days=3))
+        self.assertEqual(len(shards), 1)
+        self.assertEqual(shards[0].date_from, self.start)
+        self.assertEqual(shards[0].date_to, self.start)
+
+    def test_shards_in_flight_are_bounded(self):
+        harvester = self._harvester(self._records(30, 2), 10)
+        domains = harvester.harvest(
+            basic_terms=self.terms, created_date_from=self.start,
+            created_date_to=self.start + datetime.timedelta(days=29))
+        next(domains)
+        shards = {p['createdDateFrom'] for p in self.requester.payloads
+                  if p['mode'] == 'purchase'}
+        # One window of shards per worker, the rest is not submitted yet
+        self.assertLessEqual(len(shards), 4)
+        self.assertEqual(len(list(domains)), 59)
+
+
+if __name__ == '__main__':
+    unittest.main()
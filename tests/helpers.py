@@ -0,0 +1,134 @@
+"""
+Test doubles shared by the test modules
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+from reversewhois import HttpApiError
+
+API_KEY = 'at_00000000000000000000000000000'
+
+
+def encode(body) -> bytes:
+    return json.dumps(body).encode('utf-8')
+
+
+def chunks(raw: bytes, size: int):
+    return (raw[i:i + size] for i in range(0, len(raw), size))
+
+
+def pages(count: int, fail_on: int or None = None):
+    """
+    Answers for `StubRequester` serving `count` pages of one domain each,
+    'page0.com' and so on. The page at `fail_on` fails with
+    `HttpApiError`.
+    """
+    def respond(data: dict) -> dict:
+        page = data.get('searchAfter', 0)
+        if page == fail_on:
+            raise HttpApiError('Service Unavailable')
+        return {
+            'domainsCount': count,
+            'nextPageSearchAfter': page + 1 if page + 1 < count else None,
+            'domainsList': ['page{}.com'.format(page)]
+        }
+    return respond
+
+
+class StubRequester:
+    """
+    Stands in for `ApiRequester` as `Client.api_requester`. Every payload
+    is recorded in `payloads` and answered with `respond(payload)`, either
+    raw bytes or an object encoded as JSON. Exceptions raised by
+    `respond` reach the client.
+    """
+
+    def __init__(self, respond, pool_maxsize: int = 10, delay: float = 0,
+                 base_url: str = 'http://127.0.0.1/api/v2'):
+        self.respond = respond
+        self.base_url = base_url
+        self.pool_maxsize = pool_maxsize
+        self.delay = delay
+        self.payloads = []
+        self.lock = threading.Lock()
+
+    def post_raw(self, data: dict) -> bytes:
+        with self.lock:
+            self.payloads.append(data)
+        if self.delay:
+            time.sleep(self.delay)
+        body = self.respond(data)
+        return body if type(body) is bytes else encode(body)
+
+    def post_stream(self, data: dict):
+        return chunks(self.post_raw(data), 16)
+
+    def count(self, mode: str) -> int:
+        """
+        Number of requests made in `mode`
+        """
+        with self.lock:
+            return sum(1 for p in self.payloads if p.get('mode') == mode)
+
+
+class AsyncStubRequester(StubRequester):
+    """
+    `StubRequester` for `AsyncClient`
+    """
+
+    async def post_raw(self, data: dict) -> bytes:
+        return StubRequester.post_raw(self, data)
+
+    async def close(self):
+        pass
+
+
+class JsonHandler(BaseHTTPRequestHandler):
+    """
+    Base request handler for `LocalServer` with keep-alive connections
+    and without logging
+    """
+    protocol_version = 'HTTP/1.1'
+
+    def read_json(self) -> dict:
+        length = int(self.headers.get('Content-Length', 0))
+        return json.loads(self.rfile.read(length)) if length else {}
+
+    def reply(self, status: int, body=b'', headers: dict or None = None):
+        """
+        Send a response. `body` is raw bytes or an object encoded as JSON
+        """
+        raw = body if type(body) is bytes else encode(body)
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def log_message(self, *args):
+        pass
+
+
+class LocalServer(ThreadingMixIn, HTTPServer):
+    """
+    HTTP server on a free local port, serving on a daemon thread until
+    `close`. `url` is the API endpoint to pass as `base_url`.
+    """
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, handler):
+        super().__init__(('127.0.0.1', 0), handler)
+        self.url = 'http://127.0.0.1:{}/api/v2'.format(self.server_address[1])
+        thread = threading.Thread(target=self.serve_forever, args=(0.05,))
+        thread.daemon = True
+        thread.start()
+
+    def close(self):
+        self.shutdown()
+        self.server_close()
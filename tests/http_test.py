@@ -0,0 +1,213 @@
+import json
+import time
+import unittest
+
+from requests.exceptions import ChunkedEncodingError, ConnectionError, \
+    Timeout
+
+from reversewhois import ApiRequester, RetryPolicy, HttpApiError, Metrics
+
+from tests.helpers import JsonHandler, LocalServer
+
+
+class _Handler(JsonHandler):
+    connections = set()
+    failures = []
+    # Number of responses that stop in the middle of the body
+    stalls = 0
+    # Number of chunked responses cut before the last chunk
+    truncations = 0
+    # Number of responses whose connection is closed in the middle of
+    # the body
+    resets = 0
+
+    def do_POST(self):
+        _Handler.connections.add(self.client_address)
+        body = self.read_json()
+        if _Handler.failures:
+            self.reply(_Handler.failures.pop(0), headers={'Retry-After': '0'})
+            return
+        body['token'] = self.headers.get('X-Authentication-Token')
+        if _Handler.truncations:
+            _Handler.truncations -= 1
+            raw = json.dumps(body).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            self.wfile.write(b'%x\r\n%s\r\n' % (len(raw), raw))
+            self.wfile.write(b'10\r\nabc')
+            self.wfile.flush()
+            self.close_connection = True
+            return
+        if not _Handler.stalls and not _Handler.resets:
+            self.reply(200, body)
+            return
+        raw = json.dumps(body).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw[:len(raw) // 2])
+        self.wfile.flush()
+        if _Handler.stalls:
+            _Handler.stalls -= 1
+            time.sleep(1.5)
+        else:
+            _Handler.resets -= 1
+        self.close_connection = True
+
+
+class TestApiRequester(unittest.TestCase):
+    """
+    Transport tests against a local HTTP server.
+    """
+    def setUp(self) -> None:
+        _Handler.connections = set()
+        _Handler.failures = []
+        _Handler.stalls = 0
+        _Handler.truncations = 0
+        _Handler.resets = 0
+        self.server = LocalServer(_Handler)
+        self.url = self.server.url
+
+    def tearDown(self) -> None:
+        self.server.close()
+
+    def test_connection_reused(self):
+        with ApiRequester(base_url=self.url) as requester:
+            for i in range(5):
+                result = json.loads(
+                    requester.post({'apiKey': 'key', 'searchAfter': i}))
+                self.assertEqual(result['searchAfter'], i)
+                self.assertEqual(result['token'], 'key')
+        self.assertEqual(len(_Handler.connections), 1)
+
+    def test_idle_connections_dropped(self):
+        requester = ApiRequester(base_url=self.url, idle_timeout=0.001)
+        requester.post({'n': 1})
+        requester._last_used -= 1
+        requester.post({'n': 2})
+        requester.close()
+        self.assertEqual(len(_Handler.connections), 2)
+
+    def test_post_stream(self):
+        with ApiRequester(base_url=self.url) as requester:
+            chunks = list(requester.post_stream(
+                {'apiKey': 'key', 'n': 1}, chunk_size=4))
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(json.loads(b''.join(chunks)),
+                         {'n': 1, 'token': 'key'})
+
+    def test_retry_transient_errors(self):
+        _Handler.failures = [503, 429]
+        policy = RetryPolicy(max_attempts=3, backoff_base=0.01,
+                             backoff_cap=0.05)
+        with ApiRequester(base_url=self.url, retry=policy) as requester:
+            self.assertEqual(json.loads(requester.post({'n': 1}))['n'], 1)
+        self.assertEqual(_Handler.failures, [])
+
+    def test_retry_stalled_download(self):
+        _Handler.stalls = 1
+        policy = RetryPolicy(max_attempts=2, backoff_base=0.01,
+                             backoff_cap=0.05)
+        with ApiRequester(base_url=self.url, timeout=1,
+                          retry=policy) as requester:
+            self.assertEqual(json.loads(requester.post({'n': 1}))['n'], 1)
+        self.assertEqual(_Handler.stalls, 0)
+
+    def test_stalled_download_without_retry(self):
+        _Handler.stalls = 1
+        with ApiRequester(base_url=self.url, timeout=1) as requester:
+            with self.assertRaises(Timeout):
+                requester.post({'n': 1})
+
+    def test_stalled_download_is_a_timeout(self):
+        _Handler.stalls = 2
+        policy = RetryPolicy(max_attempts=2, backoff_base=0.01,
+                             backoff_cap=0.05, retry_on_timeout=False)
+        with ApiRequester(base_url=self.url, timeout=1,
+                          retry=policy) as requester:
+            with self.assertRaises(Timeout):
+                requester.post({'n': 1})
+        self.assertEqual(_Handler.stalls, 1)
+
+    def test_retry_reset_download(self):
+        _Handler.resets = 1
+        policy = RetryPolicy(max_attempts=2, backoff_base=0.01,
+                             backoff_cap=0.05)
+        with ApiRequester(base_url=self.url, retry=policy) as requester:
+            self.assertEqual(json.loads(requester.post({'n': 1}))['n'], 1)
+        self.assertEqual(_Handler.resets, 0)
+
+        _Handler.resets = 2
+        policy = RetryPolicy(max_attempts=2, backoff_base=0.01,
+                             backoff_cap=0.05,
+                             retry_on_connection_error=False)
+        with ApiRequester(base_url=self.url, retry=policy) as requester:
+            with self.assertRaises(ConnectionError):
+                requester.post({'n': 1})
+        self.assertEqual(_Handler.resets, 1)
+
+    def test_retry_truncated_chunked_body(self):
+        _Handler.truncations = 1
+        policy = RetryPolicy(max_attempts=2, backoff_base=0.01,
+                             backoff_cap=0.05)
+        with ApiRequester(base_url=self.url, retry=policy) as requester:
+            self.assertEqual(json.loads(requester.post({'n': 1}))['n'], 1)
+        self.assertEqual(_Handler.truncations, 0)
+
+        _Handler.truncations = 1
+        with ApiRequester(base_url=self.url) as requester:
+            with self.assertRaises(ChunkedEncodingError):
+                requester.post({'n': 1})
+
+    def test_retry_attempts_exhausted(self):
+        _Handler.failures = [503, 503, 503]
+        policy = RetryPolicy(max_attempts=2, backoff_base=0.01,
+                             backoff_cap=0.05)
+        with ApiRequester(base_url=self.url, retry=policy) as requester:
+            with self.assertRaises(HttpApiError):
+                requester.post({'n': 1})
+        self.assertEqual(_Handler.failures, [503])
+
+    def test_no_retry_by_default(self):
+        _Handler.failures = [503]
+        with ApiRequester(base_url=self.url) as requester:
+            with self.assertRaises(HttpApiError):
+                requester.post({'n': 1})
+
+    def test_metrics(self):
+        _Handler.failures = [503]
+        metrics = Metrics()
+        policy = RetryPolicy(max_attempts=2, backoff_base=0.01,
+                             backoff_cap=0.05)
+        with ApiRequester(base_url=self.url, retry=policy,
+                          metrics=metrics) as requester:
+            requester.post_raw({'mode': 'preview', 'n': 1})
+        snapshot = metrics.snapshot()
+        requests = {item['labels']['status']: item['value']
+                    for item in snapshot[Metrics.REQUESTS]}
+        self.assertEqual(requests, {'200': 1, '503': 1})
+        self.assertEqual(snapshot[Metrics.RETRIES][0]['labels'],
+                         {'reason': 'HTTP 503'})
+        stages = {item['labels']['stage']: item['count']
+                  for item in snapshot[Metrics.STAGE_SECONDS]}
+        self.assertEqual(stages, {'ttfb': 2, 'download': 1})
+        self.assertGreater(snapshot[Metrics.RESPONSE_BYTES][0]['value'], 0)
+
+    def test_retry_after(self):
+        policy = RetryPolicy(backoff_base=1, backoff_cap=2)
+        self.assertEqual(policy.delay(0, '7'), 7)
+        self.assertEqual(
+            RetryPolicy.parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT'),
+            0)
+        self.assertIsNone(RetryPolicy.parse_retry_after('soon'))
+        for _ in range(100):
+            self.assertTrue(1 <= policy.delay(1.5, None) <= 2)
+
+    def test_invalid_pool_size(self):
+        with self.assertRaises(ValueError):
+            ApiRequester(base_url=self.url, pool_maxsize=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
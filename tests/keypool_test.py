@@ -0,0 +1,140 @@
+import time
+import unittest
+
+from reversewhois import ApiKeyPool, ApiAuthError, Client, ParameterError, \
+    RetryPolicy
+
+from tests.helpers import JsonHandler, LocalServer
+
+KEY_A = 'at_' + 'a' * 29
+KEY_B = 'at_' + 'b' * 29
+KEY_C = 'at_' + 'c' * 29
+
+
+class _Handler(JsonHandler):
+    # Status codes returned for a token, 200 when missing
+    statuses = {}
+    tokens = []
+
+    def do_POST(self):
+        self.read_json()
+        token = self.headers.get('X-Authentication-Token')
+        _Handler.tokens.append(token)
+        status = _Handler.statuses.get(token, 200)
+        if status == 200:
+            self.reply(200, {'domainsCount': 1})
+            return
+        self.reply(status, {'code': status, 'messages': 'error'},
+                   {'Retry-After': '30'} if status == 429 else None)
+
+
+class TestApiKeyPool(unittest.TestCase):
+    def test_weighted_round_robin(self):
+        pool = ApiKeyPool({KEY_A: 3, KEY_B: 1})
+        keys = []
+        for _ in range(8):
+            keys.append(pool.acquire())
+            pool.release(keys[-1], 200)
+        self.assertEqual(keys.count(KEY_A), 6)
+        # Smooth: the light key is not starved until the end
+        self.assertIn(KEY_B, keys[:4])
+
+    def test_least_loaded(self):
+        pool = ApiKeyPool([KEY_A, KEY_B], strategy=ApiKeyPool.LEAST_LOADED)
+        first = pool.acquire()
+        second = pool.acquire()
+        self.assertNotEqual(first, second)
+        pool.release(first, 200)
+        self.assertEqual(pool.acquire(), first)
+
+    def test_throttled_key_rests(self):
+        pool = ApiKeyPool([KEY_A, KEY_B])
+        pool.release(pool.acquire(), 429, 30)
+        for _ in range(3):
+            key = pool.acquire()
+            self.assertEqual(key, KEY_B)
+            pool.release(key, 200)
+        stats = pool.stats()
+        self.assertEqual(stats[KEY_A]['throttled'], 1)
+        self.assertGreater(stats[KEY_A]['available_in'], 29)
+
+        pool.reset(KEY_A)
+        self.assertTrue(pool.available([KEY_B]))
+
+    def test_waits_for_throttled_keys(self):
+        pool = ApiKeyPool([KEY_A], throttle_cooldown=0.05)
+        pool.release(pool.acquire(), 429)
+        started = time.monotonic()
+        self.assertEqual(pool.acquire(), KEY_A)
+        self.assertGreaterEqual(time.monotonic() - started, 0.04)
+
+    def test_all_keys_exhausted(self):
+        pool = ApiKeyPool([KEY_A, KEY_B])
+        pool.release(pool.acquire(), 402)
+        pool.release(pool.acquire(), 403)
+        with self.assertRaises(ApiAuthError):
+            pool.acquire()
+        self.assertEqual(pool.stats()[KEY_B]['exhausted'], 1)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            ApiKeyPool([])
+        with self.assertRaises(ValueError):
+            ApiKeyPool(KEY_A)
+        with self.assertRaises(ValueError):
+            ApiKeyPool({KEY_A: 0})
+        with self.assertRaises(ValueError):
+            ApiKeyPool([KEY_A], strategy='random')
+        with self.assertRaises(ParameterError):
+            Client(ApiKeyPool([KEY_A, 'bad key']))
+
+
+class TestClientKeyPool(unittest.TestCase):
+    def setUp(self) -> None:
+        _Handler.statuses = {}
+        _Handler.tokens = []
+        self.server = LocalServer(_Handler)
+        self.url = self.server.url
+        self.terms = {'include': ['test']}
+
+    def tearDown(self) -> None:
+        self.server.close()
+
+    def test_requests_spread_over_keys(self):
+        pool = ApiKeyPool([KEY_A, KEY_B, KEY_C])
+        with Client(pool, base_url=self.url) as client:
+            for _ in range(6):
+                client.preview(basic_terms=self.terms)
+        self.assertEqual(sorted(_Handler.tokens), [KEY_A] * 2 + [KEY_B] * 2
+                         + [KEY_C] * 2)
+
+    def test_exhausted_key_fails_over(self):
+        _Handler.statuses = {KEY_A: 402}
+        pool = ApiKeyPool([KEY_A, KEY_B])
+        with Client(pool, base_url=self.url) as client:
+            for _ in range(3):
+                self.assertEqual(
+                    client.preview(basic_terms=self.terms).domains_count, 1)
+        self.assertEqual(_Handler.tokens, [KEY_A, KEY_B, KEY_B, KEY_B])
+
+        _Handler.statuses = {KEY_A: 402, KEY_B: 403}
+        pool.reset()
+        with Client(pool, base_url=self.url) as client:
+            with self.assertRaises(ApiAuthError):
+                client.preview(basic_terms=self.terms)
+
+    def test_throttled_key_retried_with_another_key(self):
+        _Handler.statuses = {KEY_A: 429}
+        pool = ApiKeyPool([KEY_A, KEY_B])
+        retry = RetryPolicy(max_attempts=2, backoff_base=5, backoff_cap=5)
+        started = time.monotonic()
+        with Client(pool, base_url=self.url, retry=retry) as client:
+            self.assertEqual(
+                client.preview(basic_terms=self.terms).domains_count, 1)
+        self.assertLess(time.monotonic() - started, 5)
+        self.assertEqual(_Handler.tokens, [KEY_A, KEY_B])
+        self.assertEqual(pool.stats()[KEY_A]['throttled'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+
+from reversewhois import Client, Metrics, MemoryResponseCache, \
+    UnparsableApiResponseError
+
+from tests.helpers import API_KEY, StubRequester
+
+
+class TestMetrics(unittest.TestCase):
+    def test_counters_and_histograms(self):
+        metrics = Metrics(buckets=(0.1, 1))
+        metrics.increment('calls_total', mode='preview')
+        metrics.increment('calls_total', 2, mode='preview')
+        metrics.observe('latency_seconds', 0.05)
+        metrics.observe('latency_seconds', 0.5)
+        metrics.observe('latency_seconds', 5)
+
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot['calls_total'],
+                         [{'labels': {'mode': 'preview'}, 'value': 3}])
+        latency = snapshot['latency_seconds'][0]
+        self.assertEqual(latency['count'], 3)
+        self.assertEqual(latency['buckets'],
+                         {0.1: 1, 1.0: 2, float('inf'): 3})
+
+    def test_prometheus_format(self):
+        metrics = Metrics(buckets=(0.5,))
+        metrics.increment(Metrics.ERRORS, mode='preview', type='a"b')
+        metrics.observe(Metrics.STAGE_SECONDS, 0.25, stage='decode')
+        text = metrics.to_prometheus()
+        self.assertIn('# TYPE reversewhois_errors_total counter', text)
+        self.assertIn(
+            'reversewhois_errors_total{mode="preview",type="a\\"b"} 1',
+            text)
+        self.assertIn('reversewhois_stage_seconds_bucket'
+                      '{stage="decode",le="0.5"} 1', text)
+        self.assertIn('reversewhois_stage_seconds_bucket'
+                      '{stage="decode",le="+Inf"} 1', text)
+        self.assertIn('reversewhois_stage_seconds_sum'
+                      '{stage="decode"} 0.25', text)
+        self.assertEqual(Metrics().to_prometheus(), '')
+
+
+class TestClientMetrics(unittest.TestCase):
+    def setUp(self) -> None:
+        self.metrics = Metrics()
+        self.client = Client(API_KEY, metrics=self.metrics,
+                             cache=MemoryResponseCache())
+        self.terms = {'include': ['test']}
+
+    def test_stages_and_cache(self):
+        self.client.api_requester = StubRequester(
+            lambda data: {'domainsCount': 1, 'domainsList': ['test.com']})
+        self.client.preview(basic_terms=self.terms)
+        self.client.preview(basic_terms=self.terms)
+        snapshot = self.metrics.snapshot()
+        stages = {item['labels']['stage']: item['count']
+                  for item in snapshot[Metrics.STAGE_SECONDS]}
+        self.assertEqual(stages, {'decode': 2, 'parse': 2})
+        cache = {item['labels']['result']: item['value']
+                 for item in snapshot[Metrics.CACHE_REQUESTS]}
+        self.assertEqual(cache, {'hit': 1, 'miss': 1})
+
+    def test_errors(self):
+        self.client.api_requester = StubRequester(lambda data: b'not json')
+        with self.assertRaises(UnparsableApiResponseError):
+            self.client.purchase(basic_terms=self.terms)
+        self.assertEqual(
+            self.metrics.snapshot()[Metrics.ERRORS][0]['labels'],
+            {'mode': 'purchase', 'type': 'UnparsableApiResponseError'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,8 @@
+import datetime
 import unittest
 from json import loads
-from reversewhois import Response, ErrorMessage
+from reversewhois import Client, Response, ErrorMessage, Domain
+from reversewhois.models import decoder
 
 
 _json_response_ok = '''{
@@ -71,6 +73,72 @@ class TestModel(unittest.TestCase):
                     .rsplit(':', 1))
         )
 
+    def test_lazy_domains_list(self):
+        response = loads(_json_response_ok_with_dates)
+        parsed = Response(response)
+        self.assertEqual(parsed.domains_list.names(),
+                         ['airbnb.app', 'airbnbhost.app'])
+        self.assertNotIsInstance(list.__getitem__(parsed.domains_list, 0),
+                                 Domain)
+        first = parsed.domains_list[0]
+        self.assertIs(parsed.domains_list[0], first)
+        self.assertEqual([d.domain_name for d in parsed.domains_list[::-1]],
+                         ['airbnbhost.app', 'airbnb.app'])
+        self.assertEqual(len(parsed.domains_list + []), 2)
+
+    def test_lazy_audit_dates(self):
+        domain = Domain(loads(_json_response_ok_with_dates)['domainsList'][0])
+        self.assertEqual(domain['domain_name'], 'airbnb.app')
+        self.assertEqual(domain.audit_created_date.year, 2021)
+        self.assertIn("'audit_updated_date': '2021-01-10 18:52:41+00:00'",
+                      str(domain))
+        with self.assertRaises(KeyError):
+            domain['_audit']
+
+    def test_equality(self):
+        first = Response(loads(_json_response_ok_with_dates))
+        second = Response(loads(_json_response_ok_with_dates))
+        self.assertEqual(first, second)
+        self.assertEqual(first.domains_list[0], second.domains_list[0])
+        self.assertNotEqual(first.domains_list[0], second.domains_list[1])
+        self.assertNotEqual(first, Response(loads(_json_response_ok)))
+
+    def test_compact_models(self):
+        parsed = Response(loads(_json_response_ok_with_dates))
+        first, second = parsed.domains_list
+        self.assertFalse(hasattr(first, '__dict__'))
+        self.assertIs(first.audit_created_date, second.audit_created_date)
+        self.assertIs(first.audit_created_date.tzinfo,
+                      second.audit_updated_date.tzinfo)
+
+    def test_json_backends(self):
+        raw = _json_response_ok_with_dates.encode('utf-8')
+        current = decoder.get_backend()
+        try:
+            parsed = []
+            for backend in decoder.available_backends():
+                decoder.set_backend(backend)
+                parsed.append(Client._parse_response(raw))
+            for response in parsed:
+                self.assertEqual(response, parsed[0])
+        finally:
+            decoder.set_backend(current)
+        with self.assertRaises(ValueError):
+            decoder.set_backend('unknown')
+
+    def test_audit_date_parsing(self):
+        for value in ['2021-01-10T18:52:41+00:00',
+                      '1999-12-31T23:59:59+05:30']:
+            domain = Domain({'domainName': 'a.com',
+                             'audit': {'createdDate': value}})
+            self.assertEqual(
+                domain.audit_created_date,
+                datetime.datetime.strptime(value, '%Y-%m-%dT%H:%M:%S%z'))
+        for value in ['2021-01-10', '2021-01-10T18:52:41Z', 'garbage']:
+            domain = Domain({'domainName': 'a.com',
+                             'audit': {'createdDate': value}})
+            self.assertIsNone(domain.audit_created_date)
+
     def test_error_parsing(self):
         error = loads(_json_response_error)
         parsed_error = ErrorMessage(error)
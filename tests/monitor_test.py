@@ -0,0 +1,129 @@
+import datetime
+import unittest
+
+from reversewhois import Client, Monitor, SqliteSnapshotStore
+
+from tests.helpers import API_KEY, StubRequester
+
+
+def _serve(records: list, purchased: list):
+    """
+    Serves records of (name, created date, updated date) and adds the
+    purchased names to `purchased`
+    """
+    def respond(data: dict) -> dict:
+        created_from = data.get('createdDateFrom', '')
+        updated_from = data.get('updatedDateFrom', '')
+        matched = [r for r in records
+                   if str(r[1]) >= created_from
+                   and str(r[2]) >= updated_from]
+        if data['mode'] == 'preview':
+            return {'domainsCount': len(matched)}
+
+        purchased.extend(r[0] for r in matched)
+        return {
+            'domainsCount': len(matched),
+            'domainsList': [{
+                'domainName': name,
+                'audit': {
+                    'createdDate': '{}T00:00:00+00:00'.format(created),
+                    'updatedDate': '{}T00:00:00+00:00'.format(updated),
+                }
+            } for name, created, updated in matched]
+        }
+    return respond
+
+
+class TestMonitor(unittest.TestCase):
+    def setUp(self) -> None:
+        self.client = Client(API_KEY)
+        self.store = SqliteSnapshotStore(':memory:')
+        self.monitor = Monitor(self.client, self.store)
+        self.today = datetime.date.today()
+        old = self.today - datetime.timedelta(days=30)
+        self.records = [('old{}.com'.format(i), old, old) for i in range(20)]
+        self.purchased = []
+        self.requester = StubRequester(
+            _serve(self.records, self.purchased), pool_maxsize=4)
+        self.client.api_requester = self.requester
+        self.terms = {'include': ['test']}
+
+    def tearDown(self) -> None:
+        self.store.close()
+
+    def test_first_run(self):
+        diff = self.monitor.run(basic_terms=self.terms)
+        self.assertTrue(diff.full_refresh)
+        self.assertEqual(len(diff.added), 20)
+        self.assertEqual(diff.removed, [])
+        self.assertIsNotNone(diff.added[0].audit_created_date)
+
+    def test_incremental_run(self):
+        self.monitor.run(basic_terms=self.terms)
+        old = self.today - datetime.timedelta(days=30)
+        self.records.append(('new.com', self.today, self.today))
+        self.records.append(('updated.com', old, self.today))
+        del self.purchased[:]
+
+        diff = self.monitor.run(basic_terms=self.terms)
+        self.assertFalse(diff.full_refresh)
+        self.assertEqual(sorted(d.domain_name for d in diff.added),
+                         ['new.com', 'updated.com'])
+        self.assertEqual(diff.count, 22)
+        # Only the new window was purchased
+        self.assertEqual(len(self.purchased), 3)
+
+        diff = self.monitor.run(basic_terms=self.terms)
+        self.assertFalse(diff.changed())
+
+    def test_removed_domains(self):
+        self.monitor.run(basic_terms=self.terms)
+        del self.records[:2]
+        self.records.append(('new.com', self.today, self.today))
+
+        diff = self.monitor.run(basic_terms=self.terms)
+        self.assertTrue(diff.full_refresh)
+        self.assertEqual([d.domain_name for d in diff.added], ['new.com'])
+        self.assertEqual(diff.removed, ['old0.com', 'old1.com'])
+        self.assertEqual(self.store.state(diff.fingerprint),
+                         (self.today, 19))
+
+    def test_equal_adds_and_removes(self):
+        self.monitor.run(basic_terms=self.terms)
+        # A domain that starts matching without a new date replaces one
+        # that stops matching
+        old = self.today - datetime.timedelta(days=30)
+        del self.records[:1]
+        self.records.append(('late.com', old, old))
+
+        # The counts agree, so only a full refresh finds the changes
+        diff = self.monitor.run(basic_terms=self.terms)
+        self.assertFalse(diff.full_refresh)
+        self.assertFalse(diff.changed())
+
+        diff = self.monitor.run(full_refresh=True, basic_terms=self.terms)
+        self.assertTrue(diff.full_refresh)
+        self.assertEqual([d.domain_name for d in diff.added], ['late.com'])
+        self.assertEqual(diff.removed, ['old0.com'])
+        self.assertEqual(self.store.state(diff.fingerprint),
+                         (self.today, 20))
+
+    def test_user_date_bounds_kept(self):
+        later = self.today + datetime.timedelta(days=1)
+        self.records.append(('future.com', later, later))
+        self.monitor.run(basic_terms=self.terms, created_date_from=later)
+        del self.requester.payloads[:]
+
+        diff = self.monitor.run(basic_terms=self.terms,
+                                created_date_from=later)
+        self.assertFalse(diff.changed())
+        windows = [(d.get('createdDateFrom'), d.get('updatedDateFrom'))
+                   for d in self.requester.payloads
+                   if d['mode'] == 'purchase']
+        # The bound of the query is later than the previous run
+        self.assertEqual(windows, [(str(later), None),
+                                   (str(later), str(self.today))])
+
+
+if __name__ == '__main__':
+    unittest.main()
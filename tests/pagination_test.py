@@ -0,0 +1,50 @@
+import time
+import unittest
+
+from reversewhois import Client, HttpApiError
+
+from tests.helpers import API_KEY, StubRequester, pages
+
+
+class TestPagination(unittest.TestCase):
+    def setUp(self) -> None:
+        self.client = Client(API_KEY)
+        self.terms = {'include': ['test']}
+
+    def _names(self, **kwargs):
+        return [page.domains_list[0].domain_name
+                for page in self.client.iterate_pages(
+                    basic_terms=self.terms, **kwargs)]
+
+    def test_iterate_without_prefetch(self):
+        self.client.api_requester = StubRequester(pages(4), delay=0.01)
+        self.assertEqual(self._names(),
+                         ['page{}.com'.format(i) for i in range(4)])
+
+    def test_iterate_with_prefetch(self):
+        self.client.api_requester = StubRequester(pages(6), delay=0.01)
+        self.assertEqual(self._names(prefetch=2),
+                         ['page{}.com'.format(i) for i in range(6)])
+
+    def test_prefetch_is_bounded(self):
+        requester = StubRequester(pages(50), delay=0.01)
+        self.client.api_requester = requester
+        result = self.client.iterate_pages(basic_terms=self.terms, prefetch=2)
+        next(result)
+        time.sleep(0.2)
+        # One page consumed, two queued and one waiting to be queued
+        self.assertLessEqual(len(requester.payloads), 4)
+        result.close()
+
+    def test_prefetch_propagates_errors(self):
+        self.client.api_requester = StubRequester(pages(5, fail_on=2),
+                                                  delay=0.01)
+        result = self.client.iterate_pages(basic_terms=self.terms, prefetch=3)
+        self.assertEqual(next(result).domains_list[0].domain_name, 'page0.com')
+        next(result)
+        with self.assertRaises(HttpApiError):
+            next(result)
+
+
+if __name__ == '__main__':
+    unittest.main()
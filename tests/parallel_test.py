@@ -0,0 +1,95 @@
+import asyncio
+import datetime
+import json
+import pickle
+import unittest
+
+from reversewhois import Client, AsyncClient, ParsePool, ParameterError, \
+    UnparsableApiResponseError
+from reversewhois.parallel import _parse_page
+
+from tests.helpers import API_KEY, AsyncStubRequester, StubRequester
+
+
+def _page(audit: bool) -> bytes:
+    domains = []
+    for i in range(50):
+        if not audit:
+            domains.append('domain{}.com'.format(i))
+            continue
+        domains.append({'domainName': 'domain{}.com'.format(i), 'audit': {
+            'createdDate': '2021-01-{:02d}T00:00:00+00:00'.format(i % 28 + 1),
+            'updatedDate': None if i % 2 else '2021-02-01T00:00:00+00:00'}})
+    return json.dumps({'nextPageSearchAfter': 42, 'domainsCount': 50,
+                       'domainsList': domains}).encode('utf-8')
+
+
+class TestParsePool(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.pool = ParsePool(max_workers=1, min_size=0)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.pool.close()
+
+    def test_same_result_as_inline_parsing(self):
+        for audit in (False, True):
+            raw = _page(audit)
+            expected = Client._parse_response(raw)
+            result = self.pool.parse(raw)
+            self.assertEqual(result, expected)
+            self.assertTrue(result.has_next())
+
+    def test_audit_dates(self):
+        domains = self.pool.parse(_page(True)).domains_list
+        self.assertEqual(domains.names()[1], 'domain1.com')
+        self.assertEqual(domains[1].audit_created_date.date(),
+                         datetime.date(2021, 1, 2))
+        self.assertIsNone(domains[1].audit_updated_date)
+
+    def test_compact_form(self):
+        compact = _parse_page(_page(True))
+        self.assertEqual(compact[:3], (50, 42, 50))
+        self.assertTrue(all(type(v) in (int, str) for v in compact))
+        self.assertEqual(pickle.loads(pickle.dumps(compact)), compact)
+
+    def test_errors(self):
+        with self.assertRaises(UnparsableApiResponseError):
+            self.pool.parse(b'{broken')
+        with self.assertRaises(UnparsableApiResponseError):
+            self.pool.parse(b'{"domainsList": []}')
+
+        empty = self.pool.parse(b'{"domainsCount": 0}')
+        self.assertEqual(len(empty.domains_list), 0)
+
+    def test_client_uses_pool_above_min_size(self):
+        client = Client(API_KEY, parse_pool=self.pool)
+        client.api_requester = StubRequester(lambda data: _page(True))
+        response = client.purchase(basic_terms={'include': ['test']})
+        self.assertEqual(response.domains_count, 50)
+        self.assertEqual(len(response.domains_list), 50)
+
+        with self.assertRaises(ParameterError):
+            client.parse_pool = 'pool'
+
+    def test_async_client(self):
+        client = AsyncClient(API_KEY, parse_pool=self.pool)
+        client.api_requester = AsyncStubRequester(lambda data: _page(False))
+        loop = asyncio.new_event_loop()
+        try:
+            response = loop.run_until_complete(
+                client.purchase(basic_terms={'include': ['test']}))
+        finally:
+            loop.close()
+        self.assertEqual(response.domains_list.names()[0], 'domain0.com')
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            ParsePool(max_workers=0)
+        with self.assertRaises(ValueError):
+            ParsePool(min_size=-1)
+
+
+if __name__ == '__main__':
+    unittest.main()
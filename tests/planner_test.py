@@ -0,0 +1,143 @@
+import unittest
+
+from reversewhois import Client, QueryPlanner, Term, And, Not, Fields, \
+    ParameterError
+
+from tests.helpers import API_KEY, StubRequester
+
+# Domain name -> words of its WHOIS record
+_RECORDS = {
+    'a.com': {'bank', 'loan', 'blog'},
+    'b.com': {'bank', 'loan'},
+    'c.com': {'bank', 'credit', 'news'},
+    'd.com': {'loan', 'credit'},
+    'e.com': {'bank', 'loan', 'credit', 'fund', 'cash', 'news'},
+    'f.com': {'fund'},
+}
+
+# Domain name -> creation date; f.com has none
+_CREATED = {
+    'a.com': '2019-06-01',
+    'b.com': '2019-06-01',
+    'c.com': '2020-02-01',
+    'd.com': '2020-05-01',
+    'e.com': '2021-01-01',
+}
+
+
+def _respond(data: dict) -> dict:
+    if 'basicSearchTerms' in data:
+        include = set(data['basicSearchTerms']['include'])
+        exclude = set(data['basicSearchTerms']['exclude'])
+    else:
+        include = {t['term'] for t in data['advancedSearchTerms']}
+        exclude = set()
+    start = data.get('createdDateFrom')
+    end = data.get('createdDateTo')
+    names = sorted(name for name, words in _RECORDS.items()
+                   if include <= words and not exclude & words
+                   and (start is None or start <= _CREATED.get(name, ''))
+                   and (end is None or _CREATED.get(name, '~') <= end))
+    return {'domainsCount': len(names), 'domainsList': names}
+
+
+class TestQueryPlanner(unittest.TestCase):
+    def setUp(self) -> None:
+        self.client = Client(API_KEY)
+        self.requester = StubRequester(_respond, pool_maxsize=4)
+        self.client.api_requester = self.requester
+        self.planner = QueryPlanner(self.client, max_workers=3)
+
+    def _names(self, expression) -> list:
+        return [d.domain_name for d in self.planner.execute(expression)]
+
+    def test_single_term(self):
+        self.assertEqual(self._names(Term('fund')), ['e.com', 'f.com'])
+
+    def test_more_than_four_terms(self):
+        expression = And(*(Term(w) for w in
+                           ('bank', 'loan', 'credit', 'fund', 'cash')))
+        self.assertEqual(self._names(expression), ['e.com'])
+        self.assertEqual(self.requester.count('purchase'), 2)
+
+    def test_or_and_not(self):
+        expression = (Term('bank') | Term('credit')) & ~Term('news')
+        self.assertEqual(self._names(expression),
+                         ['a.com', 'b.com', 'd.com'])
+
+    def test_negation_is_pushed_down(self):
+        expression = Term('loan') & Not(Term('blog') | Term('credit'))
+        self.assertEqual(self._names(expression), ['b.com'])
+
+    def test_largest_negatives_are_excluded(self):
+        negatives = ['blog', 'news', 'credit', 'fund', 'cash']
+        expression = Term('bank') & And(*(~Term(w) for w in negatives))
+        plan = self.planner.plan(expression)
+        # One purchase with 4 exclusions. The fifth term, narrowed to that
+        # purchase, matches nothing and is not purchased
+        self.assertEqual(len(plan.queries), 1)
+        excluded = plan.queries[0].payload()['basicSearchTerms']['exclude']
+        self.assertEqual(len(excluded), 4)
+        self.assertIn('credit', excluded)
+        self.assertEqual(self._names(plan), ['b.com'])
+
+    def test_empty_alternatives_are_skipped(self):
+        expression = (Term('bank') & Term('missing')) | Term('fund')
+        plan = self.planner.plan(expression)
+        self.assertEqual(len(plan.queries), 1)
+        self.assertEqual(self._names(plan), ['e.com', 'f.com'])
+
+    def test_groups_are_formed_around_selective_terms(self):
+        words = ('bank', 'loan', 'credit', 'fund', 'cash')
+        plan = self.planner.plan(And(*(Term(w) for w in words)))
+        # 'cash' and 'fund' are the rarest terms and lead one group each
+        for query in plan.queries:
+            include = query.payload()['basicSearchTerms']['include']
+            self.assertEqual(len({'cash', 'fund'} & set(include)), 1)
+        self.assertEqual(plan.estimated_domains(), 2)
+
+    def test_subtracted_terms_are_narrowed(self):
+        field = Fields.registrar_name
+        expression = Term('credit', field) & ~Term('bank', field)
+        plan = self.planner.plan(expression)
+        subtracted = plan.queries[1].payload()['advancedSearchTerms']
+        self.assertEqual({t['term'] for t in subtracted}, {'credit', 'bank'})
+        self.assertEqual(self._names(plan), ['d.com'])
+
+    def test_truncated_purchases_are_split(self):
+        planner = QueryPlanner(self.client, max_workers=3, cap=2)
+        # 'bank' without 'blog' matches 3 domains, more than one purchase
+        expression = (Term('bank') | Term('fund')) & ~Term('blog')
+        plan = planner.plan(expression)
+        self.assertGreater(len(plan.queries), 2)
+        self.assertTrue(all(plan.counts[q] <= 2 for q in plan.queries))
+        self.assertEqual([d.domain_name for d in planner.execute(plan)],
+                         ['b.com', 'c.com', 'e.com', 'f.com'])
+
+    def test_truncated_purchases_that_cannot_be_split(self):
+        planner = QueryPlanner(self.client, max_workers=3, cap=1)
+        # a.com and b.com were created on the same day
+        with self.assertRaises(ParameterError):
+            planner.plan(Term('bank') & Term('loan'))
+        # f.com has no creation date
+        with self.assertRaises(ParameterError):
+            planner.plan(Term('fund'))
+        with self.assertRaises(ParameterError):
+            QueryPlanner(self.client, cap=0)
+
+    def test_advanced_terms(self):
+        expression = Term('bank') & ~Term('news', Fields.registrar_name)
+        self.assertEqual(self._names(expression),
+                         ['a.com', 'b.com'])
+
+    def test_invalid_expressions(self):
+        with self.assertRaises(ParameterError):
+            self.planner.plan(~Term('bank'))
+        with self.assertRaises(ParameterError):
+            Term('bank', 'Unknown')
+        with self.assertRaises(ParameterError):
+            self.planner.plan(Term('bank'), basic_terms={})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+import datetime
+import unittest
+
+from reversewhois import Client, Fields, Query, ParameterError
+
+from tests.helpers import API_KEY, StubRequester
+
+
+class TestQuery(unittest.TestCase):
+    def test_include_terms_limits(self):
+        Query(basic_terms={'include': ['a', 'b', 'c', 'd']})
+        with self.assertRaises(ParameterError):
+            Query(basic_terms={'include': ['a', 'b', 'c', 'd', 'e']})
+        with self.assertRaises(ParameterError):
+            Query(basic_terms={'include': []})
+
+    def test_exclude_terms_limits(self):
+        Query(basic_terms={'include': ['a'], 'exclude': []})
+        with self.assertRaises(ParameterError):
+            Query(basic_terms={'include': ['a'],
+                               'exclude': ['b', 'c', 'd', 'e', 'f']})
+
+    def test_advanced_terms_limits(self):
+        term = {'field': 'DomainName', 'term': 'test*'}
+        Query(advanced_terms=[term] * 4)
+        with self.assertRaises(ParameterError):
+            Query(advanced_terms=[term] * 5)
+        with self.assertRaises(ParameterError):
+            Query(advanced_terms=[])
+        with self.assertRaises(ParameterError):
+            Query(advanced_terms=['DomainName'])
+
+    def test_none_dates_are_omitted(self):
+        query = Query(basic_terms={'include': ['a']},
+                      created_date_from=None,
+                      created_date_to=datetime.date(2020, 1, 2))
+        payload = query.payload()
+        self.assertNotIn('createdDateFrom', payload)
+        self.assertEqual(payload['createdDateTo'], '2020-01-02')
+
+    def test_equality_and_hashing(self):
+        first = Query(basic_terms={'include': ['a']}, mode='preview')
+        second = Query(mode='PREVIEW', basic_terms={'include': ['a']})
+        third = Query(basic_terms={'include': ['b']})
+        self.assertEqual(first, second)
+        self.assertEqual(len({first, second, third}), 2)
+        self.assertNotEqual(first, third)
+
+    def test_copies_do_not_mutate(self):
+        terms = {'field': 'DomainName', 'term': 'test*'}
+        query = Query(advanced_terms=[terms])
+        terms['term'] = 'changed'
+        page = query.with_search_after(10)
+        self.assertIsNone(query.search_after)
+        self.assertEqual(page.search_after, 10)
+        self.assertEqual(
+            query.payload()['advancedSearchTerms'][0]['term'], 'test*')
+        self.assertIs(query.with_mode('preview'), query)
+        self.assertEqual(query.with_mode('purchase').mode, 'purchase')
+
+    def test_payload(self):
+        query = Query(basic_terms={'include': ['a']})
+        payload = query.payload('key')
+        self.assertEqual(payload['apiKey'], 'key')
+        payload['mode'] = 'purchase'
+        self.assertEqual(query.mode, 'preview')
+        self.assertEqual(query.fingerprint,
+                         Query(basic_terms={'include': ['a']}).fingerprint)
+
+    def test_payload_terms_are_copies(self):
+        query = Query(basic_terms={'include': ['a']})
+        query.payload()['basicSearchTerms']['include'].append('b')
+        self.assertEqual(query.payload()['basicSearchTerms']['include'],
+                         ['a'])
+
+        query = Query(advanced_terms=[
+            {'field': Fields.domain_name, 'term': 'test*'}])
+        query.payload()['advancedSearchTerms'][0]['term'] = 'other*'
+        self.assertEqual(query.payload()['advancedSearchTerms'][0]['term'],
+                         'test*')
+        self.assertEqual(query.fingerprint, Query(advanced_terms=[
+            {'field': Fields.domain_name, 'term': 'test*'}]).fingerprint)
+
+    def test_with_dates(self):
+        query = Query(basic_terms={'include': ['a']},
+                      updated_date_to=datetime.date(2021, 1, 1))
+        copy = query.with_dates(created_date_from=datetime.date(2020, 1, 1),
+                                updated_date_to=None)
+        self.assertEqual(copy.date('created_date_from'),
+                         datetime.date(2020, 1, 1))
+        self.assertIsNone(copy.date('updated_date_to'))
+        self.assertEqual(query.date('updated_date_to'),
+                         datetime.date(2021, 1, 1))
+        with self.assertRaises(ParameterError):
+            query.with_dates(created=datetime.date(2020, 1, 1))
+
+
+class TestClientWithQuery(unittest.TestCase):
+    def setUp(self) -> None:
+        self.client = Client(API_KEY)
+        self.requester = StubRequester(lambda data: {
+            'domainsCount': 1, 'domainsList': ['example.com']})
+        self.client.api_requester = self.requester
+
+    def test_query_argument(self):
+        query = Query(basic_terms={'include': ['a']})
+        self.client.purchase(query=query)
+        self.client.preview(query=query, search_after=5)
+        first, second = self.requester.payloads
+        self.assertEqual(first['mode'], 'purchase')
+        self.assertEqual(second['mode'], 'preview')
+        self.assertEqual(second['searchAfter'], 5)
+        self.assertIsNone(query.search_after)
+
+    def test_keyword_arguments(self):
+        self.client.data(basic_terms={'include': ['a']},
+                         updated_date_to=None)
+        self.assertNotIn('updatedDateTo', self.requester.payloads[0])
+
+    def test_invalid_query(self):
+        with self.assertRaises(ParameterError):
+            self.client.data(query={'basic_terms': {'include': ['a']}})
+
+
+if __name__ == '__main__':
+    unittest.main()
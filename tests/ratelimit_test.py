@@ -0,0 +1,61 @@
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from reversewhois import TokenBucket, FileTokenBucket
+
+
+def _acquire_many(path: str, count: int):
+    limiter = FileTokenBucket(path, rate=50, burst=1)
+    for _ in range(count):
+        limiter.acquire()
+
+
+class TestRateLimit(unittest.TestCase):
+    def test_burst_then_rate(self):
+        limiter = TokenBucket(rate=50, burst=5)
+        started = time.monotonic()
+        for _ in range(5):
+            limiter.acquire()
+        self.assertLess(time.monotonic() - started, 0.05)
+        for _ in range(10):
+            limiter.acquire()
+        self.assertGreaterEqual(time.monotonic() - started, 0.18)
+
+    def test_shared_between_threads(self):
+        limiter = TokenBucket(rate=100, burst=1)
+        started = time.monotonic()
+        threads = [threading.Thread(
+            target=lambda: [limiter.acquire() for _ in range(5)])
+            for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertGreaterEqual(time.monotonic() - started, 0.18)
+
+    def test_shared_between_processes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'bucket')
+            started = time.monotonic()
+            processes = [multiprocessing.Process(
+                target=_acquire_many, args=(path, 5)) for _ in range(3)]
+            for process in processes:
+                process.start()
+            for process in processes:
+                process.join()
+            # 15 requests at 50/s with a burst of 1
+            self.assertGreaterEqual(time.monotonic() - started, 0.27)
+
+    def test_invalid_parameters(self):
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=0)
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=1, burst=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import json
+import unittest
+
+from reversewhois import Client, DomainStream, Response, \
+    UnparsableApiResponseError
+
+from tests.helpers import API_KEY, StubRequester, chunks
+
+
+_response = {
+    'nextPageSearchAfter': 1621957012,
+    'domainsCount': 3,
+    'domainsList': [
+        {
+            'domainName': 'airbnb.app',
+            'audit': {
+                'createdDate': '2021-01-10T18:52:41+00:00',
+                'updatedDate': '2021-01-11T18:52:41+00:00'
+            }
+        },
+        {
+            'domainName': 'пример.рф',
+            'audit': {
+                'createdDate': '2020-05-01T00:00:00+03:00',
+                'updatedDate': None
+            }
+        },
+        'airbnbhost.app'
+    ]
+}
+
+
+class TestDomainStream(unittest.TestCase):
+    def test_matches_response(self):
+        raw = json.dumps(_response, ensure_ascii=False).encode('utf-8')
+        expected = Response(_response)
+        for size in (1, 3, 7, 64, len(raw)):
+            stream = DomainStream(chunks(raw, size))
+            domains = list(stream)
+            self.assertEqual(stream.domains_count, expected.domains_count)
+            self.assertEqual(stream.next_page_search_after,
+                             expected.next_page_search_after)
+            self.assertEqual(
+                [str(d) for d in domains],
+                [str(d) for d in expected.domains_list])
+
+    def test_header_fields_precede_domains(self):
+        raw = json.dumps(_response).encode('utf-8')
+        stream = DomainStream(chunks(raw, 5))
+        next(iter(stream))
+        self.assertEqual(stream.domains_count, 3)
+        self.assertTrue(stream.has_next())
+
+    def test_empty_list(self):
+        raw = b'{"nextPageSearchAfter": null, "domainsCount": 0, ' \
+              b'"domainsList": []}'
+        stream = DomainStream(chunks(raw, 4))
+        self.assertEqual(list(stream), [])
+        self.assertFalse(stream.has_next())
+
+    def test_truncated_body(self):
+        raw = json.dumps(_response).encode('utf-8')[:-20]
+        with self.assertRaises(UnparsableApiResponseError):
+            list(DomainStream(chunks(raw, 8)))
+
+    def test_missing_root_element(self):
+        raw = b'{"code": 403, "messages": "Access restricted"}'
+        with self.assertRaises(UnparsableApiResponseError):
+            list(DomainStream(chunks(raw, 8)))
+
+    def test_client_stream(self):
+        client = Client(API_KEY)
+        client.api_requester = StubRequester(lambda data: _response)
+        names = [d.domain_name for d in client.stream(
+            basic_terms={'include': ['airbnb']})]
+        self.assertEqual(names, ['airbnb.app', 'пример.рф', 'airbnbhost.app'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,155 @@
+import json
+import unittest
+
+from requests.exceptions import ConnectionError
+
+from reversewhois import ApiRequester, Client, RetryPolicy, HttpApiError, \
+    RequestsTransport, Urllib3Transport, HttpxTransport, MemoryTransport
+from reversewhois.testing import FakeApiServer
+
+from tests.helpers import API_KEY, JsonHandler, LocalServer
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+class _Handler(JsonHandler):
+    connections = set()
+    failures = []
+
+    def do_POST(self):
+        _Handler.connections.add(self.client_address)
+        body = self.read_json()
+        if _Handler.failures:
+            self.reply(_Handler.failures.pop(0), {},
+                       {'Retry-After': '0'})
+            return
+        body['token'] = self.headers.get('X-Authentication-Token')
+        body['agent'] = self.headers.get('User-Agent')
+        self.reply(200, body)
+
+    def do_GET(self):
+        _Handler.connections.add(self.client_address)
+        self.reply(200, {'path': self.path})
+
+
+class _TransportCases:
+    """
+    Cases run against a local HTTP server with every network transport
+    """
+    def make_transport(self):
+        raise NotImplementedError
+
+    def setUp(self) -> None:
+        _Handler.connections = set()
+        _Handler.failures = []
+        self.server = LocalServer(_Handler)
+        self.url = self.server.url
+
+    def tearDown(self) -> None:
+        self.server.close()
+
+    def requester(self, **kwargs) -> ApiRequester:
+        return ApiRequester(base_url=self.url,
+                            transport=self.make_transport(), **kwargs)
+
+    def test_post_reuses_connection(self):
+        with self.requester() as requester:
+            for i in range(3):
+                result = json.loads(
+                    requester.post({'apiKey': 'key', 'searchAfter': i}))
+                self.assertEqual(result['searchAfter'], i)
+                self.assertEqual(result['token'], 'key')
+                self.assertTrue(result['agent'].startswith('reverse-whois'))
+        self.assertEqual(len(_Handler.connections), 1)
+
+    def test_get(self):
+        with self.requester() as requester:
+            result = json.loads(requester.get({'mode': 'preview'}))
+        self.assertTrue(result['path'].endswith('?mode=preview'))
+
+    def test_post_stream(self):
+        with self.requester() as requester:
+            chunks = list(requester.post_stream({'n': 1}, chunk_size=4))
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(json.loads(b''.join(chunks))['n'], 1)
+
+    def test_retry_and_errors(self):
+        _Handler.failures = [503, 503]
+        policy = RetryPolicy(max_attempts=2, backoff_base=0.01,
+                             backoff_cap=0.05)
+        with self.requester(retry=policy) as requester:
+            with self.assertRaises(HttpApiError):
+                requester.post({'n': 1})
+            self.assertEqual(json.loads(requester.post({'n': 2}))['n'], 2)
+
+    def test_connection_error(self):
+        self.server.server_close()
+        with self.requester() as requester:
+            with self.assertRaises(ConnectionError):
+                requester.post({'n': 1})
+
+
+class TestRequestsTransport(_TransportCases, unittest.TestCase):
+    def make_transport(self):
+        return RequestsTransport()
+
+
+class TestUrllib3Transport(_TransportCases, unittest.TestCase):
+    def make_transport(self):
+        return Urllib3Transport(pool_maxsize=4)
+
+    def test_pool_size_used_by_batch(self):
+        requester = self.requester()
+        self.assertEqual(requester.pool_maxsize, 4)
+
+
+@unittest.skipIf(httpx is None, "httpx is not installed")
+class TestHttpxTransport(_TransportCases, unittest.TestCase):
+    def make_transport(self):
+        return HttpxTransport(http2=False)
+
+
+class TestMemoryTransport(unittest.TestCase):
+    def test_client_against_fake_api(self):
+        server = FakeApiServer(domains=25, page_size=10)
+        transport = MemoryTransport(
+            lambda method, url, headers, body: server.respond(
+                headers.get('X-Authentication-Token'), body))
+        client = Client(API_KEY, transport=transport)
+
+        pages = list(client.iterate_pages(
+            basic_terms={'include': ['test']}))
+        self.assertEqual([len(p.domains_list) for p in pages], [10, 10, 5])
+        self.assertEqual(len(transport.requests), 3)
+        method, url, headers, body = transport.requests[-1]
+        self.assertEqual(method, 'POST')
+        self.assertEqual(json.loads(body)['searchAfter'], 20)
+        server.stop()
+
+    def test_network_failures_are_retried(self):
+        calls = []
+
+        def handler(method, url, headers, body):
+            calls.append(method)
+            if len(calls) == 1:
+                raise ConnectionError('reset')
+            return 429 if len(calls) == 2 else 200, \
+                {'Retry-After': '0'}, b'{"domainsCount": 3}'
+
+        client = Client(API_KEY, transport=MemoryTransport(handler),
+                        retry=RetryPolicy(backoff_base=0, backoff_cap=0))
+        self.assertEqual(
+            client.preview(basic_terms={'include': ['test']}).domains_count,
+            3)
+        self.assertEqual(len(calls), 3)
+
+    def test_invalid_transport(self):
+        with self.assertRaises(ValueError):
+            ApiRequester(transport='requests')
+
+
+if __name__ == '__main__':
+    unittest.main()